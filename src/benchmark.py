@@ -0,0 +1,326 @@
+"""Golden-corpus benchmark of the text parser: speed and accuracy.
+
+Runs the free-text pipeline (``extract_relevant_contacts_from_text`` and
+``Contacts.parse``) over the pages labelled in ``data/golden_contacts.json``
+(saved in ``logs/html_dump`` and ``assets/page.html``) with ChatGPT stubbed out, and scores the contacts found
+against the hand labels in ``data/golden_contacts.json``.
+
+Usage::
+
+    python src/benchmark.py [--output result.json] [--baseline data/benchmark_baseline.json]
+                            [--repeat 5] [--save-baseline] [--check-speed]
+
+With a baseline the run fails (exit code 1) when precision, recall or name
+accuracy drop. With ``--check-speed`` it also fails when parsing is more than
+``--max-slowdown`` slower; speed baselines only make sense on the machine
+that recorded them, so record one there first with ``--save-baseline``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import time
+import tracemalloc
+from html.parser import HTMLParser
+from pathlib import Path
+
+import database_func
+import gov_names
+import jobs
+from contact_normalize import national_digits, normalize_email
+from jobs import Contacts
+
+ROOT = Path(__file__).resolve().parents[1]
+CORPUS_DIR = ROOT / "logs" / "html_dump"
+HTML_PAGE = ROOT / "assets" / "page.html"
+GOLDEN_FILE = ROOT / "data" / "golden_contacts.json"
+BASELINE_FILE = ROOT / "data" / "benchmark_baseline.json"
+
+# Allowed slowdown against the baseline before a run counts as a regression
+MAX_SLOWDOWN = 0.25
+
+QUALITY_METRICS = ("precision", "recall", "name_accuracy")
+
+# Titles a page may put in front of a name; they do not make the name wrong
+_TITLES = {"ד\"ר", "דר'", "עו\"ד", "רו\"ח", "אדר'", "אינג'", "הגב'", "מר", "גב'"}
+
+_BLOCK_TAGS = {
+    "br", "p", "div", "li", "tr", "td", "th", "table", "ul", "ol", "section",
+    "article", "header", "footer", "nav", "h1", "h2", "h3", "h4", "h5", "h6",
+}
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Return the visible text of ``html`` with one line per block element."""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def load_corpus(labels: dict[str, list[dict]] | None = None) -> dict[str, str]:
+    """Return ``{page name: text}`` for the pages labelled in the golden file.
+
+    Only the labelled pages are read, so other dumps in ``logs/html_dump``
+    (left by a crawl or a test run) do not change the result.
+    """
+    if labels is None:
+        labels = load_labels()
+    pages = {}
+    for name in labels:
+        if name == HTML_PAGE.name:
+            pages[name] = html_to_text(HTML_PAGE.read_text(encoding="utf-8"))
+        else:
+            pages[name] = (CORPUS_DIR / name).read_text(encoding="utf-8")
+    return pages
+
+
+def load_labels(path: str | Path = GOLDEN_FILE) -> dict[str, list[dict]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["pages"]
+
+
+def stub_llm() -> None:
+    """Keep the run offline: no ChatGPT calls, no downloads, no cache writes."""
+    jobs.guess_hebrew_name = lambda *args, **kwargs: None
+    jobs.guess_hebrew_department = lambda *args, **kwargs: None
+    jobs._save_cache = lambda cache: None
+    jobs.parse_cache = None
+    if jobs._gov_names is None and not gov_names.NAMES_FILE.exists():
+        jobs._gov_names = {}
+
+
+def _label_keys(label: dict) -> set[str]:
+    emails = {normalize_email(e) or e.lower() for e in label.get("emails") or []}
+    return emails or {national_digits(p) for p in label.get("phones") or []}
+
+
+def _predicted_keys(contact: dict) -> set[str]:
+    email = normalize_email(contact.get("מייל"))
+    if email:
+        return {email}
+    return {national_digits(contact[k]) for k in ("טלפון פרטי", "טלפון משרד") if contact.get(k)}
+
+
+def _bare_name(name) -> str:
+    return " ".join(w for w in str(name or "").split() if w not in _TITLES)
+
+
+def score_page(predicted: list[dict], labels: list[dict]) -> dict[str, int]:
+    """Count matches between predicted contact dicts and the page's labels.
+
+    A prediction is correct when one of its keys (its email, or its phones
+    when it has none) belongs to a labelled contact. A label is found when a
+    prediction carries one of its keys; its name counts as right when that
+    prediction has the same name, titles aside.
+    """
+    label_keys = [_label_keys(label) for label in labels]
+    all_label_keys = set().union(*label_keys)
+    pred_keys = [_predicted_keys(contact) for contact in predicted]
+
+    counts = {"tp": 0, "fp": 0, "found": 0, "fn": 0, "named": 0, "names_right": 0}
+    for keys in pred_keys:
+        counts["tp" if keys & all_label_keys else "fp"] += 1
+    for label, keys in zip(labels, label_keys):
+        matches = [c for c, k in zip(predicted, pred_keys) if k & keys]
+        if not matches:
+            counts["fn"] += 1
+            continue
+        counts["found"] += 1
+        if label.get("name"):
+            counts["named"] += 1
+            if any(_bare_name(c.get("שם")) == label["name"] for c in matches):
+                counts["names_right"] += 1
+    return counts
+
+
+def quality_metrics(counts: dict[str, int]) -> dict[str, float]:
+    tp, fp, found, fn = counts["tp"], counts["fp"], counts["found"], counts["fn"]
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = found / (found + fn) if found + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    name_accuracy = counts["names_right"] / counts["named"] if counts["named"] else 1.0
+    return {
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+        "name_accuracy": round(name_accuracy, 4),
+    }
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _page_city(name: str) -> str:
+    return Path(name).stem
+
+
+def run_benchmark(pages: dict[str, str], labels: dict[str, list[dict]], repeat: int = 5) -> dict:
+    """Time and score the parser on ``pages``; returns the JSON-ready result."""
+    stub_llm()
+    jobs.load_name_index()
+    jobs.load_dept_classifier()
+
+    # Accuracy, and the per-page latency of the whole text pipeline
+    totals = dict.fromkeys(("tp", "fp", "found", "fn", "named", "names_right"), 0)
+    per_page = {}
+    page_ms = []
+    for name, text in pages.items():
+        city = _page_city(name)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            people = database_func.extract_relevant_contacts_from_text(text, city)[city]
+            timings.append(time.perf_counter() - start)
+        # The fastest pass is the least disturbed by the rest of the machine
+        page_ms.append(min(timings) * 1000)
+        counts = score_page(list(people.values()), labels.get(name, []))
+        per_page[name] = {k: counts[k] for k in ("tp", "fp", "found", "fn")}
+        for key in totals:
+            totals[key] += counts[key]
+
+    # Raw Contacts.parse throughput over the same blocks
+    blocks = [
+        (block, _page_city(name))
+        for name, text in pages.items()
+        for block in database_func.iter_contact_blocks(text)
+    ]
+    passes = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for block, city in blocks:
+            Contacts(block, city, defer_enrichment=True)
+        passes.append(time.perf_counter() - start)
+    parse_seconds = min(passes)
+
+    tracemalloc.start()
+    for name, text in pages.items():
+        database_func.extract_relevant_contacts_from_text(text, _page_city(name))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "corpus": {
+            "pages": len(pages),
+            "bytes": sum(len(t.encode("utf-8")) for t in pages.values()),
+            "blocks": len(blocks),
+            "labelled_contacts": sum(len(v) for v in labels.values()),
+        },
+        "speed": {
+            "blocks_per_sec": round(len(blocks) / parse_seconds, 1) if parse_seconds else 0.0,
+            "page_ms_p50": round(percentile(page_ms, 50), 3),
+            "page_ms_p99": round(percentile(page_ms, 99), 3),
+            "peak_memory_kb": round(peak / 1024, 1),
+        },
+        "quality": quality_metrics(totals) | {k: totals[k] for k in ("tp", "fp", "found", "fn")},
+        "pages": per_page,
+    }
+
+
+def compare(result: dict, baseline: dict, max_slowdown: float | None = None) -> list[str]:
+    """Return a description of every regression of ``result`` against ``baseline``.
+
+    Speed is only compared when ``max_slowdown`` is given: timings vary from
+    run to run and between machines, so that check needs a baseline recorded
+    on the same machine.
+    """
+    regressions = []
+    for metric in QUALITY_METRICS:
+        now, before = result["quality"][metric], baseline["quality"][metric]
+        if now < before:
+            regressions.append(f"{metric} dropped from {before} to {now}")
+    if max_slowdown is None:
+        return regressions
+
+    speed, base_speed = result["speed"], baseline["speed"]
+    if speed["blocks_per_sec"] < base_speed["blocks_per_sec"] / (1 + max_slowdown):
+        regressions.append(
+            f"blocks_per_sec fell from {base_speed['blocks_per_sec']} to {speed['blocks_per_sec']}"
+        )
+    for metric in ("page_ms_p50", "page_ms_p99"):
+        if speed[metric] > base_speed[metric] * (1 + max_slowdown):
+            regressions.append(f"{metric} rose from {base_speed[metric]} to {speed[metric]}")
+    return regressions
+
+
+def print_summary(result: dict, baseline: dict | None = None) -> None:
+    for section in ("corpus", "speed", "quality"):
+        print(f"{section}:")
+        for metric, value in result[section].items():
+            line = f"  {metric}: {value}"
+            if baseline and isinstance(baseline.get(section, {}).get(metric), (int, float)):
+                line += f" (baseline {baseline[section][metric]})"
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="write the result JSON to this file")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes over the corpus")
+    parser.add_argument(
+        "--check-speed", action="store_true",
+        help="also fail on a slowdown; needs a baseline recorded on this machine",
+    )
+    parser.add_argument("--max-slowdown", type=float, default=MAX_SLOWDOWN)
+    args = parser.parse_args(argv)
+
+    labels = load_labels()
+    result = run_benchmark(load_corpus(labels), labels, repeat=args.repeat)
+
+    baseline = None
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_summary(result, baseline)
+
+    targets = [args.output] if args.output else []
+    if args.save_baseline:
+        targets.append(baseline_path)
+    for target in targets:
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+    if baseline is None:
+        return 0
+    regressions = compare(result, baseline, args.max_slowdown if args.check_speed else None)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,19 @@
-import os
-from openai import OpenAI
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
-api_key = os.getenv("OPENAI_API_KEY")
 import logging
 
+import llm_client
+
+
+def _answer(content: str | None) -> str | None:
+    return content.strip() if content else None
+
 
 def guess_hebrew_name(text: str) -> str | None:
     """Return the best Hebrew personal name for the given text using ChatGPT."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or not text:
+    if not text:
         return None
 
     try:
-        response = client.chat.completions.create(
+        content = llm_client.complete(
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -23,9 +23,10 @@ def guess_hebrew_name(text: str) -> str | None:
                 {"role": "user", "content": text},
             ],
             max_tokens=10,
-            temperature=0.2
+            temperature=0.2,
+            stage="guess_hebrew_name",
         )
-        return response.choices[0].message.content.strip()
+        return _answer(content)
     except Exception as e:
         logging.exception("OpenAI request failed")
         return None
@@ -33,10 +34,6 @@ def guess_hebrew_name(text: str) -> str | None:
 
 def guess_hebrew_department(text: str | None = None, url: str | None = None) -> str | None:
     """Return the best Hebrew department name for the given text or URL using ChatGPT."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
-
     prompt_parts = []
     if text:
         prompt_parts.append(text)
@@ -49,7 +46,7 @@ def guess_hebrew_department(text: str | None = None, url: str | None = None) ->
     prompt = "\n".join(prompt_parts)
 
     try:
-        response = client.chat.completions.create(
+        content = llm_client.complete(
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -59,9 +56,10 @@ def guess_hebrew_department(text: str | None = None, url: str | None = None) ->
                 {"role": "user", "content": prompt},
             ],
             max_tokens=15,
-            temperature=0.3
+            temperature=0.3,
+            stage="guess_hebrew_department",
         )
-        return response.choices[0].message.content.strip()
+        return _answer(content)
     except Exception as e:
         logging.exception("OpenAI request failed")
         return None
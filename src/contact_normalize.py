@@ -0,0 +1,167 @@
+"""Phone number and email normalisation shared by the parser and the cleaners.
+
+Phone handling follows one table of the Israeli numbering plan
+(:data:`NUMBERING_PLAN`). Every function has a scalar form for the parser and a
+vectorised form taking a pandas ``Series``, used by ``extraction.clean_csv_data``
+on whole columns.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import NamedTuple
+
+
+class PrefixInfo(NamedTuple):
+    """One numbering plan entry; every prefix is followed by 7 subscriber digits."""
+
+    kind: str
+
+
+# National prefixes (with the trunk 0) of the Israeli numbering plan
+NUMBERING_PLAN: dict[str, PrefixInfo] = {
+    **{p: PrefixInfo("landline") for p in ("02", "03", "04", "08", "09")},
+    **{f"05{d}": PrefixInfo("mobile") for d in "0123456789"},
+    **{f"07{d}": PrefixInfo("voip") for d in "0123456789"},
+}
+
+SUBSCRIBER_DIGITS = 7
+
+# Longest prefixes first so "052" is preferred over a shorter match
+_PREFIXES = sorted(NUMBERING_PLAN, key=len, reverse=True)
+_NATIONAL_PREFIX_PATTERN = "|".join(re.escape(p[1:]) for p in _PREFIXES)
+
+# One optional separator: a dash or any whitespace except a line break
+_SEP = r"(?:-|[^\S\n])?"
+
+# A phone number in free text: 03-1234567, 052-123-4567, +972 52 1234567 ...
+PHONE_PATTERN = (
+    rf"(?<![\d+])(?:0|\+?972{_SEP})(?:{_NATIONAL_PREFIX_PATTERN})"
+    rf"{_SEP}\d{{3}}{_SEP}\d{{4}}(?!\d)"
+)
+PHONE_RE = re.compile(PHONE_PATTERN)
+
+_FORMATTED_RE = re.compile(rf"^(0(?:{_NATIONAL_PREFIX_PATTERN}))(\d{{3}})(\d{{4}})$")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+_NON_DIGIT_PLUS_RE = re.compile(r"[^\d+]")
+
+EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+_EMAIL_FULL_RE = re.compile(rf"^{EMAIL_RE.pattern}$")
+
+
+def _is_missing(value) -> bool:
+    try:
+        return value is None or value != value or not value
+    except TypeError:
+        # pandas.NA refuses to be used as a bool
+        return True
+
+
+def national_digits(value: str) -> str:
+    """Return the digits of ``value`` with a +972/972 country code turned into 0."""
+    digits = _NON_DIGIT_RE.sub("", str(value))
+    if digits.startswith("972"):
+        digits = "0" + digits[3:]
+    return digits
+
+
+def phone_kind(digits: str) -> str | None:
+    """Return ``"mobile"``, ``"landline"`` or ``"voip"`` for national ``digits``."""
+    for prefix in _PREFIXES:
+        if digits.startswith(prefix):
+            if len(digits) == len(prefix) + SUBSCRIBER_DIGITS:
+                return NUMBERING_PLAN[prefix].kind
+            return None
+    return None
+
+
+def _prepare(phone_str: str) -> str:
+    """Undo spreadsheet damage (float suffixes, lost leading zeros) and strip."""
+    # Numbers read as floats (26302700.0) lose their leading zero
+    if "." in phone_str and phone_str.replace(".", "").replace("-", "").isdigit():
+        try:
+            phone_str = str(int(float(phone_str)))
+        except ValueError:
+            pass
+    if phone_str.isdigit() and len(phone_str) in (8, 9) and not phone_str.startswith("0"):
+        phone_str = "0" + phone_str
+
+    cleaned = _NON_DIGIT_PLUS_RE.sub("", phone_str)
+    if cleaned.startswith("+972"):
+        cleaned = "0" + cleaned[4:]
+    elif cleaned.startswith("972"):
+        cleaned = "0" + cleaned[3:]
+    return cleaned
+
+
+def normalize_phone(phone) -> str | None:
+    """Return ``phone`` formatted as ``0X-XXX-XXXX``/``05X-XXX-XXXX``, or ``None``."""
+    if _is_missing(phone):
+        return None
+    match = _FORMATTED_RE.match(_prepare(str(phone).strip()))
+    if not match:
+        return None
+    return "-".join(match.groups())
+
+
+def phone_dedup_key(phone) -> str:
+    """Return the national digits of ``phone`` for duplicate detection."""
+    if _is_missing(phone):
+        return ""
+    return national_digits(str(phone).strip())
+
+
+def normalize_email(email) -> str | None:
+    """Return ``email`` lowercased if it looks like an address, else ``None``."""
+    if _is_missing(email):
+        return None
+    email = str(email).strip().lower()
+    return email if _EMAIL_FULL_RE.match(email) else None
+
+
+def _as_text(values):
+    """Return ``values`` as a string Series with missing and empty values as NA."""
+    text = values.astype("string").str.strip()
+    return text.mask(text == "")
+
+
+def normalize_phones(values):
+    """Vectorised :func:`normalize_phone` over a pandas Series."""
+    text = _as_text(values)
+
+    float_like = text.str.contains(".", regex=False) & text.str.replace(r"[.-]", "", regex=True).str.isdigit()
+    float_like = float_like.fillna(False).astype(bool)
+    if float_like.any():
+        text = text.mask(float_like, text[float_like].map(_float_to_int_str))
+
+    missing_zero = text.str.isdigit() & text.str.len().isin([8, 9]) & ~text.str.startswith("0")
+    missing_zero = missing_zero.fillna(False).astype(bool)
+    text = text.mask(missing_zero, "0" + text)
+
+    cleaned = text.str.replace(r"[^\d+]", "", regex=True)
+    cleaned = cleaned.str.replace(r"^\+?972", "0", regex=True)
+
+    parts = cleaned.str.extract(_FORMATTED_RE)
+    formatted = parts[0] + "-" + parts[1] + "-" + parts[2]
+    return formatted.astype(object).where(formatted.notna(), None)
+
+
+def _float_to_int_str(value: str) -> str:
+    try:
+        return str(int(float(value)))
+    except ValueError:
+        return value
+
+
+def phone_dedup_keys(values):
+    """Vectorised :func:`phone_dedup_key` over a pandas Series."""
+    digits = _as_text(values).str.replace(r"[^\d]", "", regex=True)
+    digits = digits.str.replace(r"^972", "0", regex=True)
+    return digits.fillna("").astype(object)
+
+
+def normalize_emails(values):
+    """Vectorised :func:`normalize_email` over a pandas Series."""
+    text = _as_text(values).str.lower()
+    valid = text.str.match(_EMAIL_FULL_RE.pattern).fillna(False).astype(bool)
+    return text.astype(object).where(valid, None)
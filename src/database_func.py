@@ -1,41 +1,58 @@
-from playwright.sync_api import sync_playwright
-import pandas as pd
 import re
 import time
 import json
 import logging
+import math
 from urllib.parse import urljoin, urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 import sys
+from collections import Counter, deque
+import jobs
+import llm_cache
+import llm_telemetry
 from jobs import Contacts
+from contact_normalize import PHONE_PATTERN, national_digits
+from parse_cache import CACHE_FILE as PARSE_CACHE_FILE, ParseCache
+from enrichment import Enricher
+from parse_pool import ParsePool
+from lexicon import Lexicon
 from datafunc import apply_hebrew_transliteration
-from nameparser import HumanName
 from collect_names import collect_names
 from tqdm import tqdm
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filename=os.path.join(base_dir, "logs", "scraper.log"),
-)
-
+# Handlers are attached by setup_logging(), so importing opens no files
 input_output_logger = logging.getLogger("io_logger")
 input_output_logger.setLevel(logging.INFO)
-io_handler = logging.FileHandler(
-    os.path.join(base_dir, "logs", "scraper_io.jsonl"), encoding="utf-8"
-)
-io_handler.setFormatter(logging.Formatter("%(message)s"))
-input_output_logger.addHandler(io_handler)
 
 failed_logger = logging.getLogger("failed_logger")
 failed_logger.setLevel(logging.INFO)
-failed_handler = logging.FileHandler(
-    os.path.join(base_dir, "logs", "failed_cities.jsonl"), encoding="utf-8"
-)
-failed_handler.setFormatter(logging.Formatter("%(message)s"))
-failed_logger.addHandler(failed_handler)
+
+
+def setup_logging():
+    """Send the run logs to ``logs/``; called once a scrape starts."""
+    logs_dir = os.path.join(base_dir, "logs")
+    os.makedirs(logs_dir, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        filename=os.path.join(logs_dir, "scraper.log"),
+    )
+    for logger, file_name in ((input_output_logger, "scraper_io.jsonl"), (failed_logger, "failed_cities.jsonl")):
+        if logger.handlers:
+            continue
+        handler = logging.FileHandler(os.path.join(logs_dir, file_name), encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+
+
+def sync_playwright():
+    """Return Playwright's sync context manager; the package is loaded on first use."""
+    from playwright.sync_api import sync_playwright as _sync_playwright
+
+    return _sync_playwright()
+
 
 site_profiles_path = os.path.join(base_dir, "data", "site_profiles.json")
 site_profiles = {}
@@ -44,6 +61,15 @@ if os.path.exists(site_profiles_path):
         site_profiles = json.load(f)
 
 
+CONTACT_LINK_KEYWORDS = Lexicon([
+    "צור_קשר", "צור-קשר", "צור קשר", "מחלקות", "אנשי קשר", "טלפונים",
+    "הנהלה", "עובדים", "צוות", "staff", "contacts", "directory",
+    "contact", "dept", "department", "office", "אגפים", "אגף",
+    "אגפיה", "שירותים", "שירותי", "דברו איתנו", "דברו", "מחלקה",
+    "מועצה", "חברי מועצה", "תפקידי מועצה", "טלפון", "טלפונים",
+    "פניית ציבור", "רשימת", "קשרי ציבור", "מזכירות", "לשכה"])
+
+
 def find_deep_contact_links(page, base_url, depth=2, visited=None):
     if visited is None:
         visited = set()
@@ -66,13 +92,7 @@ def find_deep_contact_links(page, base_url, depth=2, visited=None):
                 full_url = urljoin(base_url, href)
                 if full_url in visited:
                     continue
-                if any(kw in text or kw in href for kw in [
-                    "צור_קשר", "צור-קשר", "צור קשר", "מחלקות", "אנשי קשר", "טלפונים",
-                    "הנהלה", "עובדים", "צוות", "staff", "contacts", "directory",
-                    "contact", "dept", "department", "office", "אגפים", "אגף",
-                    "אגפיה", "שירותים", "שירותי", "דברו איתנו", "דברו", "מחלקה",
-                    "מועצה", "חברי מועצה", "תפקידי מועצה", "טלפון", "טלפונים",
-                    "פניית ציבור", "רשימת", "קשרי ציבור", "מזכירות", "לשכה"]):
+                if CONTACT_LINK_KEYWORDS.contains_any(text) or CONTACT_LINK_KEYWORDS.contains_any(href):
                     links_to_visit.append(full_url)
                     links_to_visit.extend(find_deep_contact_links(page, full_url, depth - 1, visited))
             except:
@@ -94,36 +114,410 @@ def extract_text_from_url(page, url):
     return ""
 
 
-def extract_relevant_contacts_from_text(text, city_name, source_url=None):
+# Collects contact records from the DOM structure of the loaded page: table
+# rows, definition-list entries, card-like blocks and any remaining
+# mailto:/tel: links. Only records holding an email or a phone are returned.
+STRUCTURED_CONTACTS_JS = r"""
+() => {
+    const CARD_SELECTOR = "li, article, .vcard, [class*='card'], [class*='contact'], " +
+        "[class*='person'], [class*='staff'], [class*='team'], [class*='member']";
+    const HIT = /@|0[2-9][-\s]?\d{7}/;
+    const clean = s => (s || "").replace(/\s+/g, " ").trim();
+    const records = [];
+    const seen = new Set();
+    const captured = new Set();
+
+    const hrefs = (nodes, scheme) => {
+        const values = [];
+        for (const node of nodes) {
+            const anchors = node.matches(`a[href^="${scheme}"]`) ? [node] : [];
+            anchors.push(...node.querySelectorAll(`a[href^="${scheme}"]`));
+            for (const a of anchors) {
+                let value = a.getAttribute("href").slice(scheme.length).split("?")[0];
+                try { value = decodeURIComponent(value); } catch (e) {}
+                value = value.trim();
+                if (value) values.push(value);
+            }
+        }
+        return values;
+    };
+
+    const push = (kind, nodes) => {
+        const text = clean(nodes.map(n => n.innerText).join(" "));
+        if (!text || text.length > 500 || seen.has(text)) return;
+        const emails = hrefs(nodes, "mailto:");
+        const phones = hrefs(nodes, "tel:");
+        if (!emails.length && !phones.length && !HIT.test(text)) return;
+        seen.add(text);
+        nodes.forEach(n => captured.add(n));
+        records.push({kind, text, emails, phones});
+    };
+
+    const isCaptured = el => {
+        for (let n = el; n; n = n.parentElement) {
+            if (captured.has(n)) return true;
+        }
+        return false;
+    };
+
+    document.querySelectorAll("tr").forEach(tr => {
+        if (!tr.querySelector("table")) push("table", [tr]);
+    });
+
+    document.querySelectorAll("dl").forEach(dl => {
+        let group = [];
+        for (const child of dl.children) {
+            if (child.tagName === "DT" && group.length) {
+                push("dl", group);
+                group = [];
+            }
+            group.push(child);
+        }
+        if (group.length) push("dl", group);
+    });
+
+    document.querySelectorAll(CARD_SELECTOR).forEach(el => {
+        if (el.querySelector(CARD_SELECTOR) || el.closest("tr, dl") || isCaptured(el)) return;
+        push("card", [el]);
+    });
+
+    document.querySelectorAll('a[href^="mailto:"], a[href^="tel:"]').forEach(a => {
+        if (!isCaptured(a)) push("link", [a.parentElement || a]);
+    });
+
+    return records;
+}
+"""
+
+
+def _tel_to_local(value: str) -> str:
+    """Return a ``tel:`` href value as a local Israeli number (``0XXXXXXXX``)."""
+    return national_digits(value)
+
+
+def extract_structured_contacts(page):
+    """Return contact records read from the DOM of the currently loaded page.
+
+    All records are collected in a single ``page.evaluate`` call. An empty list
+    means the page has no usable structure and the caller should fall back to
+    the plain text heuristic.
+    """
+    try:
+        records = page.evaluate(STRUCTURED_CONTACTS_JS)
+    except Exception as e:
+        logging.warning(f"Structured extraction failed: {e}")
+        return []
+    if not isinstance(records, list):
+        return []
+    return [r for r in records if isinstance(r, dict) and r.get("text")]
+
+
+def _add_contact(people, contact_obj):
+    """Store ``contact_obj`` in ``people`` keyed by name, keeping emailed entries.
+
+    Returns whether ``contact_obj`` was stored.
+    """
+    from nameparser import HumanName
+
+    if not contact_obj.name and contact_obj.email:
+        parsed = HumanName(contact_obj.email.split("@")[0])
+        contact_obj.name = str(parsed)
+    elif contact_obj.name and not any(c in contact_obj.name for c in "אבגדהוזחטיכלמנסעפצקרשת"):
+        if contact_obj.email:
+            parsed = HumanName(contact_obj.email.split("@")[0])
+            contact_obj.role = contact_obj.name
+            contact_obj.name = str(parsed)
+    if contact_obj.name in people and not contact_obj.email and people[contact_obj.name].get("מייל"):
+        return False
+    people[contact_obj.name] = contact_obj.to_dict()
+    return True
+
+
+def people_from_contacts(contacts):
+    """Return the ``{name: contact dict}`` mapping for parsed ``contacts``."""
     people = {}
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-
-    for i in range(len(lines)):
-        block = " ".join(lines[i:i+5])
-        if "@" in block or re.search(r"0[2-9][-\s]?\d{7}", block):
-            contact_obj = Contacts(block, city_name, url=source_url)
-            if not contact_obj.name and contact_obj.email:
-                parsed = HumanName(contact_obj.email.split("@")[0])
-                contact_obj.name = str(parsed)
-            elif contact_obj.name and not any(c in contact_obj.name for c in "אבגדהוזחטיכלמנסעפצקרשת"):
-                if contact_obj.email:
-                    parsed = HumanName(contact_obj.email.split("@")[0])
-                    contact_obj.role = contact_obj.name
-                    contact_obj.name = str(parsed)
-            if contact_obj.name in people and not contact_obj.email and people[contact_obj.name].get("מייל"):
-                continue
-            people[contact_obj.name] = contact_obj.to_dict()
+    for contact_obj in contacts:
+        _add_contact(people, contact_obj)
+    return people
+
+
+def contacts_from_records(records, city_name, source_url=None, defer_enrichment=False):
+    """Build contacts from records returned by :func:`extract_structured_contacts`.
+
+    Each record already corresponds to one contact, so it is parsed exactly
+    once. Values found only in ``mailto:``/``tel:`` hrefs are appended to the
+    record text so ``Contacts`` picks them up like any other match.
+    """
+    contacts = []
+    for record in records:
+        block = record["text"]
+        extras = [e for e in record.get("emails") or [] if e not in block]
+        extras += [
+            phone
+            for phone in (_tel_to_local(p) for p in record.get("phones") or [])
+            if phone and phone not in re.sub(r"[^\d]", "", block)
+        ]
+        if extras:
+            block = f"{block} {' '.join(extras)}"
+        contacts.append(Contacts(block, city_name, url=source_url, defer_enrichment=defer_enrichment))
+    return contacts
+
+
+def extract_contacts_from_records(records, city_name, source_url=None):
+    return {city_name: people_from_contacts(contacts_from_records(records, city_name, source_url))}
+
+
+# Lines of context kept above the first hit of a block (usually name and role)
+BLOCK_CONTEXT_LINES = 2
+
+_HIT_RE = re.compile(rf"(@)|{PHONE_PATTERN}")
+
+
+def _iter_lines(text_stream):
+    """Yield the ``\\n``-separated lines of a string or of an iterable of chunks."""
+    if isinstance(text_stream, str):
+        yield from text_stream.split("\n")
+        return
+    tail = ""
+    for chunk in text_stream:
+        *lines, tail = (tail + chunk).split("\n")
+        yield from lines
+    yield tail
+
+
+def _split_phone_length(line, following):
+    """Return how much of ``following`` ends a phone number that ``line`` starts.
+
+    Pages break numbers across lines ("טלפון: 03" / "1234567"). Blocks join
+    their lines with a space, so the number is tested the same way; 0 means
+    no number spans the break.
+    """
+    line = line.rstrip()
+    rest = following.lstrip()
+    if not (line[-1:].isdigit() or line.endswith("-")) or not rest[:1].isdigit():
+        return 0
+    for match in _HIT_RE.finditer(f"{line} {rest}"):
+        if match.group(1) is None and match.start() < len(line) < match.end() - 1:
+            return len(following) - len(rest) + match.end() - len(line) - 1
+    return 0
+
+
+def iter_contact_blocks(text_stream, context=BLOCK_CONTEXT_LINES):
+    """Yield one block per contact, anchored on email/phone hits.
+
+    ``text_stream`` is page text, either a string or an iterable of chunks
+    such as an open file. Hits on neighbouring lines are merged into a single
+    block (a phone line followed by an email line), except that a block never
+    holds two email lines. A phone number broken across two lines counts as a
+    hit, and both lines go into the block. Each block also takes up to ``context`` lines above
+    its first hit, but never reaches back into the previous block, so every
+    line is parsed at most once. Only the open block and the ``context`` lines
+    before it are held in memory.
+    """
+    before = deque(maxlen=context)
+    block = []
+    has_email = False
+    # Characters at the start of the line that ended a split number
+    skip = 0
+
+    lines = _iter_lines(text_stream)
+    raw = next(lines, None)
+    while raw is not None:
+        following = next(lines, None)
+        hits = []
+        # The rest of a number split off the previous line stays in its block
+        continues = skip > 0
+        last_end = skip
+        for match in _HIT_RE.finditer(raw, skip):
+            hits.append(match.group(1) is not None)
+            last_end = match.end()
+        skip = _split_phone_length(raw[last_end:], following) if following else 0
+        if skip:
+            hits.append(False)
+
+        line = raw.strip()
+        raw = following
+        if not line:
+            continue
+        if not hits and continues:
+            block.append(line)
+            continue
+        if not hits:
+            if block:
+                yield " ".join(block)
+                block = []
+            before.append(line)
+            continue
+
+        is_email = hits[0]
+        if block and not (is_email and has_email):
+            block.append(line)
+        else:
+            if block:
+                yield " ".join(block)
+            block = [*before, line]
+            before.clear()
+            has_email = False
+        has_email = has_email or any(hits)
+
+    if block:
+        yield " ".join(block)
+
+
+def segment_contact_blocks(text, context=BLOCK_CONTEXT_LINES):
+    """Return the blocks of :func:`iter_contact_blocks` for ``text`` as a list."""
+    return list(iter_contact_blocks(text, context))
+
+
+def iter_contacts(text_stream, city_name, source_url=None, defer_enrichment=False):
+    """Yield a ``Contacts`` for each block of ``text_stream`` as soon as it is found."""
+    for block in iter_contact_blocks(text_stream):
+        yield Contacts(block, city_name, url=source_url, defer_enrichment=defer_enrichment)
+
+
+def contacts_from_text(text, city_name, source_url=None, defer_enrichment=False):
+    """Parse every block found by :func:`iter_contact_blocks` in ``text``."""
+    return list(iter_contacts(text, city_name, source_url, defer_enrichment))
+
+
+def extract_relevant_contacts_from_text(text, city_name, source_url=None):
+    return {city_name: people_from_contacts(contacts_from_text(text, city_name, source_url))}
 
-    return {city_name: people}
 
+# A line on at least this share of a site's pages is treated as boilerplate
+BOILERPLATE_MIN_SHARE = 0.6
+# Sites with fewer text pages than this are not checked for boilerplate
+BOILERPLATE_MIN_PAGES = 3
 
-def process_city(row, existing_data):
+
+def find_boilerplate_lines(texts, min_share=BOILERPLATE_MIN_SHARE, min_pages=BOILERPLATE_MIN_PAGES):
+    """Return the lines repeated on most pages of one site, in page order.
+
+    Navigation, footers, cookie banners and the switchboard number appear on
+    every page of a site; finding them lets each page be parsed without them.
+    A repeated line next to a page's own email or phone line is kept: it is a
+    label of that page's contact block ("טלפון:", "דוא\"ל:"), not page chrome.
+    """
+    if len(texts) < min_pages:
+        return []
+    page_lines = [[line.strip() for line in text.split("\n") if line.strip()] for text in texts]
+    counts = Counter()
+    for lines in page_lines:
+        counts.update(set(lines))
+    threshold = max(2, math.ceil(len(texts) * min_share))
+    repeated = {line for line, count in counts.items() if count >= threshold}
+    labels = set()
+    for lines in page_lines:
+        for i, line in enumerate(lines):
+            if line in repeated or not _HIT_RE.search(line):
+                continue
+            labels.update(lines[max(0, i - 1):i])
+            labels.update(lines[i + 1:i + 2])
+    boilerplate = {}
+    for lines in page_lines:
+        for line in lines:
+            if line in repeated and line not in labels:
+                boilerplate.setdefault(line, None)
+    return list(boilerplate)
+
+
+def strip_boilerplate(text, boilerplate):
+    """Return ``text`` without the lines listed in ``boilerplate``."""
+    if not boilerplate:
+        return text
+    drop = set(boilerplate)
+    return "\n".join(line for line in text.split("\n") if line.strip() not in drop)
+
+
+# Record kinds read from the page layout. "link" records are stray
+# mailto:/tel: anchors, usually in the header or footer, and do not make a
+# page structured on their own.
+STRUCTURED_KINDS = frozenset({"table", "dl", "card"})
+
+
+def strip_captured_text(text, records):
+    """Return ``text`` without the runs of lines that make up one of ``records``.
+
+    A record's text is the ``innerText`` of its nodes with whitespace
+    collapsed, so runs of consecutive page lines are collapsed the same way
+    before they are compared.
+    """
+    captured = {record["text"] for record in records}
+    if not captured:
+        return text
+    lines = text.split("\n")
+    cleaned = [" ".join(line.split()) for line in lines]
+    drop = set()
+    for start, first in enumerate(cleaned):
+        if not first or start in drop:
+            continue
+        run = first
+        candidates = [t for t in captured if t.startswith(run)]
+        end = start
+        while candidates:
+            if run in captured:
+                drop.update(range(start, end + 1))
+                break
+            end += 1
+            if end == len(lines):
+                break
+            if cleaned[end]:
+                run = f"{run} {cleaned[end]}"
+                candidates = [t for t in candidates if t.startswith(run)]
+    return "\n".join(line for i, line in enumerate(lines) if i not in drop)
+
+
+def parse_page(city_name, link, text, records, boilerplate=()):
+    """Parse one crawled page into contacts awaiting enrichment.
+
+    Table, definition-list and card records are parsed as they are and the
+    rest of the page text goes through the text heuristic, so staff listed in
+    plain paragraphs are kept. A page with only stray links is parsed as
+    text. Runs in a :class:`ParsePool` worker, so everything it needs is
+    passed in.
+    """
+    if not any(record.get("kind") in STRUCTURED_KINDS for record in records):
+        return contacts_from_text(strip_boilerplate(text, boilerplate), city_name, link, defer_enrichment=True)
+    # Footer links are parsed once, with the site's boilerplate block
+    footer = {" ".join(line.split()) for line in boilerplate}
+    records = [r for r in records if r.get("kind") in STRUCTURED_KINDS or r["text"] not in footer]
+    contacts = contacts_from_records(records, city_name, link, defer_enrichment=True)
+    rest = strip_boilerplate(strip_captured_text(text, records), boilerplate)
+    return contacts + contacts_from_text(rest, city_name, link, defer_enrichment=True)
+
+
+# Pages of a city read before its boilerplate lines are fixed
+BOILERPLATE_SAMPLE_PAGES = 5
+
+
+def _submit_sample(pool, city, url, sample, page_futures):
+    """Find the boilerplate of the sampled pages and queue them for parsing.
+
+    The boilerplate itself is parsed once, as a block of the city's start
+    page. Returns the boilerplate lines for the pages crawled after the
+    sample.
+    """
+    boilerplate = find_boilerplate_lines([text for _, text, _ in sample])
+    if boilerplate:
+        logging.info(f"{city}: stripped {len(boilerplate)} boilerplate lines")
+        page_futures.append((url, pool.submit(parse_page, city, url, "\n".join(boilerplate), [], ())))
+    for link, text, records in sample:
+        page_futures.append((link, pool.submit(parse_page, city, link, text, records, boilerplate)))
+    sample.clear()
+    return boilerplate
+
+
+def _log_city_error(city, url, error):
+    logging.error(f"[ERROR] {city}: {error}")
+    failed_logger.info(json.dumps({"City": city, "url": url, "error": str(error), "status": "exception"}, ensure_ascii=False))
+
+
+def process_city(row, existing_data, enricher=None, parse_pool=None):
     city = row["עיר"]
     url = str(row["קישור"]).strip() if isinstance(row["קישור"], str) else None
 
     # Check for NaN values (both pandas NaN and string representations)
-    if (pd.isna(url) or
-        url is None or
+    if (url is None or
         url.lower().strip() in ['nan', 'none', 'null', ''] or
         city in existing_data and existing_data[city]):
         logging.info(f"[SKIP] {city}: Already scraped or no URL")
@@ -139,10 +533,16 @@ def process_city(row, existing_data):
         logging.info(f"[SKIP] {city}: marked to skip ({profile.get('reason', 'no reason')})")
         return city, {}
 
+    pool = parse_pool or ParsePool(max_workers=0)
+    # Pages are handed to the pool as they are crawled; only the first
+    # BOILERPLATE_SAMPLE_PAGES wait until the site's boilerplate is known
+    sample = []
+    boilerplate = None
+    page_futures = []
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
-        city_data = {}
 
         try:
             for _ in range(3):
@@ -165,32 +565,65 @@ def process_city(row, existing_data):
                 with open(os.path.join(html_dump_dir, f"{city}.txt"), "w", encoding="utf-8") as f:
                     f.write(text)
 
-                extracted_data = extract_relevant_contacts_from_text(text, city, link).get(city, {})
-                city_data.update(extracted_data)
-
-                for name, contact in extracted_data.items():
-                    input_output_logger.info(json.dumps({"City": city, "Link": link, "Name": name, **contact}, ensure_ascii=False))
-
-            os.makedirs(os.path.join(base_dir, "incremental_results"), exist_ok=True)
-            city_file = os.path.join(base_dir, "incremental_results", f"{city}.json")
-            with open(city_file, "w", encoding="utf-8") as f:
-                json.dump(city_data, f, ensure_ascii=False, indent=2)
-
-            apply_hebrew_transliteration(city_file)
-
-            if not city_data:
-                failed_logger.info(json.dumps({"City": city, "url": url, "status": "empty"}, ensure_ascii=False))
-
-            return city, city_data
+                records = extract_structured_contacts(page)
+                if boilerplate is not None:
+                    page_futures.append((link, pool.submit(parse_page, city, link, text, records, boilerplate)))
+                    continue
+                sample.append((link, text, records))
+                if len(sample) == BOILERPLATE_SAMPLE_PAGES:
+                    boilerplate = _submit_sample(pool, city, url, sample, page_futures)
+            if boilerplate is None:
+                boilerplate = _submit_sample(pool, city, url, sample, page_futures)
         except Exception as e:
-            logging.error(f"[ERROR] {city}: {e}")
-            failed_logger.info(json.dumps({"City": city, "url": url, "error": str(e), "status": "exception"}, ensure_ascii=False))
+            _log_city_error(city, url, e)
             return city, {}
         finally:
             browser.close()
 
+    local_enricher = Enricher() if enricher is None else None
+    try:
+        # ChatGPT lookups run only after the browser has been released; each
+        # page is enriched, logged and merged as soon as its parse is collected
+        city_data = {}
+        for link, future in page_futures:
+            contacts = future.result()
+            (enricher or local_enricher).resolve(contacts)
+            for contact_obj in contacts:
+                if _add_contact(city_data, contact_obj):
+                    contact = city_data[contact_obj.name]
+                    input_output_logger.info(json.dumps({"City": city, "Link": link, "Name": contact_obj.name, **contact}, ensure_ascii=False))
+
+        os.makedirs(os.path.join(base_dir, "incremental_results"), exist_ok=True)
+        city_file = os.path.join(base_dir, "incremental_results", f"{city}.json")
+        with open(city_file, "w", encoding="utf-8") as f:
+            json.dump(city_data, f, ensure_ascii=False, indent=2)
+
+        apply_hebrew_transliteration(city_file)
+        with open(city_file, encoding="utf-8") as f:
+            city_data = json.load(f)
+
+        if not city_data:
+            failed_logger.info(json.dumps({"City": city, "url": url, "status": "empty"}, ensure_ascii=False))
+
+        return city, city_data
+    except Exception as e:
+        _log_city_error(city, url, e)
+        return city, {}
+    finally:
+        if local_enricher is not None:
+            local_enricher.close()
+
+
+def _write_json_member(f, key, value, first):
+    """Write ``key: value`` into the JSON object being streamed to ``f``.
 
-def scrape_with_browser(file_path: str | None = None):
+    The output matches ``json.dump(..., indent=2)`` of the whole object.
+    """
+    member = json.dumps({key: value}, ensure_ascii=False, indent=2)[2:-2]
+    f.write(("\n" if first else ",\n") + member)
+
+
+def scrape_with_browser(file_path: str | None = None, persist_parse_cache: bool = False):
     if file_path is None:
         file_name = input("Enter the name of the output file (e.g., 'contacts.json'): ")
         if not file_name.endswith(".json"):
@@ -200,6 +633,9 @@ def scrape_with_browser(file_path: str | None = None):
         dict_path = file_path if file_path.endswith(".json") else file_path + ".json"
         file_name = os.path.basename(dict_path)
 
+    import pandas as pd
+
+    setup_logging()
     start_time = time.time()
     df = pd.read_csv(os.path.join(base_dir, "data", "cities_links.csv"), encoding="utf-8-sig")
     total_items = len(df)
@@ -212,15 +648,32 @@ def scrape_with_browser(file_path: str | None = None):
     with open(dict_path, encoding="utf-8") as f:
         results = json.load(f)
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_city = {executor.submit(process_city, row, results): row["עיר"] for _, row in df.iterrows()}
+    jobs.parse_cache = ParseCache(path=PARSE_CACHE_FILE if persist_parse_cache else None)
+    # Build the name index and department classifier once here so parse
+    # pool workers receive them
+    jobs.load_name_index()
+    jobs.load_dept_classifier()
+    enricher = Enricher()
+    parse_pool = ParsePool()
+    # Each city is written out as soon as it is done instead of being kept
+    # until the end; cities not scraped in this run keep their previous data
+    partial_path = dict_path + ".partial"
+    written = set()
+    with open(partial_path, "w", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=5) as executor:
+        out.write("{")
+        future_to_city = {
+            executor.submit(process_city, row, results, enricher, parse_pool): row["עיר"]
+            for _, row in df.iterrows()
+        }
         completed = 0
 
         for future in tqdm(as_completed(future_to_city), total=total_items, desc="scraping cities"):
             city = future_to_city[future]
             try:
                 city, data = future.result(timeout=60)
-                results[city] = data
+                _write_json_member(out, city, data, first=not written)
+                written.add(city)
+                results.pop(city, None)
             except Exception as exc:
                 logging.error(f"[TIMEOUT/ERROR] {city}: {exc}")
                 failed_logger.info(json.dumps({"City": city, "error": str(exc), "status": "timeout"}, ensure_ascii=False))
@@ -232,19 +685,53 @@ def scrape_with_browser(file_path: str | None = None):
                     est_time = avg_time * (total_items - completed)
                     print("--- Estimated remaining time: %.2f minutes ---" % (est_time / 60))
 
-    with open(dict_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    apply_hebrew_transliteration(dict_path)
+        for city, data in results.items():
+            if city not in written:
+                _write_json_member(out, city, data, first=not written)
+                written.add(city)
+        out.write("\n}" if written else "}")
+    os.replace(partial_path, dict_path)
+
+    parse_pool.close()
+    enricher.close()
+    logging.info(f"Enrichment: {enricher.summary()}")
+    logging.info(f"Parse cache: {jobs.parse_cache.summary()}")
+    logging.info(f"LLM cache: {llm_cache.get_cache().summary()}")
+    telemetry = llm_telemetry.get_telemetry().summary(contacts=Contacts.contacts)
+    logging.info(f"LLM calls:\n{telemetry}")
+    jobs.parse_cache.save()
 
     with open(os.path.join(base_dir, "incremental_results", "contacts.json"), "w", encoding="utf-8") as f:
         json.dump(Contacts.contacts, f, ensure_ascii=False, indent=2)
 
     collect_names()
+    jobs.flush_translation_cache()
     logging.info(f"Done scraping all cities into {file_name}, there were {Contacts.contacts}")
     print(" File saved:", dict_path)
 
 
+USAGE = (
+    "Usage: python database_func.py [output.json] [--persist-parse-cache] "
+    "[--llm-cache-only] [--llm-telemetry FILE]"
+)
+
+
+def _option_value(flag, default=None):
+    """Return the value following ``flag`` on the command line, or ``default``."""
+    if flag not in sys.argv:
+        return default
+    position = sys.argv.index(flag) + 1
+    if position >= len(sys.argv) or sys.argv[position].startswith("--"):
+        sys.exit(f"{USAGE}\n{flag} needs a file name")
+    return sys.argv[position]
+
+
 if __name__ == "__main__":
-    path_arg = sys.argv[1] if len(sys.argv) > 1 else None
-    scrape_with_browser(path_arg)
+    telemetry_file = _option_value("--llm-telemetry")
+    if telemetry_file:
+        llm_telemetry.configure(jsonl_path=telemetry_file)
+    args = [a for a in sys.argv[1:] if not a.startswith("--") and a != telemetry_file]
+    path_arg = args[0] if args else None
+    if "--llm-cache-only" in sys.argv:
+        llm_cache.configure(cache_only=True)
+    scrape_with_browser(path_arg, persist_parse_cache="--persist-parse-cache" in sys.argv)
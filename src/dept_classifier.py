@@ -0,0 +1,173 @@
+"""Offline department classifier for contact blocks.
+
+When no department keyword matches a block, ``Contacts.parse`` used to leave
+the department to ChatGPT. :class:`DepartmentClassifier` is a naive Bayes
+model over character trigrams of the Hebrew words and whole Latin words
+(email addresses, URL paths) of a block, trained from the contacts of an
+earlier run in ``output/contacts.json``. It maps a block and its page URL to
+one of the canonical ``מחלקת X`` departments with a confidence; below
+``CONFIDENCE_THRESHOLD`` the caller still asks ChatGPT.
+
+Contacts whose department is not canonical are kept as a background class, so
+features common to every block (phone labels, mail domains) do not vote for
+any department. The summed weights of each word are memoised, so a block is
+classified with one dictionary lookup per word, thousands of blocks per
+second.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from collections.abc import Collection, Iterable
+from pathlib import Path
+
+TRAINING_FILE = Path(__file__).resolve().parents[1] / "output" / "contacts.json"
+
+# Departments below this confidence are left to ChatGPT
+CONFIDENCE_THRESHOLD = 0.9
+# Softens the posterior: the features of a block are far from independent
+TEMPERATURE = 3.0
+# Additive smoothing of the feature counts
+ALPHA = 0.5
+
+_HEBREW_WORD_RE = re.compile(r"[א-ת]+")
+_LATIN_WORD_RE = re.compile(r"[a-z]{3,}")
+# Label of the contacts without a canonical department
+_BACKGROUND = ""
+# Words whose summed weights are memoised before the memo is started afresh
+_MAX_MEMO = 100_000
+
+
+def tokens(text: str) -> set[str]:
+    """Return the distinct Hebrew words and ``w:``-marked Latin words of ``text``."""
+    found = set(_HEBREW_WORD_RE.findall(text))
+    found.update("w:" + word for word in _LATIN_WORD_RE.findall(text.lower()))
+    return found
+
+
+def token_features(token: str) -> list[str]:
+    """Return the features of one token: trigrams of a Hebrew word, or the Latin word."""
+    if token.startswith("w:"):
+        return [token]
+    padded = f" {token} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class DepartmentClassifier:
+    """Naive Bayes classifier from block text to a canonical department."""
+
+    def __init__(self):
+        self.labels: list[str] = []
+        # Per label, in the order of ``labels``
+        self._log_prior: list[float] = []
+        # Log-probability of a feature never seen with the label
+        self._log_unseen: list[float] = []
+        # feature -> {label index: log-probability gain over an unseen feature}
+        self._weights: dict[str, dict[int, float]] = {}
+        # token -> (known features, gain per label), None when nothing is known
+        self._memo: dict[str, tuple[float, ...] | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    @classmethod
+    def train(cls, examples: Iterable[tuple[str, str | None]], alpha: float = ALPHA) -> "DepartmentClassifier":
+        """Train from ``(text, department)`` pairs; ``None`` marks the background."""
+        label_counts: Counter[str] = Counter()
+        feature_totals: Counter[str] = Counter()
+        counts: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        for text, label in examples:
+            label = label or _BACKGROUND
+            label_counts[label] += 1
+            for token in tokens(text):
+                for feature in token_features(token):
+                    counts[feature][label] += 1
+                    feature_totals[label] += 1
+
+        model = cls()
+        if not label_counts:
+            return model
+        total = sum(label_counts.values())
+        vocabulary = len(counts)
+        model.labels = sorted(label_counts)
+        for label in model.labels:
+            model._log_prior.append(math.log(label_counts[label] / total))
+            model._log_unseen.append(math.log(alpha / (feature_totals[label] + alpha * vocabulary)))
+        for feature, by_label in counts.items():
+            model._weights[feature] = {
+                i: math.log((by_label[label] + alpha) / (feature_totals[label] + alpha * vocabulary))
+                - model._log_unseen[i]
+                for i, label in enumerate(model.labels)
+                if label in by_label
+            }
+        return model
+
+    @classmethod
+    def from_contacts(cls, path: str | Path, departments: Collection[str]) -> "DepartmentClassifier":
+        """Train from a ``database_func`` output file.
+
+        The name, role and email of each contact stand in for its block;
+        contacts whose department is not in ``departments`` form the
+        background class.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        examples = []
+        for people in data.values():
+            for person in (people or {}).values():
+                text = " ".join(str(person.get(key) or "") for key in ("שם", "תפקיד", "מייל"))
+                department = person.get("מחלקה")
+                examples.append((text, department if department in departments else None))
+        return cls.train(examples)
+
+    def _token_vector(self, token: str) -> tuple[float, ...] | None:
+        if token in self._memo:
+            return self._memo[token]
+        vector = None
+        for feature in token_features(token):
+            weights = self._weights.get(feature)
+            if weights is None:
+                continue
+            if vector is None:
+                vector = [0.0] * (len(self.labels) + 1)
+            vector[0] += 1
+            for i, weight in weights.items():
+                vector[i + 1] += weight
+        if len(self._memo) >= _MAX_MEMO:
+            self._memo.clear()
+        self._memo[token] = vector = tuple(vector) if vector else None
+        return vector
+
+    def classify(self, text: str, url: str | None = None) -> tuple[str | None, float]:
+        """Return the best department for ``text`` and ``url`` and its confidence.
+
+        The department is ``None`` when the background class wins or nothing
+        in the block was seen in training.
+        """
+        vectors = [self._token_vector(token) for token in tokens(f"{text} {url}" if url else text)]
+        vectors = [v for v in vectors if v is not None]
+        if not vectors:
+            return None, 0.0
+        known, *gains = map(sum, zip(*vectors))
+        scores = [
+            prior + gain + known * unseen
+            for prior, gain, unseen in zip(self._log_prior, gains, self._log_unseen)
+        ]
+
+        top = max(scores)
+        best = self.labels[scores.index(top)]
+        confidence = 1.0 / sum(math.exp((score - top) / TEMPERATURE) for score in scores)
+        return (best or None), confidence
+
+
+def load(departments: Collection[str], path: str | Path = TRAINING_FILE) -> DepartmentClassifier:
+    """Train a classifier from ``path``; an untrained one if it cannot be read."""
+    try:
+        return DepartmentClassifier.from_contacts(path, departments)
+    except (OSError, ValueError, AttributeError) as e:
+        logging.info(f"Department classifier not trained ({e})")
+        return DepartmentClassifier()
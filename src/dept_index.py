@@ -0,0 +1,141 @@
+"""Canonical department IDs for the many ways a department is written.
+
+The same department shows up as "אגף החינוך", "מחלקה לחינוך", "ובחינוך",
+"מחלקת חינוך וצעירים" or "education". :class:`DepartmentIndex` skips the
+head words ("מחלקת", "אגף"...), strips the prefix letters ו/ה/ב/ל/מ a word
+may carry, and looks the remaining words up in a synonym table that maps
+them to a small integer ID per canonical ``מחלקת X`` name. The first
+department named in a string wins. Answers are memoised per string, so
+grouping, deduplication and triage can work on the IDs instead of free text.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Mapping
+
+# Canonical name -> words and two-word phrases naming it, in Hebrew without
+# prefix letters, or in English
+DEPARTMENT_SYNONYMS = {
+    "מחלקת חינוך": ("חינוך", "education"),
+    "מחלקת נוער": ("נוער", "youth"),
+    "מחלקת צעירים": ("צעירים", "young"),
+    "מחלקת תרבות": ("תרבות", "culture"),
+    "מחלקת אירועים": ("אירועים", "events"),
+    "מחלקת קהילה": ("קהילה", "community"),
+    "מחלקת רווחה": ("רווחה", "שירותים חברתיים", "שירותי רווחה", "welfare"),
+    "מחלקת קליטה": ("קליטה", "עלייה", "absorption"),
+    "מחלקת איכות סביבה": ("סביבה", "איכות סביבה", "environment"),
+    "מחלקת אזרחים וותיקים": ("וותיקים", "ותיקים", "גמלאים", "veterans"),
+    "מחלקת ספורט": ("ספורט", "sport", "sports"),
+    "מחלקת כספים": ("כספים", "גזברות", "finance", "finances"),
+    "מחלקת הנדסה": ("הנדסה", "engineering"),
+    "מחלקת תחבורה": ("תחבורה", "תנועה", "transport", "traffic"),
+    "מחלקת ביטחון": ("ביטחון", "בטחון", "security"),
+}
+
+# Words that introduce a department rather than name it
+HEAD_WORDS = frozenset({
+    "מחלקת", "מחלקה", "מחלקות", "אגף", "אגפי", "מדור", "יחידת", "יחידה",
+    "מינהל", "מנהל", "מינהלת", "לשכת", "שירות", "department", "dept",
+})
+
+PREFIX_LETTERS = "והבלמ"
+# Longest run of prefix letters stripped from a word ("ולבית", "ומהעיר")
+_MAX_PREFIXES = 3
+_MAX_MEMO = 100_000
+
+_WORD_RE = re.compile(r"[א-ת]+|[A-Za-z]+")
+
+
+def word_forms(word: str) -> list[str]:
+    """Return ``word`` and the words left after stripping its prefix letters."""
+    forms = [word]
+    while (
+        len(forms) <= _MAX_PREFIXES
+        and forms[-1][0] in PREFIX_LETTERS
+        and len(forms[-1]) > 3
+    ):
+        forms.append(forms[-1][1:])
+    return forms
+
+
+class DepartmentIndex:
+    """Map department strings to canonical department IDs."""
+
+    def __init__(self, synonyms: Mapping[str, tuple[str, ...]] = DEPARTMENT_SYNONYMS):
+        self.names: list[str] = list(synonyms)
+        self._ids = {name: i for i, name in enumerate(self.names)}
+        self._words: dict[str, int] = {}
+        self._phrases: dict[tuple[str, str], int] = {}
+        for i, name in enumerate(self.names):
+            for synonym in synonyms[name]:
+                words = synonym.lower().split()
+                if len(words) == 1:
+                    self._words[words[0]] = i
+                else:
+                    self._phrases[tuple(words[:2])] = i
+        self._memo: dict[str, int | None] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _lookup(self, text: str) -> int | None:
+        words = [word.lower() for word in _WORD_RE.findall(text)]
+        words = [word for word in words if not HEAD_WORDS.intersection(word_forms(word))]
+        for i, word in enumerate(words):
+            forms = word_forms(word)
+            if i + 1 < len(words):
+                for first in forms:
+                    for second in word_forms(words[i + 1]):
+                        found = self._phrases.get((first, second))
+                        if found is not None:
+                            return found
+            for form in forms:
+                found = self._words.get(form)
+                if found is not None:
+                    return found
+        return None
+
+    def department_id(self, text: str | None) -> int | None:
+        """Return the ID of the first department named in ``text``, if any."""
+        if not text:
+            return None
+        try:
+            return self._memo[text]
+        except KeyError:
+            pass
+        found = self._ids.get(text.strip())
+        if found is None:
+            found = self._lookup(text)
+        with self._lock:
+            if len(self._memo) >= _MAX_MEMO:
+                self._memo.clear()
+            self._memo[text] = found
+        return found
+
+    def canonical(self, text: str | None) -> str | None:
+        """Return the canonical ``מחלקת X`` name of the department in ``text``."""
+        found = self.department_id(text)
+        return None if found is None else self.names[found]
+
+
+_index: DepartmentIndex | None = None
+
+
+def get_index() -> DepartmentIndex:
+    """Return the process-wide index built from ``DEPARTMENT_SYNONYMS``."""
+    global _index
+    if _index is None:
+        _index = DepartmentIndex()
+    return _index
+
+
+def department_id(text: str | None) -> int | None:
+    return get_index().department_id(text)
+
+
+def canonical_department(text: str | None) -> str | None:
+    return get_index().canonical(text)
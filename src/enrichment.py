@@ -0,0 +1,90 @@
+"""Deferred ChatGPT enrichment for contacts parsed with ``defer_enrichment``.
+
+Parsing a :class:`jobs.Contacts` block never waits on OpenAI when it is
+created with ``defer_enrichment=True``; the lookups it still needs are left in
+``Contacts.pending``. An :class:`Enricher` shared by the whole run collects
+those requests, sends each unique one only once and runs them concurrently on
+its own thread pool, then writes the answers back into the contacts.
+Requests whose texts differ only in whitespace count as the same request.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Iterable
+
+import jobs
+
+
+def request_key(request: tuple) -> tuple:
+    """Return the deduplication key of an enrichment request.
+
+    Texts are compared with whitespace collapsed, so the same block scraped
+    with different line breaks or indentation is sent once.
+    """
+    return tuple(" ".join(part.split()) if isinstance(part, str) else part for part in request)
+
+
+class Enricher:
+    """Resolve contact enrichment requests with run-wide deduplication."""
+
+    def __init__(self, max_workers: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrich")
+        self._futures: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.requested = 0
+        self.sent = 0
+
+    def __enter__(self) -> "Enricher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _call(request: tuple) -> str | None:
+        try:
+            return jobs.run_enrichment_request(request)
+        except Exception:
+            logging.exception("Enrichment request failed")
+            return None
+
+    def resolve(self, contacts: Iterable[jobs.Contacts]) -> None:
+        """Resolve the pending requests of ``contacts`` as one concurrent batch.
+
+        Requests already answered, or in flight for another caller, are not
+        sent again.
+        """
+        contacts = [c for c in contacts if c.pending]
+        futures: dict[tuple, Future] = {}
+        with self._lock:
+            for contact in contacts:
+                for request in contact.enrichment_requests():
+                    self.requested += 1
+                    if request in futures:
+                        continue
+                    key = request_key(request)
+                    future = self._futures.get(key)
+                    if future is None:
+                        future = self._executor.submit(self._call, request)
+                        self._futures[key] = future
+                        self.sent += 1
+                    futures[request] = future
+
+        wait(futures.values())
+        results = {request: future.result() for request, future in futures.items()}
+        for contact in contacts:
+            contact.apply_enrichment(results)
+
+    def summary(self) -> str:
+        saved = self.requested - self.sent
+        ratio = saved / self.requested if self.requested else 0.0
+        return (
+            f"{self.requested} enrichment requests, {self.sent} sent to ChatGPT, "
+            f"{saved} deduplicated ({ratio:.0%})"
+        )
@@ -1,31 +1,43 @@
-import pandas as pd
 import sys
 import re
 import os
-import time
-from typing import Optional
-import openai
-import time
+from typing import TYPE_CHECKING, Optional
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from tqdm import tqdm
 
-
-# Initialize OpenAI client only when needed
-client = None
-
-def get_openai_client():
-    global client
-    if client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("Missing OPENAI_API_KEY. Please export it using: export OPENAI_API_KEY='your-key-here'")
-        client = openai.OpenAI(api_key=api_key)
-    return client
+import llm_cache
+import llm_client
+import llm_telemetry
+from dept_index import canonical_department, department_id
+from jobs import POSSIBLE_ROLES, load_name_index, name_index
+from contact_normalize import (
+    normalize_email,
+    normalize_emails,
+    normalize_phone,
+    normalize_phones,
+    phone_dedup_key,
+    phone_dedup_keys,
+)
+from lexicon import Lexicon
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _isna(value) -> bool:
+    """``pd.isna`` for a single value, without importing pandas."""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)  # NaN and NaT differ from themselves
+    except TypeError:  # pd.NA refuses to be a bool
+        return True
 
 
 def gpt_fix_names_and_department(name: str, department: str) -> tuple[str, str]:
     """Use OpenAI to fix Hebrew names and standardize departments"""
-    if pd.isna(name) or not name:
+    if _isna(name) or not name:
         return "", department or ""
 
     # Use JSON format for more reliable parsing
@@ -50,149 +62,201 @@ def gpt_fix_names_and_department(name: str, department: str) -> tuple[str, str]:
 
 תשובה:"""
 
-    max_retries = 3
-    for attempt in range(max_retries):
+    # llm_client already backs off and retries rate limits and transient
+    # errors, so one call is all a row gets
+    try:
+        content = llm_client.complete(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "אתה עוזר לנקות נתוני אנשי קשר. החזר תמיד JSON תקין."},
+                {"role": "user", "content": json_prompt}
+            ],
+            temperature=0.1,
+            max_tokens=100,
+            timeout=15,
+            stage="gpt_fix_names_and_department",
+        )
+    except Exception as e:
+        print(f"OpenAI request failed for '{name[:30]}...': {e}")
+        # None also means not in the cache with --llm-cache-only
+        content = None
+
+    if content is not None:
+        content = content.strip()
+
+        # Try to parse JSON response
         try:
-            response = get_openai_client().chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "אתה עוזר לנקות נתוני אנשי קשר. החזר תמיד JSON תקין."},
-                    {"role": "user", "content": json_prompt}
-                ],
-                temperature=0.1,
-                max_tokens=100,
-                timeout=15
-            )
-
-            content = response.choices[0].message.content.strip()
-
-            # Try to parse JSON response
-            try:
-                import json
-                # Extract JSON from response
-                json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-
-                    fixed_name = result.get("name", "").strip() if result.get("name") else ""
-                    fixed_dept = result.get("department", "").strip() if result.get("department") else department
-
-                    # Validate results
-                    if fixed_name and len(fixed_name) >= 2 and "לא רלוונטי" not in fixed_name:
-                        time.sleep(0.2)  # Rate limiting
-                        return fixed_name, fixed_dept
-                    else:
-                        time.sleep(0.2)
-                        return "", fixed_dept
-
-            except json.JSONDecodeError:
-                # Fallback to original regex parsing
-                name_match = re.search(r"שם:\s*(.+)", content)
-                dept_match = re.search(r"מחלקה:\s*(.+)", content)
-
-                fixed_name = name_match.group(1).strip() if name_match else name
-                fixed_dept = dept_match.group(1).strip() if dept_match else department
-
-                if "לא רלוונטי" in fixed_name or len(fixed_name) < 2:
-                    time.sleep(0.2)
+            # Extract JSON from response
+            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            if json_match:
+                result = json.loads(json_match.group())
+
+                fixed_name = result.get("name", "").strip() if result.get("name") else ""
+                fixed_dept = result.get("department", "").strip() if result.get("department") else department
+
+                # Validate results
+                if fixed_name and len(fixed_name) >= 2 and "לא רלוונטי" not in fixed_name:
+                    return fixed_name, fixed_dept
+                else:
                     return "", fixed_dept
 
-                time.sleep(0.2)
-                return fixed_name, fixed_dept
+        except json.JSONDecodeError:
+            # Fallback to original regex parsing
+            name_match = re.search(r"שם:\s*(.+)", content)
+            dept_match = re.search(r"מחלקה:\s*(.+)", content)
 
-        except Exception as e:
-            print(f"OpenAI attempt {attempt + 1} failed for '{name[:30]}...': {e}")
-            if attempt < max_retries - 1:
-                time.sleep(1)  # Wait before retry
-                continue
+            fixed_name = name_match.group(1).strip() if name_match else name
+            fixed_dept = dept_match.group(1).strip() if dept_match else department
 
-    # If all attempts fail, return original with basic cleaning
-    print(f"All OpenAI attempts failed for '{name[:30]}...', using fallback")
+            if "לא רלוונטי" in fixed_name or len(fixed_name) < 2:
+                return "", fixed_dept
+
+            return fixed_name, fixed_dept
+
+    # Without a usable answer, return original with basic cleaning
+    print(f"No usable OpenAI answer for '{name[:30]}...', using fallback")
     cleaned_name = re.sub(r'["\n\t]', '', name).strip()
     return cleaned_name if len(cleaned_name) >= 2 else "", department
 
-def clean_phone_number(phone: str) -> Optional[str]:
-    """Clean and standardize phone numbers"""
-    if pd.isna(phone) or not phone:
-        return None
+# Contacts sent per OpenAI request by gpt_fix_names_and_departments
+OPENAI_BATCH_SIZE = 20
+# Completion token budget of one batched request
+OPENAI_MAX_TOKENS = 1500
+# Completion tokens one contact takes in a batched answer, to fit the budget
+_TOKENS_PER_CONTACT = 40
+# Batched requests sent together for each progress chunk of clean_csv_data
+_BATCHES_PER_CHUNK = 16
 
-    # Convert to string and handle float values (which lose leading zeros)
-    phone_str = str(phone).strip()
+BATCH_SYSTEM_PROMPT = """אתה עוזר לנקות נתוני אנשי קשר. תקבל מערך JSON של אנשי קשר עם id, name ו-department.
+החזר מערך JSON בלבד, עם אובייקט אחד לכל איש קשר ובאותו id: {"id": 0, "name": "...", "department": "..."}
 
-    # If it's a float (like 26302700.0), convert to int first to remove .0
-    if '.' in phone_str and phone_str.replace('.', '').replace('-', '').isdigit():
-        try:
-            phone_int = int(float(phone_str))
-            phone_str = str(phone_int)
-        except ValueError:
-            pass
-
-    # Add leading zero if it looks like an Israeli number without one
-    if phone_str.isdigit() and len(phone_str) in [8, 9] and not phone_str.startswith('0'):
-        phone_str = '0' + phone_str
-
-    # Remove all non-digit characters except +
-    cleaned = re.sub(r'[^\d+]', '', phone_str)
-
-    # Handle international formats
-    if cleaned.startswith('+972'):
-        cleaned = '0' + cleaned[4:]
-    elif cleaned.startswith('972'):
-        cleaned = '0' + cleaned[3:]
-
-    # Israeli phone number validation and formatting:
-    # Mobile: 05X-XXX-XXXX (10 digits total)
-    # Landline: 0X-XXX-XXXX (9 digits total)
-
-    if len(cleaned) >= 8 and cleaned.startswith('0'):
-        # Mobile numbers (10 digits): 050-XXX-XXXX, 052-XXX-XXXX, etc.
-        if re.match(r'^05[0-9]\d{7}$', cleaned):
-            # Format: 052-123-4567
-            return f"{cleaned[:3]}-{cleaned[3:6]}-{cleaned[6:]}"
-
-        # Jerusalem area (02): 02-XXX-XXXX (9 digits)
-        elif re.match(r'^02\d{7}$', cleaned):
-            # Format: 02-123-4567
-            return f"{cleaned[:2]}-{cleaned[2:5]}-{cleaned[5:]}"
-
-        # Tel Aviv area (03): 03-XXX-XXXX (9 digits)
-        elif re.match(r'^03\d{7}$', cleaned):
-            # Format: 03-123-4567
-            return f"{cleaned[:2]}-{cleaned[2:5]}-{cleaned[5:]}"
-
-        # Haifa area (04): 04-XXX-XXXX (9 digits)
-        elif re.match(r'^04\d{7}$', cleaned):
-            # Format: 04-123-4567
-            return f"{cleaned[:2]}-{cleaned[2:5]}-{cleaned[5:]}"
-
-        # Other valid area codes (08, 09): 0X-XXX-XXXX (9 digits)
-        elif re.match(r'^0[89]\d{7}$', cleaned):
-            # Format: 08-123-4567
-            return f"{cleaned[:2]}-{cleaned[2:5]}-{cleaned[5:]}"
-
-        # Special numbers (07X): 07X-XXX-XXXX (10 digits)
-        elif re.match(r'^07[0-9]\d{7}$', cleaned):
-            # Format: 070-123-4567
-            return f"{cleaned[:3]}-{cleaned[3:6]}-{cleaned[6:]}"
-
-    return None
+כללים לשם:
+- רק שמות אמיתיים של אנשים (פרטי ומשפחה)
+- אם זה שם באנגלית - תרגם לעברית (David → דוד)
+- אם זה מילים כמו "דרישה", "מס", "טלפון", "פקס" - החזר null
+- אם זה תיאור או הוראה - החזר null
+- אם זה שם + תפקיד - חלץ רק את השם האמיתי
 
-def clean_email(email: str) -> Optional[str]:
-    """Clean and validate email addresses"""
-    if pd.isna(email) or not email:
-        return None
+כללים למחלקה:
+- תקן לפורמט "מחלקת [שם]" (חינוך/רווחה/נוער/תרבות/ספורט/הנדסה/כספים)"""
+
+
+def _valid_fixed_name(name) -> str:
+    if not isinstance(name, str):
+        return ""
+    name = name.strip()
+    return name if len(name) >= 2 and "לא רלוונטי" not in name else ""
+
+
+def _parse_batch_answer(content: str, batch: dict[int, tuple]) -> dict[int, tuple[str, str]]:
+    """Return the valid ``{id: (name, department)}`` entries of a batched answer."""
+    json_match = re.search(r'\[.*\]', content, re.DOTALL)
+    if not json_match:
+        return {}
+    try:
+        items = json.loads(json_match.group())
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+
+    fixed = {}
+    for item in items:
+        if not isinstance(item, dict) or item.get("id") not in batch or item["id"] in fixed:
+            continue
+        name, department = item.get("name"), item.get("department")
+        if name is not None and not isinstance(name, str):
+            continue
+        if department is not None and not isinstance(department, str):
+            continue
+        original_dept = batch[item["id"]][1]
+        fixed[item["id"]] = (_valid_fixed_name(name), department.strip() if department else original_dept)
+    return fixed
+
+
+def _batch_request(batch: dict[int, tuple], max_tokens: int) -> dict:
+    payload = [
+        {"id": i, "name": str(name), "department": "" if _isna(dept) else str(dept)}
+        for i, (name, dept) in batch.items()
+    ]
+    return dict(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+        ],
+        temperature=0.1,
+        max_tokens=max_tokens,
+        timeout=60,
+        stage="gpt_fix_names_and_departments",
+    )
+
+
+def gpt_fix_names_and_departments(
+    pairs: list[tuple[str, str]],
+    batch_size: int = OPENAI_BATCH_SIZE,
+    max_tokens: int = OPENAI_MAX_TOKENS,
+) -> list[tuple[str, str]]:
+    """Fix many ``(name, department)`` pairs with one OpenAI request per batch.
+
+    Each request carries at most ``batch_size`` contacts, fewer when their
+    answers would not fit in ``max_tokens``. The requests run concurrently,
+    paced by ``llm_client``. Contacts missing from an answer or failing
+    validation are sent again one by one through
+    :func:`gpt_fix_names_and_department`.
+    """
+    results: list[tuple[str, str] | None] = [None] * len(pairs)
+    todo = []
+    for i, (name, department) in enumerate(pairs):
+        if _isna(name) or not name:
+            results[i] = ("", department or "")
+        else:
+            todo.append(i)
+
+    per_request = max(1, min(batch_size, max_tokens // _TOKENS_PER_CONTACT))
+    batches = [
+        {i: pairs[i] for i in todo[start:start + per_request]}
+        for start in range(0, len(todo), per_request)
+    ]
+    answers = llm_client.complete_many([_batch_request(batch, max_tokens) for batch in batches])
+    for batch, content in zip(batches, answers):
+        if isinstance(content, Exception):
+            print(f"Batched OpenAI request for {len(batch)} contacts failed: {content}")
+            continue
+        for i, fixed in (_parse_batch_answer(content, batch) if content else {}).items():
+            results[i] = fixed
 
-    email = str(email).strip().lower()
+    retry = [i for i, fixed in enumerate(results) if fixed is None]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for i, fixed in zip(retry, executor.map(lambda i: gpt_fix_names_and_department(*pairs[i]), retry)):
+            results[i] = fixed
+    return results
 
-    # Basic email validation
-    if re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', email):
-        return email
 
-    return None
+def clean_phone_number(phone: str) -> Optional[str]:
+    """Clean and standardize phone numbers"""
+    return normalize_phone(phone)
+
+def clean_email(email: str) -> Optional[str]:
+    """Clean and validate email addresses"""
+    return normalize_email(email)
+
+# Blacklisted names (from jobs.py)
+BLACKLISTED_NAMES = {
+    "info", "contact", "office", "admin", "support", "service", "team",
+    "mail", "email", "example", "lishka", "agaf", "department",
+    "webmaster", "noreply", "no-reply", "donotreply",
+    # Hebrew equivalents
+    "קונטקט", "אינפו", "אדמין", "ספורט", "אופיס", "לישקה", "ובמסטר", "נוריפליי"
+}
+_BLACKLIST_LEXICON = Lexicon(BLACKLISTED_NAMES, ignore_case=True)
+# Job titles mixed into names; the per-word filter also drops "תפקיד"
+_TITLE_LEXICON = Lexicon(['מנהל', 'רכז', 'עובד', 'מזכיר', 'יועץ'])
+_TITLE_WORD_LEXICON = Lexicon(['מנהל', 'רכז', 'עובד', 'מזכיר', 'יועץ', 'תפקיד'])
 
 def clean_name(name: str) -> Optional[str]:
     """Clean and standardize names"""
-    if pd.isna(name) or not name:
+    if _isna(name) or not name:
         return None
 
     name = str(name).strip()
@@ -200,16 +264,7 @@ def clean_name(name: str) -> Optional[str]:
     # Remove quotes, newlines, and tabs
     name = name.replace('"', '').replace("'", '').replace('\n', ' ').replace('\t', ' ')
 
-    # Check for blacklisted names (from jobs.py)
-    blacklisted_names = {
-        "info", "contact", "office", "admin", "support", "service", "team",
-        "mail", "email", "example", "lishka", "agaf", "department",
-        "webmaster", "noreply", "no-reply", "donotreply",
-        # Hebrew equivalents
-        "קונטקט", "אינפו", "אדמין", "ספורט", "אופיס", "לישקה", "ובמסטר", "נוריפליי"
-    }
-
-    if name.lower() in blacklisted_names:
+    if name.lower() in BLACKLISTED_NAMES:
         return None
 
     # Remove common prefixes/suffixes that aren't names
@@ -232,22 +287,20 @@ def clean_name(name: str) -> Optional[str]:
             return None
 
     # Check if name contains blacklisted words
-    name_lower = name.lower()
-    for blacklisted in blacklisted_names:
-        if blacklisted in name_lower:
-            return None
+    if _BLACKLIST_LEXICON.contains_any(name):
+        return None
 
     # Clean up common formatting issues
     name = re.sub(r'\s+', ' ', name)  # Multiple spaces to single space
     name = re.sub(r'^[,\-\s:]+|[,\-\s:]+$', '', name)  # Remove leading/trailing punctuation
 
     # Remove text that looks like job titles mixed with names
-    if any(word in name.lower() for word in ['מנהל', 'רכז', 'עובד', 'מזכיר', 'יועץ']):
+    if _TITLE_LEXICON.contains_any(name.lower()):
         # Try to extract just the name part
         words = name.split()
         potential_names = []
         for word in words:
-            if not any(title in word for title in ['מנהל', 'רכז', 'עובד', 'מזכיר', 'יועץ', 'תפקיד']):
+            if not _TITLE_WORD_LEXICON.contains_any(word):
                 potential_names.append(word)
         if potential_names:
             name = ' '.join(potential_names)
@@ -256,7 +309,7 @@ def clean_name(name: str) -> Optional[str]:
 
 def clean_department(dept: str) -> Optional[str]:
     """Clean and standardize department names"""
-    if pd.isna(dept) or not dept:
+    if _isna(dept) or not dept:
         return None
 
     dept = str(dept).strip()
@@ -265,11 +318,12 @@ def clean_department(dept: str) -> Optional[str]:
     if len(dept) < 3 or dept.lower() in ['na', 'n/a', 'null', 'none']:
         return None
 
-    return dept
+    # "אגף החינוך", "education"... -> "מחלקת חינוך"
+    return canonical_department(dept) or dept
 
 def clean_role(role: str) -> Optional[str]:
     """Clean and standardize role/position names"""
-    if pd.isna(role) or not role:
+    if _isna(role) or not role:
         return None
 
     role = str(role).strip()
@@ -280,32 +334,71 @@ def clean_role(role: str) -> Optional[str]:
 
     return role
 
-def normalize_phone_for_dedup(phone: str) -> str:
-    """Normalize phone number for deduplication by removing all formatting"""
-    if pd.isna(phone) or not phone:
-        return ""
-
-    phone_str = str(phone).strip()
-
-    # Remove all non-digit characters
-    digits_only = re.sub(r'[^\d]', '', phone_str)
-
-    # Handle international formats - normalize to local format
-    if digits_only.startswith('972'):
-        digits_only = '0' + digits_only[3:]
+# Triage buckets of rows whose name and department are left as they are
+TRIAGE_SKIP = frozenset({"empty_name", "confident"})
+
+_LATIN_RE = re.compile(r"[A-Za-z]")
+_HEBREW_NAME_WORD_RE = re.compile(r"[א-ת][א-ת'\"׳-]+")
+_CANONICAL_DEPT_RE = re.compile(r"מחלקת [א-ת][א-ת'\"׳ -]+")
+_ROLE_WORDS = frozenset(POSSIBLE_ROLES)
+
+
+def triage_contact(name, department, index=None) -> str:
+    """Sort a cleaned row into a triage bucket with cheap local checks.
+
+    ``confident`` rows hold a two or three word Hebrew name with a given name
+    or surname known to the gazetteer (``index``, else :func:`jobs.name_index`) and a
+    department that is empty or already in the ``מחלקת X`` form. They, and
+    rows without a name, need nothing from OpenAI (see ``TRIAGE_SKIP``).
+    The other buckets say why a row still goes to
+    :func:`gpt_fix_names_and_department`: ``latin_name``, ``unknown_name``
+    or ``department``.
+    """
+    if _isna(name) or not str(name).strip():
+        return "empty_name"
+    words = str(name).split()
+    if _LATIN_RE.search(str(name)):
+        return "latin_name"
+    if not 2 <= len(words) <= 3 or not all(_HEBREW_NAME_WORD_RE.fullmatch(w) for w in words):
+        return "unknown_name"
+    if _ROLE_WORDS.intersection(words):
+        return "unknown_name"
+    if index is None:
+        index = name_index()
+    if not (index.is_given(words[0]) or any(index.is_surname(w) for w in words[1:])):
+        return "unknown_name"
+    if not _isna(department) and not _department_settled(str(department).strip()):
+        return "department"
+    return "confident"
+
+
+def _department_settled(department: str) -> bool:
+    """True for an empty, canonical or at least ``מחלקת X`` shaped department."""
+    if not department or canonical_department(department) == department:
+        return True
+    return bool(_CANONICAL_DEPT_RE.fullmatch(department))
+
+
+def _pair_key(name, department) -> tuple:
+    """Return the (name, department) key under which rows share an OpenAI answer.
+
+    Departments known to :mod:`dept_index` are keyed on their ID.
+    """
+    name, department = ("" if _isna(value) else " ".join(str(value).split()) for value in (name, department))
+    dept_id = department_id(department)
+    return name, department if dept_id is None else dept_id
 
-    # Remove leading zeros for comparison (but keep one if it's an Israeli number)
-    if digits_only.startswith('0') and len(digits_only) > 1:
-        return digits_only
 
-    return digits_only
+def normalize_phone_for_dedup(phone: str) -> str:
+    """Normalize phone number for deduplication by removing all formatting"""
+    return phone_dedup_key(phone)
 
-def remove_duplicate_contacts(df: pd.DataFrame) -> pd.DataFrame:
+def remove_duplicate_contacts(df: "pd.DataFrame") -> "pd.DataFrame":
     """Remove duplicate contacts based on normalized phone and email"""
     print("Creating normalized phone numbers for deduplication...")
 
     # Create normalized phone numbers for better duplicate detection
-    df['_normalized_phone'] = df['טלפון'].apply(normalize_phone_for_dedup)
+    df['_normalized_phone'] = phone_dedup_keys(df['טלפון'])
     df['_normalized_email'] = df['אימייל'].astype(str).str.lower().str.strip()
 
     # Create a composite key for deduplication
@@ -324,8 +417,23 @@ def remove_duplicate_contacts(df: pd.DataFrame) -> pd.DataFrame:
 
     return df_deduped
 
-def clean_csv_data(input_file: str, output_file: str, use_openai: bool = True):
-    """Main function to clean CSV contact data"""
+def clean_csv_data(
+    input_file: str,
+    output_file: str,
+    use_openai: bool = True,
+    openai_batch_size: int = 1,
+    openai_max_tokens: int = OPENAI_MAX_TOKENS,
+):
+    """Main function to clean CSV contact data
+
+    Only rows that :func:`triage_contact` does not trust are sent to OpenAI,
+    each distinct (name, department) pair once.
+    With ``openai_batch_size`` above 1, names and departments are fixed with
+    :func:`gpt_fix_names_and_departments`, that many contacts per request.
+    """
+    import pandas as pd
+    from tqdm import tqdm
+
     try:
         # Read the CSV file with proper UTF-8 BOM handling
         print(f"Reading {input_file}...")
@@ -348,7 +456,7 @@ def clean_csv_data(input_file: str, output_file: str, use_openai: bool = True):
         # First pass: Remove obvious duplicates based on raw phone numbers
         print("Removing obvious duplicates before cleaning...")
         initial_count = len(df)
-        df['_temp_normalized_phone'] = df['טלפון'].apply(normalize_phone_for_dedup)
+        df['_temp_normalized_phone'] = phone_dedup_keys(df['טלפון'])
         df = df.drop_duplicates(subset=['_temp_normalized_phone'], keep='first')
         df = df.drop('_temp_normalized_phone', axis=1)
         removed_initial = initial_count - len(df)
@@ -357,10 +465,10 @@ def clean_csv_data(input_file: str, output_file: str, use_openai: bool = True):
 
         # Clean each column
         print("Cleaning phone numbers...")
-        df['טלפון'] = df['טלפון'].apply(clean_phone_number)
+        df['טלפון'] = normalize_phones(df['טלפון'])
 
         print("Cleaning email addresses...")
-        df['אימייל'] = df['אימייל'].apply(clean_email)
+        df['אימייל'] = normalize_emails(df['אימייל'])
 
         print("Cleaning names...")
         df['שם'] = df['שם'].apply(clean_name)
@@ -372,34 +480,64 @@ def clean_csv_data(input_file: str, output_file: str, use_openai: bool = True):
             df['מחלקה'] = ""
         
         # Optional OpenAI processing
-        if use_openai and os.getenv("OPENAI_API_KEY"):
+        # Without a key, --llm-cache-only still answers from earlier runs
+        if use_openai and (os.getenv("OPENAI_API_KEY") or llm_cache.get_cache().cache_only):
+            name_col, dept_col = df.columns.get_loc("שם"), df.columns.get_loc("מחלקה")
+
+            # Rows that already look clean are kept without asking OpenAI
+            print("Triaging contacts before OpenAI...")
+            index = load_name_index()
+            buckets = [
+                triage_contact(name, dept, index) for name, dept in zip(df.iloc[:, name_col], df.iloc[:, dept_col])
+            ]
+            for bucket, count in pd.Series(buckets, dtype=object).value_counts().items():
+                print(f"  {bucket}: {count}")
+            todo = [pos for pos, bucket in enumerate(buckets) if bucket not in TRIAGE_SKIP]
+
+            # Identical pairs (a department head listed on several pages) are
+            # sent once and the answer is copied to every row holding them
+            groups: dict[tuple, list[int]] = {}
+            for pos in todo:
+                groups.setdefault(_pair_key(df.iloc[pos, name_col], df.iloc[pos, dept_col]), []).append(pos)
+            unique = list(groups.values())
+            if todo:
+                saved = len(todo) - len(unique)
+                print(f"Deduplicated {len(todo)} rows to {len(unique)} unique name/department pairs"
+                      f" ({saved / len(todo):.0%} fewer requests)")
+
             print("Fixing names and departments with OpenAI...")
-            print(f"Processing {len(df)} contacts with OpenAI (this may take a while)...")
+            print(f"Processing {len(unique)} pairs for {len(todo)} of {len(df)} contacts with OpenAI"
+                  " (this may take a while)...")
 
-            # Process in batches to show progress and avoid rate limits
-            batch_size = 10
-            total_batches = (len(df) + batch_size - 1) // batch_size
+            # Process in chunks to show progress and save it as we go; a
+            # chunk holds enough batched requests to run them concurrently
+            batch_size = max(openai_batch_size * _BATCHES_PER_CHUNK, 10)
+            total_batches = (len(unique) + batch_size - 1) // batch_size
             temp_output = output_file.replace(".csv", "_temp.csv")
 
-            for i in range(0, len(df), batch_size):
-                batch_end = min(i + batch_size, len(df))
+            for i in range(0, len(unique), batch_size):
+                chunk = unique[i:i + batch_size]
                 batch_num = (i // batch_size) + 1
-                print(f"\nProcessing batch {batch_num}/{total_batches} (contacts {i+1}-{batch_end})...")
-
-                # Apply OpenAI fixes to the batch
-                for idx in tqdm(range(i, batch_end), desc=f"Batch {batch_num}/{total_batches}", leave=False):
-                    if idx < len(df):
-                        original_name = df.iloc[idx]["שם"]
-                        original_dept = df.iloc[idx]["מחלקה"]
-
-                        fixed_name, fixed_dept = gpt_fix_names_and_department(original_name, original_dept)
-
-                        df.iloc[idx, df.columns.get_loc("שם")] = fixed_name
-                        df.iloc[idx, df.columns.get_loc("מחלקה")] = fixed_dept
+                print(f"\nProcessing batch {batch_num}/{total_batches} (pairs {i+1}-{i + len(chunk)})...")
+
+                pairs = [(df.iloc[rows[0], name_col], df.iloc[rows[0], dept_col]) for rows in chunk]
+                if openai_batch_size > 1:
+                    fixed = gpt_fix_names_and_departments(pairs, openai_batch_size, openai_max_tokens)
+                else:
+                    fixed = [
+                        gpt_fix_names_and_department(name, dept)
+                        for name, dept in tqdm(pairs, desc=f"Batch {batch_num}/{total_batches}", leave=False)
+                    ]
+                for rows, (fixed_name, fixed_dept) in zip(chunk, fixed):
+                    for pos in rows:
+                        df.iloc[pos, name_col] = fixed_name
+                        df.iloc[pos, dept_col] = fixed_dept
 
                 # Save progress after each batch
                 df.to_csv(temp_output, index=False, encoding="utf-8-sig")
                 print(f"Progress saved to {temp_output}")
+            print(f"LLM cache: {llm_cache.get_cache().summary()}")
+            print(f"LLM calls:\n{llm_telemetry.get_telemetry().summary(contacts=len(df))}")
         else:
             if not use_openai:
                 print("Skipping OpenAI processing (disabled)")
@@ -483,15 +621,38 @@ def clean_csv_data(input_file: str, output_file: str, use_openai: bool = True):
         print(f"Error processing {input_file}: {e}")
         sys.exit(1)
 
+def _option_value(flag: str, default):
+    """Return the value following ``flag`` on the command line, or ``default``."""
+    if flag not in sys.argv:
+        return default
+    position = sys.argv.index(flag) + 1
+    if position >= len(sys.argv) or sys.argv[position].startswith("--"):
+        print(f"Error: {flag} needs a value")
+        sys.exit(1)
+    return sys.argv[position]
+
+
 def main():
     if len(sys.argv) < 3:
-        print("Usage: python extraction.py <input_csv> <output_csv> [--no-openai]")
+        print("Usage: python extraction.py <input_csv> <output_csv> [--no-openai] [--llm-cache-only]"
+              " [--batch-size N] [--max-tokens N] [--llm-telemetry FILE]")
         print("  --no-openai: Skip OpenAI processing for faster basic cleaning")
+        print(f"  --batch-size N: Contacts per OpenAI request (default {OPENAI_BATCH_SIZE}, 1 = one by one)")
+        print(f"  --max-tokens N: Completion token budget per OpenAI request (default {OPENAI_MAX_TOKENS})")
+        print("  --llm-cache-only: Use cached OpenAI answers only, never call the API")
+        print("  --llm-telemetry FILE: Append a JSON line per OpenAI call to FILE")
         sys.exit(1)
 
     input_file = sys.argv[1]
     output_file = sys.argv[2]
     use_openai = "--no-openai" not in sys.argv
+    if "--llm-cache-only" in sys.argv:
+        llm_cache.configure(cache_only=True)
+    batch_size = int(_option_value("--batch-size", OPENAI_BATCH_SIZE))
+    max_tokens = int(_option_value("--max-tokens", OPENAI_MAX_TOKENS))
+    telemetry_file = _option_value("--llm-telemetry", None)
+    if telemetry_file:
+        llm_telemetry.configure(jsonl_path=telemetry_file)
 
     if not os.path.exists(input_file):
         print(f"Error: Input file {input_file} does not exist")
@@ -502,7 +663,7 @@ def main():
     print(f"OpenAI processing: {'Enabled' if use_openai else 'Disabled'}")
     print("-" * 50)
 
-    clean_csv_data(input_file, output_file, use_openai)
+    clean_csv_data(input_file, output_file, use_openai, batch_size, max_tokens)
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,6 @@
 import json
 from pathlib import Path
 
-try:
-    import requests  # type: ignore
-except ImportError:
-    print("The 'requests' module is not installed. Please run 'pip install -r requirements.txt'.")
-    requests = None
-
 # URL of the open dataset of given names from data.gov.il
 DATA_URL = "https://data.gov.il/api/3/action/datastore_search?resource_id=8fbc7cc8-9426-4a39-b996-6b8d75ee4fc3&limit=5000"
 
@@ -17,7 +11,11 @@ _names_cache: dict[str, str] | None = None
 
 def _download_names() -> dict[str, str]:
     """Download the names dataset from data.gov.il if possible."""
-    if requests is None:
+    # Imported here: most runs read NAMES_FILE and never need it
+    try:
+        import requests  # type: ignore
+    except ImportError:
+        print("The 'requests' module is not installed. Please run 'pip install -r requirements.txt'.")
         return {}
 
     try:
@@ -1,38 +1,49 @@
-import json
+import atexit
 import re
-from pathlib import Path
+from typing import NamedTuple
 
 from chatgpt_name import guess_hebrew_name, guess_hebrew_department
+from contact_normalize import EMAIL_RE, PHONE_RE, national_digits, normalize_phone, phone_kind
+import dept_classifier
+from dept_classifier import DepartmentClassifier
+from dept_index import canonical_department
 from gov_names import load_names
+from lexicon import Lexicon
+from name_index import NameIndex
+from parse_cache import ParseCache, block_key
+from translation_cache import CACHE_FILE, TranslationCache
+from transliteration import transliterate_many
 
 
-CACHE_FILE = Path(__file__).resolve().parents[1] / "data" / "translation_cache.json"
-_translation_cache: dict[str, str] | None = None
+_translation_cache: TranslationCache | None = None
 _gov_names: dict[str, str] | None = None
+_name_index: NameIndex | None = None
+# Stand-in for _name_index until a run loads it
+_surname_index: NameIndex | None = None
+_dept_classifier: DepartmentClassifier | None = None
+# Set by the crawler to share parse results of repeated blocks; see parse_cache
+parse_cache: ParseCache | None = None
 
 
-def _load_cache() -> dict[str, str]:
+def _load_cache() -> TranslationCache:
     """Load the transliteration cache from ``CACHE_FILE``."""
     global _translation_cache
     if _translation_cache is None:
-        if CACHE_FILE.exists():
-            try:
-                with open(CACHE_FILE, encoding="utf-8") as f:
-                    _translation_cache = json.load(f)
-            except Exception:
-                _translation_cache = {}
-        else:
-            _translation_cache = {}
+        _translation_cache = TranslationCache(CACHE_FILE)
+        # Entries still buffered when a script ends or is interrupted
+        atexit.register(_translation_cache.flush)
     return _translation_cache
 
 
-def _save_cache(cache: dict[str, str]) -> None:
-    """Persist ``cache`` to ``CACHE_FILE``."""
-    try:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
+def _save_cache(cache: TranslationCache) -> None:
+    """Write the new entries of ``cache`` once a batch is due."""
+    cache.flush(force=False)
+
+
+def flush_translation_cache() -> None:
+    """Write every buffered transliteration; call at the end of a run."""
+    if _translation_cache is not None:
+        _translation_cache.flush()
 
 
 def _load_gov_names() -> dict[str, str]:
@@ -46,14 +57,61 @@ def _load_gov_names() -> dict[str, str]:
     return _gov_names
 
 
+def load_name_index() -> NameIndex:
+    """Return the name gazetteer built from the dataset and translation cache.
+
+    The dataset may be downloaded, so runs call this once at the start; see
+    :func:`name_index` for the lookup used while parsing.
+    """
+    global _name_index
+    if _name_index is None:
+        _name_index = NameIndex.build(_load_gov_names(), _load_cache())
+    return _name_index
+
+
+def name_index() -> NameIndex:
+    """Return the loaded gazetteer, or one of the common surnames only.
+
+    Unlike :func:`load_name_index` this never reaches the network, so
+    ``Contacts.parse`` stays offline when no run has loaded the index.
+    """
+    global _surname_index
+    if _name_index is not None:
+        return _name_index
+    if _surname_index is None:
+        _surname_index = NameIndex.build()
+    return _surname_index
+
+
+def load_dept_classifier() -> DepartmentClassifier:
+    """Return the department classifier trained from the last run's contacts."""
+    global _dept_classifier
+    if _dept_classifier is None:
+        canonical = {*DEPARTMENT_KEYWORDS.values(), *ENGLISH_DEPT_KEYWORDS.values()}
+        _dept_classifier = dept_classifier.load(canonical)
+    return _dept_classifier
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def _clean_text(text: str) -> str:
     """Return ``text`` without tabs, newlines, or duplicate whitespace."""
     # Replace newlines and tabs with spaces, then collapse multiple spaces
-    return re.sub(r"\s+", " ", text.replace("\n", " ").replace("\t", " ")).strip()
+    return _WHITESPACE_RE.sub(" ", text.replace("\n", " ").replace("\t", " ")).strip()
+
 
+def transliterate_to_hebrew(name: str, fallback: bool = False) -> str | None:
+    """Return a Hebrew version of ``name`` using dataset lookup and ChatGPT.
 
-def transliterate_to_hebrew(name: str) -> str | None:
-    """Return a Hebrew version of ``name`` using dataset lookup and ChatGPT."""
+    With ``fallback`` a name ChatGPT gives no answer for (offline, no API
+    key) is spelled word by word with :func:`transliterate_many` instead of
+    returning ``None``. The guess comes after ChatGPT because offline the
+    ChatGPT lookup is answered from the LLM cache without a request, and a
+    cached answer beats a letter-by-letter spelling. Such guesses are not
+    cached; callers that overwrite the English name with the result should
+    leave ``fallback`` off.
+    """
     cache = _load_cache()
     cached = cache.get(name)
     if cached:
@@ -70,9 +128,14 @@ def transliterate_to_hebrew(name: str) -> str | None:
     if result:
         cache[name] = result
         _save_cache(cache)
-    return result
+        return result
+    if not fallback:
+        return None
+    return " ".join(filter(None, transliterate_many(name.split()))) or None
 
 
+_SEPARATORS_RE = re.compile(r"[-_.]+")
+
 ENGLISH_DEPT_KEYWORDS = {
     "youth": "מחלקת נוער",
     "young": "מחלקת צעירים",
@@ -95,25 +158,117 @@ ENGLISH_DEPT_KEYWORDS = {
 }
 
 
+DEPARTMENT_KEYWORDS = {
+    "נוער": "מחלקת נוער",
+    "צעירים": "מחלקת צעירים",
+    "תרבות": "מחלקת תרבות",
+    "אירועים": "מחלקת אירועים",
+    "חינוך": "מחלקת חינוך",
+    "קהילה": "מחלקת קהילה",
+    "רווחה": "מחלקת רווחה",
+    "קליטה": "מחלקת קליטה",
+    "סביבה": "מחלקת איכות סביבה",
+    "וותיקים": "מחלקת אזרחים וותיקים",
+}
+
+POSSIBLE_ROLES = [
+    "רכז", "רכזת", "מנהל", "מנהלת", "יועץ", "יועצת", "מפקח", "מפקחת",
+    "אחראי", "אחראית", 'יו"ר', "עובד", "עובדת", "סגן", "ראש", 'מנכ"ל',
+]
+
+# Patterns used by ``_scan_block``; compiled once instead of on every parse.
+_DIGIT_RE = re.compile(r"\d")
+_HEBREW_RE = re.compile(r"[א-ת]")
+_NAME_LETTERS_RE = re.compile(r"[^A-Za-zא-ת]")
+_EMAIL_LOCAL_SPLIT_RE = re.compile(r"[._-]+")
+_DEPT_PHRASE_RE = re.compile(r"(מחלק(?:ה|ת)|אגף)\s*[\u05d0-\u05ea\s]{2,20}")
+_HEBREW_NAME_RE = re.compile(r"[א-ת]{2,}(?:\s+[א-ת\"׳]{2,})+")
+_HEBREW_WORD_RE = re.compile(r"\b[א-ת]{2,}\b")
+_ENGLISH_NAME_RE = re.compile(r"(?=([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))")
+
+_ENGLISH_DEPT_LEXICON = Lexicon(ENGLISH_DEPT_KEYWORDS, ignore_case=True)
+_DEPARTMENT_LEXICON = Lexicon(DEPARTMENT_KEYWORDS)
+_ROLE_LEXICON = Lexicon(POSSIBLE_ROLES)
+
+# Words that never start or continue a name found through the name index
+_NAME_STOPWORDS = frozenset(
+    word
+    for phrase in (*POSSIBLE_ROLES, *DEPARTMENT_KEYWORDS, "מחלקת", "מחלקה", "אגף", "לשכת",
+                   "טלפון", "נייד", "פקס", "מייל", "שלוחה", "מזכירה", "מזכירות")
+    for word in phrase.split()
+)
+
+
+class BlockScan(NamedTuple):
+    """Everything ``Contacts.parse`` needs from one text block."""
+
+    email: str | None
+    phones: list[str]
+    department: str | None
+    role: str | None
+    hebrew_name: str | None
+    hebrew_word: str | None
+
+
+def _scan_block(text: str) -> BlockScan:
+    """Collect every hit ``Contacts.parse`` needs from ``text`` in one call."""
+    # Cheap membership tests first so the regexes only run where they can match
+    email_match = EMAIL_RE.search(text) if "@" in text else None
+
+    # DEPARTMENT_KEYWORDS order decides between several keywords in the block
+    department = _DEPARTMENT_LEXICON.get(text)
+
+    # The role is the whole whitespace-separated word around the first hit
+    role = None
+    role_match = _ROLE_LEXICON.leftmost(text)
+    if role_match:
+        start, keyword = role_match
+        end = start + len(keyword)
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+        while end < len(text) and not text[end].isspace():
+            end += 1
+        role = text[start:end]
+
+    name_match = _HEBREW_NAME_RE.search(text)
+    word_match = None if name_match else _HEBREW_WORD_RE.search(text)
+
+    return BlockScan(
+        email=email_match.group(0) if email_match else None,
+        phones=PHONE_RE.findall(text),
+        department=department,
+        role=role,
+        hebrew_name=name_match.group(0) if name_match else None,
+        hebrew_word=word_match.group(0) if word_match else None,
+    )
+
+
 def _dept_from_email(email: str) -> str | None:
     """Guess department from email address using ENGLISH_DEPT_KEYWORDS."""
-    lower = re.sub(r"[-_.]+", " ", email.lower())
-    for keyword, dept in ENGLISH_DEPT_KEYWORDS.items():
-        if keyword in lower:
-            return dept
-    return None
+    return _ENGLISH_DEPT_LEXICON.get(_SEPARATORS_RE.sub(" ", email.lower()))
 
 
 def _dept_from_url(url: str) -> str | None:
     """Guess department from a URL using ENGLISH_DEPT_KEYWORDS."""
-    lower = re.sub(r"[-_.]+", " ", url.lower())
-    for keyword, dept in ENGLISH_DEPT_KEYWORDS.items():
-        if keyword in lower:
-            return dept
-    return None
+    return _ENGLISH_DEPT_LEXICON.get(_SEPARATORS_RE.sub(" ", url.lower()))
+
+
+def run_enrichment_request(request: tuple) -> str | None:
+    """Send one ``Contacts`` enrichment request to ChatGPT."""
+    kind = request[0]
+    if kind == "name":
+        return guess_hebrew_name(request[1])
+    if kind == "department":
+        return guess_hebrew_department(request[1], request[2])
+    raise ValueError(f"Unknown enrichment request: {kind}")
 
 
 class Contacts:
+    __slots__ = (
+        "raw_text", "city", "url", "name", "role", "department",
+        "email", "phone_mobile", "phone_office", "pending",
+    )
+
     contacts = 0
     NON_NAME_PHRASES = [
         "לפרטים נוספים",
@@ -158,23 +313,25 @@ class Contacts:
         "נוריפליי",
     }
 
+    NON_NAME_LEXICON = Lexicon(NON_NAME_PHRASES)
+    NON_PERSONAL_LEXICON = Lexicon(NON_PERSONAL_USERNAMES, ignore_case=True)
+
     @staticmethod
     def is_valid_name(name: str) -> bool:
         if not name:
             return False
-        if re.search(r"\d", name):
+        if _DIGIT_RE.search(name):
             return False
-        if any(phrase in name for phrase in Contacts.NON_NAME_PHRASES):
+        if Contacts.NON_NAME_LEXICON.contains_any(name):
             return False
-        lower = name.lower()
-        if any(word in lower for word in Contacts.NON_PERSONAL_USERNAMES):
+        if Contacts.NON_PERSONAL_LEXICON.contains_any(name):
             return False
-        letters = re.sub(r"[^A-Za-zא-ת]", "", name)
+        letters = _NAME_LETTERS_RE.sub("", name)
         if len(letters) < 2:
             return False
         return True
 
-    def __init__(self, raw_text, city, url: str | None = None):
+    def __init__(self, raw_text, city, url: str | None = None, defer_enrichment: bool = False):
         self.raw_text = raw_text
         self.city = city
         self.url = url
@@ -184,52 +341,47 @@ class Contacts:
         self.email = None
         self.phone_mobile = None
         self.phone_office = None
-        self.parse()
+        # LLM lookups still needed, keyed by field ("name" / "department")
+        self.pending: dict[str, tuple] = {}
+        if parse_cache is None:
+            self.parse()
+        else:
+            self._parse_cached(parse_cache)
+        if not defer_enrichment:
+            self.enrich()
         Contacts.contacts += 1
 
     def parse(self):
-        email_match = re.search(r"[\w\.-]+@[\w\.-]+\.\w+", self.raw_text)
-        if email_match:
-            self.email = email_match.group(0)
-
-        phones = re.findall(r"0[2-9][-\s]?\d{7}", self.raw_text)
-        for phone in phones:
-            clean_phone = re.sub(r"[^\d]", "", phone)
-            if clean_phone.startswith("05") or clean_phone.startswith("+972"):
+        """Fill the fields from ``raw_text`` without any network calls.
+
+        Fields that need ChatGPT are recorded in ``pending``; see
+        :meth:`enrichment_requests` and :meth:`apply_enrichment`.
+        """
+        self._parse_block()
+        self._classify_department()
+
+    def _parse_block(self):
+        """Fill the fields that depend only on the block and the URL's department."""
+        scan = _scan_block(self.raw_text)
+        self.email = scan.email
+
+        for phone in scan.phones:
+            clean_phone = normalize_phone(phone)
+            if phone_kind(national_digits(phone)) == "mobile":
                 self.phone_mobile = clean_phone
             else:
                 self.phone_office = clean_phone
 
-        department_keywords = {
-            "נוער": "מחלקת נוער",
-            "צעירים": "מחלקת צעירים",
-            "תרבות": "מחלקת תרבות",
-            "אירועים": "מחלקת אירועים",
-            "חינוך": "מחלקת חינוך",
-            "קהילה": "מחלקת קהילה",
-            "רווחה": "מחלקת רווחה",
-            "קליטה": "מחלקת קליטה",
-            "סביבה": "מחלקת איכות סביבה",
-            "וותיקים": "מחלקת אזרחים וותיקים",
-        }
-
-        for keyword, dept in department_keywords.items():
-            if keyword in self.raw_text:
-                self.department = dept
-                break
+        self.department = scan.department
 
         if not self.department:
-            match = re.search(r"(מחלק(?:ה|ת)|אגף)\s*[\u05d0-\u05ea\s]{2,20}", self.raw_text)
+            match = _DEPT_PHRASE_RE.search(self.raw_text)
             if match:
-                dept = match.group(0).strip().replace("מחלקה", "מחלקת")
-                self.department = dept
+                phrase = match.group(0).strip()
+                self.department = canonical_department(phrase) or phrase.replace("מחלקה", "מחלקת")
 
         if not self.department:
-            lower_text = self.raw_text.lower()
-            for keyword, dept in ENGLISH_DEPT_KEYWORDS.items():
-                if keyword in lower_text:
-                    self.department = dept
-                    break
+            self.department = _ENGLISH_DEPT_LEXICON.get(self.raw_text)
 
         if not self.department and self.email:
             guessed = _dept_from_email(self.email)
@@ -241,36 +393,17 @@ class Contacts:
             if guessed:
                 self.department = guessed
 
-        if not self.department:
-            guessed = guess_hebrew_department(self.raw_text, self.url)
-            if guessed:
-                self.department = guessed
-
-        possible_roles = [
-            "רכז", "רכזת", "מנהל", "מנהלת", "יועץ", "יועצת", "מפקח", "מפקחת",
-            "אחראי", "אחראית", 'יו"ר', "עובד", "עובדת", "סגן", "ראש", 'מנכ"ל',
-        ]
-
-        for word in self.raw_text.split():
-            if any(role in word for role in possible_roles):
-                self.role = word
-                break
+        self.role = scan.role
 
         if self.name is None:
-            candidate = None
-            name_candidates = re.findall(r"[א-ת]{2,}(?:\s+[א-ת\"׳]{2,})+", self.raw_text)
-            if name_candidates:
-                candidate = name_candidates[0].strip()
+            candidate = name_index().find_name(self.raw_text, _NAME_STOPWORDS)
+            if not candidate and scan.hebrew_name:
+                candidate = scan.hebrew_name.strip()
+            if not candidate and scan.hebrew_word:
+                candidate = scan.hebrew_word.strip()
             if not candidate:
-                first_match = re.search(r"\b[א-ת]{2,}\b", self.raw_text)
-                if first_match:
-                    candidate = first_match.group(0).strip()
-            if not candidate:
-                eng_candidates = [
-                    m.group(1)
-                    for m in re.finditer(r"(?=([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))", self.raw_text)
-                ]
-                for cand in eng_candidates:
+                for m in _ENGLISH_NAME_RE.finditer(self.raw_text):
+                    cand = m.group(1)
                     if Contacts.is_valid_name(cand):
                         candidate = cand.strip()
                         break
@@ -278,17 +411,17 @@ class Contacts:
                 self.name = candidate
 
         if not self.name and self.email:
-            if not any(phrase in self.raw_text for phrase in Contacts.NON_NAME_PHRASES):
+            if not Contacts.NON_NAME_LEXICON.contains_any(self.raw_text):
                 local = self.email.split("@")[0]
                 if local.lower() in Contacts.NON_PERSONAL_USERNAMES:
                     self.name = "לא נמצא שם"
-                elif not any(phrase in self.raw_text for phrase in Contacts.NON_NAME_PHRASES): 
+                else:
                     # Split the local part of the email into parts
                     # and try to guess a name from it
                     local = local.replace(".", " ").replace("_", " ").replace("-", " ")
-                    local = re.sub(r"\d", "", local)  # Remove digits
+                    local = _DIGIT_RE.sub("", local)  # Remove digits
                     local = local.strip()
-                parts = re.split(r"[._-]+", local)
+                parts = _EMAIL_LOCAL_SPLIT_RE.split(local)
                 parts = [p for p in parts if p.isalpha()]
                 if parts and all(p.lower() not in Contacts.NON_PERSONAL_USERNAMES for p in parts):
                     name_guess = " ".join(p.capitalize() for p in parts)
@@ -296,16 +429,15 @@ class Contacts:
                         self.name = name_guess
 
         if not self.name:
-            guess = guess_hebrew_name(self.raw_text)
-            if guess and Contacts.is_valid_name(guess):
-                self.name = guess
-            else:
-                self.name = f"לא נמצא שם ({self.role})" if self.role else "לא נמצא שם"
+            self.pending["name"] = ("name", self.raw_text)
+            self.name = f"לא נמצא שם ({self.role})" if self.role else "לא נמצא שם"
         else:
-            if not re.search(r"[א-ת]", self.name):
-                guess = guess_hebrew_name(self.name)
-                if guess and Contacts.is_valid_name(guess):
-                    self.name = guess
+            if not _HEBREW_RE.search(self.name):
+                hebrew = name_index().to_hebrew(self.name)
+                if hebrew:
+                    self.name = hebrew
+                else:
+                    self.pending["name"] = ("name", self.name)
 
         if self.name:
             self.name = _clean_text(self.name)
@@ -314,6 +446,68 @@ class Contacts:
         if self.department:
             self.department = _clean_text(self.department)
 
+    def _classify_department(self) -> None:
+        """Guess a missing department from the block and its full page URL.
+
+        Runs after :meth:`_parse_block` and outside the parse cache, whose key
+        only holds the department named by the URL.
+        """
+        if self.department:
+            return
+        guessed, confidence = load_dept_classifier().classify(self.raw_text, self.url)
+        if guessed and confidence >= dept_classifier.CONFIDENCE_THRESHOLD:
+            self.department = guessed
+        else:
+            self.pending["department"] = ("department", self.raw_text, self.url)
+
+    def _parse_cached(self, cache: ParseCache) -> None:
+        """Reuse the fields of an identical block parsed earlier, else parse."""
+        url_hint = _dept_from_url(self.url) if self.url else None
+        # The raw text is hashed as is: line breaks and runs of spaces decide
+        # whether digits form a phone number
+        key = block_key(self.raw_text, url_hint)
+        cached = cache.get(key)
+        if cached is None:
+            self._parse_block()
+            cache.put(key, (
+                self.name, self.role, self.department, self.email,
+                self.phone_mobile, self.phone_office, dict(self.pending),
+            ))
+        else:
+            (
+                self.name, self.role, self.department, self.email,
+                self.phone_mobile, self.phone_office, pending,
+            ) = cached
+            self.pending = dict(pending)
+        self._classify_department()
+
+    def enrichment_requests(self) -> list[tuple]:
+        """Return the hashable LLM requests this contact is waiting for."""
+        return list(self.pending.values())
+
+    def apply_enrichment(self, results: dict[tuple, str | None]) -> None:
+        """Write resolved LLM answers from ``results`` back into the fields."""
+        dept_request = self.pending.get("department")
+        if dept_request is not None:
+            guessed = results.get(dept_request)
+            if guessed:
+                self.department = _clean_text(guessed)
+
+        name_request = self.pending.get("name")
+        if name_request is not None:
+            guess = results.get(name_request)
+            if guess and Contacts.is_valid_name(guess):
+                self.name = _clean_text(guess)
+
+        self.pending = {}
+
+    def enrich(self) -> None:
+        """Resolve pending LLM lookups synchronously, one request at a time."""
+        if self.pending:
+            self.apply_enrichment(
+                {request: run_enrichment_request(request) for request in self.enrichment_requests()}
+            )
+
     def to_dict(self):
         return {
             "שם": self.name,
@@ -0,0 +1,139 @@
+"""Multi-keyword matching shared by the parser, the crawler and the cleaner.
+
+Each keyword table is compiled once into an Aho-Corasick automaton so a
+single pass over the text reports every keyword it contains. The C
+implementation from ``pyahocorasick`` is used when it is installed; otherwise
+an equivalent pure Python automaton is built.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None
+
+
+class _Automaton:
+    """Pure Python Aho-Corasick automaton used when pyahocorasick is missing.
+
+    Failure links are folded into a full transition table at build time, so
+    scanning costs one dictionary lookup per character.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[str]] = [[]]
+
+        for keyword in keywords:
+            node = 0
+            for ch in keyword:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(keyword)
+
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            # Inherit the transitions of the failure state, then override
+            delta[node] = {**delta[fail[node]], **goto[node]}
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                fail[nxt] = delta[fail[node]].get(ch, 0) if node else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._delta = delta
+        self._out = out
+
+    def iter(self, text: str) -> Iterator[tuple[int, str]]:
+        delta, out = self._delta, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            node = delta[node].get(ch, 0)
+            if out[node]:
+                for keyword in out[node]:
+                    yield i, keyword
+
+
+def _build_automaton(keywords: list[str]):
+    if ahocorasick is None:
+        return _Automaton(keywords)
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+class Lexicon:
+    """A fixed keyword set answering "which of these occur in the text" queries.
+
+    ``keywords`` may be a mapping, in which case :meth:`get` returns the value
+    of the matching keyword. Keyword order is the priority order used by
+    :meth:`first` and :meth:`get`. With ``ignore_case`` the text is lowercased
+    before matching, so keywords should be given in lowercase.
+    """
+
+    def __init__(self, keywords: Iterable[str] | Mapping[str, str], ignore_case: bool = False):
+        if isinstance(keywords, Mapping):
+            self._values = dict(keywords)
+        else:
+            self._values = {k: k for k in keywords}
+        self._priority = {k: i for i, k in enumerate(self._values)}
+        self.ignore_case = ignore_case
+        self._automaton = _build_automaton(list(self._values)) if self._values else None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._values
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, str]]:
+        """Yield ``(start, keyword)`` for every occurrence, in text order."""
+        if self._automaton is None or not text:
+            return
+        if self.ignore_case:
+            text = text.lower()
+        for end, keyword in self._automaton.iter(text):
+            yield end - len(keyword) + 1, keyword
+
+    def contains_any(self, text: str) -> bool:
+        """Return ``True`` if any keyword occurs in ``text``."""
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+    def matches(self, text: str) -> set[str]:
+        """Return the set of keywords occurring in ``text``."""
+        return {keyword for _, keyword in self.iter_matches(text)}
+
+    def first(self, text: str) -> str | None:
+        """Return the highest priority keyword occurring in ``text``."""
+        found = self.matches(text)
+        if not found:
+            return None
+        return min(found, key=self._priority.__getitem__)
+
+    def get(self, text: str, default: str | None = None) -> str | None:
+        """Return the value of :meth:`first`, or ``default`` if nothing matches."""
+        keyword = self.first(text)
+        return self._values[keyword] if keyword is not None else default
+
+    def leftmost(self, text: str) -> tuple[int, str] | None:
+        """Return ``(start, keyword)`` of the occurrence starting earliest."""
+        best = None
+        for start, keyword in self.iter_matches(text):
+            if best is None or start < best[0]:
+                best = (start, keyword)
+        return best
@@ -0,0 +1,169 @@
+"""Persistent cache of OpenAI chat completions shared by every caller.
+
+The same names and departments come up across cities and across runs, and
+each ChatGPT answer costs money and a round trip. :class:`LLMCache` keys
+every request on (model, system prompt, user prompt, temperature) and keeps
+the answers in a SQLite file, so threads and processes of one run, and later
+runs, reuse them; ``llm_client`` consults it before any request. Entries
+expire after ``ttl`` seconds and the least recently used ones are dropped
+once the file holds more than ``max_entries``.
+
+With ``cache_only`` set (``--llm-cache-only`` on the command line) a miss is
+answered with ``None`` instead of a network call, for fast offline re-runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+CACHE_FILE = Path(__file__).resolve().parents[1] / "data" / "llm_cache.sqlite"
+
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 100_000
+# Size eviction runs once every this many writes
+PRUNE_EVERY = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def request_key(model: str, system: str, user: str, temperature: float | None) -> str:
+    """Return the cache key of one chat completion request."""
+    payload = json.dumps([model, system, user, temperature], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _prompts(messages: list[dict]) -> tuple[str, str]:
+    system = "\n".join(m["content"] for m in messages if m.get("role") == "system")
+    user = "\n".join(m["content"] for m in messages if m.get("role") != "system")
+    return system, user
+
+
+class LLMCache:
+    """SQLite-backed response cache, safe to share between threads and processes."""
+
+    def __init__(
+        self,
+        path: str | Path = CACHE_FILE,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_only: bool = False,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_only = cache_only
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self.prune()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection; a forked process opens its own."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, model: str, system: str, user: str, temperature: float | None) -> str | None:
+        key = request_key(model, system, user, temperature)
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None and now - row[1] > self.ttl:
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        with conn:
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, model: str, system: str, user: str, temperature: float | None, response: str) -> None:
+        key = request_key(model, system, user, temperature)
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+        with self._lock:
+            self._writes += 1
+            due = self._writes % PRUNE_EVERY == 0
+        if due:
+            self.prune()
+
+    def lookup(self, model: str, messages: list[dict], temperature: float | None) -> str | None:
+        """:meth:`get` for a request given as chat ``messages``."""
+        return self.get(model, *_prompts(messages), temperature)
+
+    def store(self, model: str, messages: list[dict], temperature: float | None, response: str) -> None:
+        """:meth:`put` for a request given as chat ``messages``."""
+        self.put(model, *_prompts(messages), temperature, response)
+
+    def prune(self) -> None:
+        """Drop expired entries, then the least recently used past ``max_entries``."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        mode = ", cache only" if self.cache_only else ""
+        return f"{self.hits} hits, {self.misses} misses ({rate:.0%} hit rate), {len(self)} entries{mode}"
+
+
+_cache: LLMCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> LLMCache:
+    """Return the process-wide cache, opening ``CACHE_FILE`` on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
+
+
+def configure(**kwargs) -> LLMCache:
+    """Replace the process-wide cache with ``LLMCache(**kwargs)``."""
+    global _cache
+    with _cache_lock:
+        _cache = LLMCache(**kwargs)
+        return _cache
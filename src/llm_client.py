@@ -0,0 +1,298 @@
+"""Concurrent OpenAI chat completions paced by the account's rate limits.
+
+:class:`AsyncLLMClient` runs any number of requests at once on asyncio and
+lets a :class:`RateLimiter` hold each one back until it fits in the
+requests-per-minute and tokens-per-minute quota. Rate limited (429) and
+transient failures are retried with exponential backoff, or after the delay
+the API asks for in ``Retry-After``; such a delay pauses every request, not
+just the one that was refused.
+
+Existing call sites are synchronous, so :class:`LLMClient` runs the async
+client on an event loop in a background thread and blocks for the answer.
+Calls from many threads (the enrichment pool) share that loop and its quota.
+Every answer goes through :mod:`llm_cache` first, and every call is recorded
+in :mod:`llm_telemetry` under the ``stage`` its caller names. The ``openai``
+package takes over a second to import, so it is only loaded by the first
+request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+import llm_cache
+import llm_telemetry
+from llm_telemetry import CallRecord
+
+DEFAULT_RPM = int(os.getenv("OPENAI_RPM", "500"))
+DEFAULT_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MAX_RETRIES = 5
+# A server that cannot be reached at all rarely comes back within seconds
+CONNECTION_RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+_RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+# Longest single sleep of RateLimiter.acquire before it looks at the window again
+_MAX_WAIT_STEP = 0.5
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int | None) -> int:
+    """Upper estimate of the tokens a request counts against the TPM limit.
+
+    Hebrew takes about one token per two characters; the completion is
+    counted at its full ``max_tokens`` the way the API reserves it.
+    """
+    prompt = sum(len(m.get("content") or "") for m in messages)
+    return prompt // 2 + 4 * len(messages) + (max_tokens or 0)
+
+
+class RateLimiter:
+    """Sliding one-minute windows over requests and tokens."""
+
+    def __init__(self, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM, clock: Callable[[], float] = time.monotonic):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        # [start time, tokens] of each request in the last minute
+        self._window: deque[list] = deque()
+        self._tokens = 0
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= 60:
+            self._tokens -= self._window.popleft()[1]
+
+    async def acquire(self, tokens: int) -> list:
+        """Wait until a request of ``tokens`` fits; returns its window entry."""
+        tokens = min(tokens, self.tpm)
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._expire(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif len(self._window) < self.rpm and self._tokens + tokens <= self.tpm:
+                    entry = [now, tokens]
+                    self._window.append(entry)
+                    self._tokens += tokens
+                    return entry
+                else:
+                    delay = self._window[0][0] + 60 - now
+                # Re-check regularly: settle() may have freed tokens meanwhile
+                await asyncio.sleep(min(max(delay, 0.01), _MAX_WAIT_STEP))
+
+    def settle(self, entry: list, tokens: int) -> None:
+        """Replace the estimate held by ``entry`` with the tokens really used."""
+        if entry in self._window:
+            self._tokens += tokens - entry[1]
+            entry[1] = tokens
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for ``seconds`` (a ``Retry-After`` delay)."""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Return the delay in seconds the API asked for, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue
+    return None
+
+
+def _retries_allowed(error: Exception, max_retries: int) -> int:
+    """Return how many retries ``error`` deserves."""
+    import openai
+
+    if isinstance(error, openai.APIConnectionError):
+        return min(max_retries, CONNECTION_RETRIES)
+    if isinstance(error, openai.APIStatusError) and error.status_code in _RETRY_STATUSES:
+        return max_retries
+    return 0
+
+
+def _default_client():
+    """Return the OpenAI client, or ``None`` when no API key is set."""
+    if not os.getenv("OPENAI_API_KEY"):
+        return None
+    import openai
+
+    # The SDK's own retries would bypass the limiter
+    return openai.AsyncOpenAI(max_retries=0)
+
+
+class AsyncLLMClient:
+    """Rate limited, retrying and cached chat completions on asyncio."""
+
+    def __init__(
+        self,
+        rpm: int = DEFAULT_RPM,
+        tpm: int = DEFAULT_TPM,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        client_factory: Callable[[], object] | None = None,
+    ):
+        self.limiter = RateLimiter(rpm, tpm)
+        self.max_retries = max_retries
+        self._client_factory = client_factory or _default_client
+        self._client = None
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.requests = 0
+        self.retries = 0
+
+    def _connect(self) -> bool:
+        """Create the API client on first use; False when there is none."""
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client is not None
+
+    async def _create(self, **request):
+        return await self._client.chat.completions.create(**request)
+
+    async def complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict],
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stage: str = "other",
+        **kwargs,
+    ) -> str | None:
+        """Return the answer content.
+
+        Only the cache is consulted in cache-only mode or without an API key;
+        a miss then returns ``None``.
+
+        ``stage`` names the caller in the telemetry records and is not sent.
+        """
+        start = time.monotonic()
+        telemetry = llm_telemetry.get_telemetry()
+        cache = llm_cache.get_cache()
+        # SQLite reads and writes block, so they run off the event loop
+        cached = await asyncio.to_thread(cache.lookup, model, messages, temperature)
+        if cached is not None:
+            telemetry.record(CallRecord(stage, model, latency=time.monotonic() - start, cache_hit=True))
+            return cached
+        if cache.cache_only or not self._connect():
+            logging.info("LLM cache miss without API access")
+            telemetry.record(CallRecord(stage, model, latency=time.monotonic() - start, skipped=True))
+            return None
+
+        request = dict(model=model, messages=messages, **kwargs)
+        if temperature is not None:
+            request["temperature"] = temperature
+        if max_tokens is not None:
+            request["max_tokens"] = max_tokens
+
+        record = CallRecord(stage, model)
+        async with self._slots:
+            for attempt in range(self.max_retries + 1):
+                entry = await self.limiter.acquire(estimate_tokens(messages, max_tokens))
+                self.requests += 1
+                try:
+                    response = await self._create(**request)
+                except Exception as e:
+                    if attempt >= _retries_allowed(e, self.max_retries):
+                        record.latency = time.monotonic() - start
+                        record.error = type(e).__name__
+                        telemetry.record(record)
+                        raise
+                    self.retries += 1
+                    record.retries += 1
+                    delay = _retry_after(e)
+                    if delay is not None:
+                        self.limiter.pause(delay)
+                    else:
+                        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+                    logging.warning(f"OpenAI request failed ({e}), retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                break
+
+        usage = getattr(response, "usage", None)
+        if getattr(usage, "total_tokens", None):
+            self.limiter.settle(entry, usage.total_tokens)
+        content = response.choices[0].message.content
+        record.latency = time.monotonic() - start
+        record.prompt_tokens = getattr(usage, "prompt_tokens", None) or estimate_tokens(messages, 0)
+        record.completion_tokens = getattr(usage, "completion_tokens", None) or len(content or "") // 2
+        telemetry.record(record)
+        if content is not None:
+            await asyncio.to_thread(cache.store, model, messages, temperature, content)
+        return content
+
+    async def complete_many(self, requests: list[dict]) -> list:
+        """Run ``requests`` concurrently; failures are returned as exceptions."""
+        return await asyncio.gather(*(self.complete(**r) for r in requests), return_exceptions=True)
+
+
+class LLMClient:
+    """Blocking facade over an :class:`AsyncLLMClient` on a background loop."""
+
+    def __init__(self, **kwargs):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client", daemon=True)
+        self._thread.start()
+        self.async_client = self._run(self._make_client(kwargs))
+
+    @staticmethod
+    async def _make_client(kwargs) -> AsyncLLMClient:
+        # Built on the loop so its locks and semaphore belong to it
+        return AsyncLLMClient(**kwargs)
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def complete(self, **request) -> str | None:
+        """Blocking :meth:`AsyncLLMClient.complete`; safe to call from any thread."""
+        return self._run(self.async_client.complete(**request))
+
+    def complete_many(self, requests: list[dict]) -> list:
+        """Blocking :meth:`AsyncLLMClient.complete_many`."""
+        return self._run(self.async_client.complete_many(requests))
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_client: LLMClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    """Return the process-wide client, started on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient()
+        return _client
+
+
+def complete(**request) -> str | None:
+    """Send one chat completion through the shared client."""
+    return get_client().complete(**request)
+
+
+def complete_many(requests: list[dict]) -> list:
+    """Send chat completions concurrently through the shared client."""
+    return get_client().complete_many(requests)
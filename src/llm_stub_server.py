@@ -0,0 +1,261 @@
+"""Local stand-in for the OpenAI chat completions API.
+
+Tests usually replace ``gpt_fix_names_and_department`` or
+``guess_hebrew_name`` outright, which leaves the client, retry, timeout and
+answer parsing code unexercised. This server speaks enough of
+``POST /v1/chat/completions`` for the real code path to run offline against
+it, answering each prompt with deterministic rule-based output. Latency,
+jitter, server errors and 429 rate limiting can be injected to load-test the
+pipeline::
+
+    python src/llm_stub_server.py --port 8089 --latency 0.3 --jitter 0.1 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=stub python src/extraction.py in.csv out.csv
+
+``GET /stats`` returns the request counts of the running server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jobs import DEPARTMENT_KEYWORDS, ENGLISH_DEPT_KEYWORDS
+from transliteration import transliterate_many
+
+_NOT_NAMES = {"דרישה", "מס", "טלפון", "פקס", "מייל", "פנייה", "לפרטים"}
+_LATIN_RE = re.compile(r"[A-Za-z]")
+_SINGLE_FIELD_RE = {
+    "name": re.compile(r'שם:\s*"(.*)"'),
+    "department": re.compile(r'מחלקה:\s*"(.*)"'),
+}
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub; rates are probabilities per request."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    seed: int = 0
+
+
+def fix_name(name: str | None) -> str | None:
+    """Rule-based answer for a name: Hebrew as is, English transliterated."""
+    name = " ".join((name or "").split())
+    if len(name) < 2 or any(c.isdigit() for c in name) or any(w in _NOT_NAMES for w in name.split()):
+        return None
+    if _LATIN_RE.search(name):
+        name = " ".join(transliterate_many(name.split()))
+    return name or None
+
+
+def _department_keyword(text: str) -> str | None:
+    for keyword, canonical in ENGLISH_DEPT_KEYWORDS.items():
+        if keyword in text.lower():
+            return canonical
+    for keyword, canonical in DEPARTMENT_KEYWORDS.items():
+        if keyword in text:
+            return canonical
+    return None
+
+
+def fix_department(department: str | None) -> str | None:
+    """Rule-based answer for a department: the ``jobs`` keyword tables."""
+    text = (department or "").strip()
+    return _department_keyword(text) or text or None
+
+
+def answer(messages: list[dict]) -> str:
+    """Return the stub's reply to a chat completion request."""
+    system = "\n".join(m.get("content") or "" for m in messages if m.get("role") == "system")
+    user = "\n".join(m.get("content") or "" for m in messages if m.get("role") != "system")
+
+    try:
+        batch = json.loads(user)
+    except ValueError:
+        batch = None
+    if isinstance(batch, list):
+        return json.dumps(
+            [
+                {"id": item.get("id"), "name": fix_name(item.get("name")), "department": fix_department(item.get("department"))}
+                for item in batch
+                if isinstance(item, dict)
+            ],
+            ensure_ascii=False,
+        )
+
+    if "department" in system:
+        return _department_keyword(user) or "מחלקה כללית"
+    if "personal name" in system:
+        return fix_name(user) or ""
+
+    fields = {key: regex.search(user) for key, regex in _SINGLE_FIELD_RE.items()}
+    values = {key: match.group(1) if match else None for key, match in fields.items()}
+    return json.dumps(
+        {"name": fix_name(values["name"]), "department": fix_department(values["department"])},
+        ensure_ascii=False,
+    )
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StubServer"
+
+    def log_message(self, format, *args):
+        logging.debug("llm stub: " + format, *args)
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.server.snapshot())
+        else:
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON body", "type": "invalid_request_error"}})
+            return
+
+        outcome, delay = self.server.draw()
+        time.sleep(delay)
+        if outcome == "rate_limited":
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (stub)", "type": "requests", "code": "rate_limit_exceeded"}},
+                {"Retry-After": f"{self.server.config.retry_after:g}"},
+            )
+            return
+        if outcome == "error":
+            self._send_json(500, {"error": {"message": "Injected server error (stub)", "type": "server_error"}})
+            return
+
+        messages = request.get("messages") or []
+        content = answer(messages)
+        prompt_tokens = sum(_tokens(m.get("content") or "") for m in messages)
+        completion_tokens = _tokens(content)
+        self._send_json(200, {
+            "id": f"chatcmpl-stub-{self.server.count('completions')}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server; use as a context manager to run it in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.config = config or StubConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "completions": 0, "errors": 0, "rate_limited": 0}
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            self._counts[key] += 1
+            return self._counts[key]
+
+    def draw(self) -> tuple[str, float]:
+        """Pick the outcome and delay of one request."""
+        config = self.config
+        with self._lock:
+            self._counts["requests"] += 1
+            roll = self._random.random()
+            delay = max(0.0, config.latency + self._random.uniform(-config.jitter, config.jitter))
+            if roll < config.rate_limit_rate:
+                outcome = "rate_limited"
+            elif roll < config.rate_limit_rate + config.error_rate:
+                outcome = "error"
+            else:
+                return "ok", delay
+            self._counts["errors" if outcome == "error" else outcome] += 1
+        return outcome, delay
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts, config=asdict(self.config))
+
+    def __enter__(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="llm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- seconds around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency, args.jitter, args.error_rate, args.rate_limit_rate, args.retry_after, args.seed)
+    server = StubServer(config, args.host, args.port)
+    print(f"LLM stub listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
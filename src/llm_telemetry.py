@@ -0,0 +1,154 @@
+"""Token, latency and cost accounting of LLM calls per pipeline stage.
+
+Every call through :mod:`llm_client` is recorded with the stage that made it
+(``guess_hebrew_name``, ``guess_hebrew_department``,
+``gpt_fix_names_and_department``...), its prompt and completion tokens,
+latency, retries and whether the cache answered it. :meth:`Telemetry.report`
+aggregates the records of a run per stage (p50/p95 latency, tokens, estimated
+cost, calls per contact) for the run summary. With ``jsonl_path`` set
+(``--llm-telemetry FILE`` on the command line) each record is also appended to
+that file as one JSON line.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+# Estimated USD price per 1K (prompt, completion) tokens
+PRICES = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+}
+
+
+@dataclass
+class CallRecord:
+    """One LLM call as seen by the caller."""
+
+    stage: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    retries: int = 0
+    cache_hit: bool = False
+    # Not sent: a cache miss in cache-only mode or without an API key
+    skipped: bool = False
+    error: str | None = None
+    time: float = field(default_factory=time.time)
+
+    @property
+    def cost(self) -> float:
+        prompt_price, completion_price = PRICES.get(self.model, (0.0, 0.0))
+        return (self.prompt_tokens * prompt_price + self.completion_tokens * completion_price) / 1000
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``; 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _aggregate(records: list[CallRecord]) -> dict:
+    # Cache hits and skipped calls return at once and would hide the API latency
+    latencies = [r.latency for r in records if not (r.cache_hit or r.skipped)]
+    return {
+        "calls": len(records),
+        "cache_hits": sum(r.cache_hit for r in records),
+        "skipped": sum(r.skipped for r in records),
+        "errors": sum(r.error is not None for r in records),
+        "retries": sum(r.retries for r in records),
+        "prompt_tokens": sum(r.prompt_tokens for r in records),
+        "completion_tokens": sum(r.completion_tokens for r in records),
+        "latency_p50": round(_percentile(latencies, 50), 3),
+        "latency_p95": round(_percentile(latencies, 95), 3),
+        "latency_total": round(sum(latencies), 3),
+        "cost": round(sum(r.cost for r in records), 6),
+    }
+
+
+class Telemetry:
+    """Thread-safe collector of :class:`CallRecord` objects."""
+
+    def __init__(self, jsonl_path: str | Path | None = None):
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.records: list[CallRecord] = []
+        self._lock = threading.Lock()
+        self._file = None
+        if self.jsonl_path is not None:
+            self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            # Line buffered: each record reaches the file as it is written
+            self._file = open(self.jsonl_path, "a", encoding="utf-8", buffering=1)
+
+    def record(self, record: CallRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+            if self._file is not None:
+                self._file.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def report(self, contacts: int | None = None) -> dict:
+        """Return the run aggregates, in total and per stage."""
+        with self._lock:
+            records = list(self.records)
+        stages: dict[str, list[CallRecord]] = {}
+        for record in records:
+            stages.setdefault(record.stage, []).append(record)
+        report = {"total": _aggregate(records), "stages": {s: _aggregate(r) for s, r in sorted(stages.items())}}
+        if contacts:
+            report["total"]["calls_per_contact"] = round(len(records) / contacts, 3)
+        return report
+
+    def summary(self, contacts: int | None = None) -> str:
+        report = self.report(contacts)
+        lines = [_format("total", report["total"])]
+        lines += [_format(stage, stats) for stage, stats in report["stages"].items()]
+        return "\n".join(lines)
+
+
+def _format(label: str, stats: dict) -> str:
+    line = (
+        f"{label}: {stats['calls']} calls ({stats['cache_hits']} cached, {stats['skipped']} skipped, "
+        f"{stats['errors']} failed, "
+        f"{stats['retries']} retries), {stats['prompt_tokens']}+{stats['completion_tokens']} tokens, "
+        f"p50 {stats['latency_p50']:.2f}s, p95 {stats['latency_p95']:.2f}s, ~${stats['cost']:.4f}"
+    )
+    if "calls_per_contact" in stats:
+        line += f", {stats['calls_per_contact']} calls per contact"
+    return line
+
+
+_telemetry: Telemetry | None = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """Return the process-wide collector, created on first use."""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            _telemetry = Telemetry()
+        return _telemetry
+
+
+def configure(**kwargs) -> Telemetry:
+    """Replace the process-wide collector with ``Telemetry(**kwargs)``."""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is not None:
+            _telemetry.close()
+        _telemetry = Telemetry(**kwargs)
+        return _telemetry
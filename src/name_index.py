@@ -0,0 +1,158 @@
+"""Gazetteer of given names and surnames for finding names without ChatGPT.
+
+A :class:`NameIndex` keeps Hebrew given names and surnames in sets and the
+English spellings in dictionaries pointing at the Hebrew form, so every
+lookup is a single hash probe. ``jobs`` builds one from the data.gov.il
+given-name dataset (:func:`gov_names.load_names`) and the accumulated
+``translation_cache.json``, on top of the common surnames below.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+
+# Frequent Israeli surnames with a common English spelling
+COMMON_SURNAMES = {
+    "cohen": "כהן", "levi": "לוי", "levy": "לוי", "mizrahi": "מזרחי",
+    "peretz": "פרץ", "biton": "ביטון", "dahan": "דהן", "avraham": "אברהם",
+    "friedman": "פרידמן", "azulay": "אזולאי", "azoulay": "אזולאי", "katz": "כץ",
+    "yosef": "יוסף", "amar": "עמר", "ohayon": "אוחיון", "hadad": "חדד",
+    "haddad": "חדד", "gabay": "גבאי", "shapira": "שפירא", "klein": "קליין",
+    "vaknin": "וקנין", "elbaz": "אלבז", "edri": "אדרי", "ashkenazi": "אשכנזי",
+    "golan": "גולן", "segal": "סגל", "rosenberg": "רוזנברג", "weiss": "וייס",
+    "sasson": "ששון", "goldberg": "גולדברג", "ben david": "בן דוד", "ben haim": "בן חיים",
+}
+
+_HEBREW_TOKEN_RE = re.compile(r"[א-ת][א-ת'\"׳]+")
+
+
+class NameIndex:
+    """Hash-based lookups of given names and surnames in Hebrew and English."""
+
+    def __init__(self):
+        self._given_he: set[str] = set()
+        self._surname_he: set[str] = set()
+        self._given_en: dict[str, str] = {}
+        self._surname_en: dict[str, str] = {}
+
+    @classmethod
+    def build(
+        cls,
+        given_names: Mapping[str, str] | None = None,
+        translations: Mapping[str, str] | None = None,
+        surnames: Mapping[str, str] = COMMON_SURNAMES,
+    ) -> "NameIndex":
+        """Build an index from English -> Hebrew mappings.
+
+        ``given_names`` maps single given names (the government dataset);
+        ``translations`` maps full names, whose first word is taken as the
+        given name and the rest as surnames when both sides have the same
+        number of words.
+        """
+        index = cls()
+        for english, hebrew in surnames.items():
+            index.add_surname(english, hebrew)
+        for english, hebrew in (given_names or {}).items():
+            index.add_given(english, hebrew)
+        for english, hebrew in (translations or {}).items():
+            if not isinstance(hebrew, str):
+                continue
+            en_parts, he_parts = english.split(), hebrew.split()
+            if not en_parts or len(en_parts) != len(he_parts):
+                continue
+            index.add_given(en_parts[0], he_parts[0])
+            for en, he in zip(en_parts[1:], he_parts[1:]):
+                index.add_surname(en, he)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._given_he) + len(self._surname_he)
+
+    def add_given(self, english: str | None, hebrew: str) -> None:
+        hebrew = hebrew.strip()
+        if not hebrew:
+            return
+        self._given_he.add(hebrew)
+        if english and english.strip():
+            self._given_en.setdefault(english.strip().lower(), hebrew)
+
+    def add_surname(self, english: str | None, hebrew: str) -> None:
+        hebrew = hebrew.strip()
+        if not hebrew:
+            return
+        self._surname_he.add(hebrew)
+        if english and english.strip():
+            self._surname_en.setdefault(english.strip().lower(), hebrew)
+
+    def is_given(self, word: str) -> bool:
+        return word in self._given_he or word.lower() in self._given_en
+
+    def is_surname(self, word: str) -> bool:
+        return word in self._surname_he or word.lower() in self._surname_en
+
+    def find_name(self, text: str, stopwords: Iterable[str] = (), max_words: int = 3) -> str | None:
+        """Return the best supported run of Hebrew words in ``text``, if any.
+
+        A run is a known given name followed by one or two more Hebrew words,
+        or any word followed by a known surname. Runs where both the given
+        name and a surname are known win; among equals the earliest wins. Words in ``stopwords``
+        (roles, department words...) never take part in a name.
+        """
+        stop = stopwords if isinstance(stopwords, (set, frozenset)) else set(stopwords)
+        tokens = list(_HEBREW_TOKEN_RE.finditer(text))
+        best = None
+        best_score = 0
+        for i, first in enumerate(tokens[:-1]):
+            words = [first.group(0)]
+            if words[0] in stop:
+                continue
+            given = self.is_given(words[0])
+            end = first.end()
+            for token in tokens[i + 1:i + max_words]:
+                word = token.group(0)
+                if not text[end:token.start()].isspace() or word in stop:
+                    break
+                # After an unknown first word only a surname may follow
+                if given:
+                    known = self.is_surname(word) or self.is_given(word)
+                else:
+                    known = self.is_surname(word)
+                if not known and (len(words) >= 2 or not given):
+                    break
+                words.append(word)
+                end = token.end()
+                if not given:
+                    break
+            if len(words) < 2:
+                continue
+
+            score = 2 * self.is_given(words[0]) + sum(self.is_surname(w) for w in words[1:])
+            if score > best_score:
+                best, best_score = " ".join(words), score
+        return best
+
+    def to_hebrew(self, name: str) -> str | None:
+        """Return the Hebrew spelling of an English ``name`` if every word is known."""
+        words = name.split()
+        if not words:
+            return None
+        given = self._given_en.get(words[0].lower())
+        if given is None:
+            return None
+        hebrew = [given]
+        rest = words[1:]
+        while rest:
+            # Two-word surnames such as "Ben David" first
+            pair = " ".join(rest[:2]).lower()
+            if len(rest) > 1 and pair in self._surname_en:
+                hebrew.append(self._surname_en[pair])
+                rest = rest[2:]
+                continue
+            word = rest[0].lower()
+            translated = self._surname_en.get(word) or self._given_en.get(word)
+            if translated is None:
+                return None
+            hebrew.append(translated)
+            rest = rest[1:]
+        return " ".join(hebrew)
@@ -11,30 +11,8 @@ from jobs import Contacts
 from gov_names import load_names
 from chatgpt_name import guess_hebrew_name
 
-CACHE_FILE = Path(__file__).resolve().parents[1] / "data" / "translation_cache.json"
-_translation_cache: dict[str, str] | None = None
 _gov_names: dict[str, str] | None = None
 
-def _load_cache() -> dict[str, str]:
-    global _translation_cache
-    if _translation_cache is None:
-        if CACHE_FILE.exists():
-            try:
-                with open(CACHE_FILE, encoding="utf-8") as f:
-                    _translation_cache = json.load(f)
-            except Exception:
-                _translation_cache = {}
-        else:
-            _translation_cache = {}
-    return _translation_cache
-
-def _save_cache(cache: dict[str, str]) -> None:
-    try:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
-
 def _load_gov_names() -> dict[str, str]:
     global _gov_names
     if _gov_names is None:
@@ -44,13 +22,13 @@ def _load_gov_names() -> dict[str, str]:
             _gov_names = {}
     return _gov_names
 
-def transliterate_to_hebrew(name: str) -> str | None:
+def transliterate_to_hebrew(name: str, fallback: bool = False) -> str | None:
     """Return a Hebrew version of ``name`` using the shared ``jobs`` helper."""
 
     original = jobs.guess_hebrew_name
     jobs.guess_hebrew_name = guess_hebrew_name
     try:
-        return jobs.transliterate_to_hebrew(name)
+        return jobs.transliterate_to_hebrew(name, fallback=fallback)
     finally:
         jobs.guess_hebrew_name = original
 
@@ -103,7 +81,9 @@ def collect_names(
                 if not name:
                     continue
             if not re.search(r"[א-ת]", name):
-                heb = transliterate_to_hebrew(name)
+                # Only the name list is written, so a spelled-out guess is
+                # better than leaving the English name in it
+                heb = transliterate_to_hebrew(name, fallback=True)
                 if heb:
                     name = heb
             names.add(name)
@@ -112,6 +92,7 @@ def collect_names(
         for nm in sorted(names):
             f.write(nm + "\n")
 
+    jobs.flush_translation_cache()
     return names
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+"""Bounded LRU cache of ``Contacts`` parse results keyed by block hash.
+
+Headers, footers and "contact the municipality" boxes repeat on every page
+of a site, and often across sites built on the same CMS. The crawler installs
+a :class:`ParseCache` as ``jobs.parse_cache`` so each distinct block is parsed
+once per run; the cache can also be saved to disk and reused by the next run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Bump when Contacts.parse changes so persisted entries are not reused
+PARSE_CACHE_VERSION = 3
+
+CACHE_FILE = Path(__file__).resolve().parents[1] / "data" / "parse_cache.json"
+
+
+def block_key(text: str, url_hint: str | None = None) -> str:
+    """Return the cache key for a block and its URL-derived department hint."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{PARSE_CACHE_VERSION}\0{url_hint or ''}\0{text}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Thread-safe LRU mapping block keys to parsed field tuples."""
+
+    def __init__(self, maxsize: int = 50_000, path: str | Path | None = None):
+        self.maxsize = maxsize
+        self.path = Path(path) if path else None
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Keys put since the last take_updates(), oldest first
+        self._added: dict[str, None] = {}
+        if self.path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: tuple) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._added[key] = None
+            while len(self._entries) > self.maxsize:
+                evicted, _ = self._entries.popitem(last=False)
+                self._added.pop(evicted, None)
+
+    def __getstate__(self) -> dict:
+        # A copy for a parse pool worker: the entries, without the lock and
+        # counters, and never saved by the worker
+        with self._lock:
+            state = dict(self.__dict__, _entries=OrderedDict(self._entries))
+        del state["_lock"]
+        return state | {"path": None, "hits": 0, "misses": 0, "_added": {}}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def take_updates(self) -> tuple[int, int, list]:
+        """Return and reset the counts and entries added since the last call.
+
+        Parse pool workers each hold a copy of the cache; they send these
+        updates back so the crawler's cache sees every parse.
+        """
+        with self._lock:
+            updates = (self.hits, self.misses, [(k, self._entries[k]) for k in self._added])
+            self.hits = self.misses = 0
+            self._added = {}
+        return updates
+
+    def merge(self, updates: tuple[int, int, list]) -> None:
+        """Fold updates from :meth:`take_updates` of another copy into this one."""
+        hits, misses, entries = updates
+        for key, value in entries:
+            self.put(key, value)
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def load(self) -> None:
+        """Read entries saved by :meth:`save`; a bad or stale file is ignored."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            logging.warning(f"Ignoring unreadable parse cache {self.path}")
+            return
+        if data.get("version") != PARSE_CACHE_VERSION:
+            return
+        with self._lock:
+            for key, value in data.get("entries", [])[-self.maxsize:]:
+                # JSON turns the tuples inside ``pending`` into lists
+                *fields, pending = value
+                self._entries[key] = (*fields, {k: tuple(v) for k, v in pending.items()})
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            entries = list(self._entries.items())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": PARSE_CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.0%} hit rate), {len(self)} entries"
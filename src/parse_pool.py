@@ -0,0 +1,115 @@
+"""Process pool that parses crawled pages away from the crawl threads.
+
+``Contacts.parse`` is pure Python regex work, so parsing inside the threads
+that drive Playwright serialises it on the GIL. A :class:`ParsePool` runs the
+parse step in worker processes instead. At most ``max_pending`` pages wait in
+the pool at once; past that, :meth:`ParsePool.submit` blocks the calling crawl
+thread until a worker catches up, so memory stays bounded on large runs.
+
+Workers are started with the ``spawn`` method by default: the crawler already
+runs Playwright and logging threads, which a forked child would inherit in an
+unknown state, and spawn is the only method on Windows (and the default on
+macOS). A spawned worker starts from fresh modules, so :func:`_init_worker`
+hands it the parse cache, name index and department classifier that ``jobs``
+holds when the pool is created.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import jobs
+
+
+def _init_worker(parse_cache, name_index, dept_classifier) -> None:
+    """Install the crawler's ``jobs`` state in a new worker process."""
+    jobs.parse_cache = parse_cache
+    jobs._name_index = name_index
+    jobs._dept_classifier = dept_classifier
+
+
+def _run_in_worker(fn, args):
+    """Run ``fn`` in a worker and collect the state it changed in ``jobs``."""
+    before = jobs.Contacts.contacts
+    result = fn(*args)
+    cache = jobs.parse_cache
+    updates = cache.take_updates() if cache is not None else None
+    return result, jobs.Contacts.contacts - before, updates
+
+
+class ParsePool:
+    """Bounded queue of parse jobs executed on a process pool.
+
+    With ``max_workers=0`` jobs run inline in the submitting thread, which is
+    what callers without a pool (and the tests) get. The ``jobs`` state is
+    copied into the workers when the pool is created, so set up
+    ``jobs.parse_cache`` and load the name index and classifier first.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+    ):
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        self._executor = None
+        if max_workers:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=mp_context or multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(jobs.parse_cache, jobs._name_index, jobs._dept_classifier),
+            )
+        self._slots = threading.BoundedSemaphore(max_pending or 4 * max(max_workers, 1))
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def submit(self, fn, *args) -> Future:
+        """Schedule ``fn(*args)``; blocks while ``max_pending`` jobs are queued.
+
+        ``fn`` and its arguments must be picklable. The ``Contacts.contacts``
+        count and the parse cache entries of the worker are carried over to
+        ``jobs`` in this process.
+        """
+        result = Future()
+        if self._executor is None:
+            try:
+                result.set_result(fn(*args))
+            except Exception as e:
+                result.set_exception(e)
+            return result
+
+        self._slots.acquire()
+        try:
+            inner = self._executor.submit(_run_in_worker, fn, args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        def _done(inner: Future) -> None:
+            self._slots.release()
+            try:
+                value, parsed, updates = inner.result()
+            except BaseException as e:
+                result.set_exception(e)
+                return
+            jobs.Contacts.contacts += parsed
+            if updates is not None and jobs.parse_cache is not None:
+                jobs.parse_cache.merge(updates)
+            result.set_result(value)
+
+        inner.add_done_callback(_done)
+        return result
@@ -0,0 +1,153 @@
+"""Append-only store of English -> Hebrew name transliterations.
+
+``jobs`` used to rewrite the whole of ``translation_cache.json`` after every
+new name, which grows quadratically over a run and loses entries when two
+processes (the scraper and ``name_pull.py``) write at once.
+:class:`TranslationCache` keeps the JSON file as a compacted snapshot and
+appends new entries to a ``.log`` file beside it, one JSON line each. New
+entries are buffered and appended in batches of ``FLUSH_EVERY`` or after
+``FLUSH_INTERVAL`` seconds; once the log grows past ``COMPACT_BYTES`` it is
+folded back into the snapshot. Writers take an exclusive ``fcntl`` lock on a
+``.lock`` file, so entries appended by other processes are merged rather than
+overwritten. Lookups are plain dictionary reads.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+
+try:  # pragma: no cover - fcntl is missing on Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+CACHE_FILE = Path(__file__).resolve().parents[1] / "data" / "translation_cache.json"
+
+# Buffered entries appended to the log at once
+FLUSH_EVERY = 32
+# Seconds an entry may wait in the buffer
+FLUSH_INTERVAL = 5.0
+# Log size that triggers folding it into the snapshot
+COMPACT_BYTES = 256 * 1024
+
+
+class TranslationCache(Mapping):
+    """Thread- and process-safe mapping of names to their Hebrew spelling."""
+
+    def __init__(self, path: str | Path = CACHE_FILE):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._entries: dict[str, str] = {}
+        # Entries not yet appended to the log, oldest first
+        self._pending: list[tuple[str, str]] = []
+        self._pending_since = 0.0
+        self._lock = threading.Lock()
+        try:
+            self._entries = self._read()
+        except OSError as e:
+            logging.warning(f"Translation cache not loaded ({e})")
+
+    def __getitem__(self, name: str) -> str:
+        return self._entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __setitem__(self, name: str, hebrew: str) -> None:
+        """Record ``name``; it reaches the disk with the next due :meth:`flush`."""
+        with self._lock:
+            if self._entries.get(name) == hebrew:
+                return
+            self._entries[name] = hebrew
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append((name, hebrew))
+
+    @contextmanager
+    def _file_lock(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read(self) -> dict[str, str]:
+        """Return the snapshot with the log replayed over it."""
+        entries: dict[str, str] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                if isinstance(snapshot, dict):
+                    entries.update(snapshot)
+            except ValueError:
+                logging.warning(f"Ignoring unreadable translation cache {self.path}")
+        if self.log_path.exists():
+            with open(self.log_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        name, hebrew = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+                    entries[name] = hebrew
+        return entries
+
+    def flush(self, force: bool = True) -> None:
+        """Append the buffered entries to the log.
+
+        Without ``force`` nothing is written until ``FLUSH_EVERY`` entries are
+        buffered or the oldest is ``FLUSH_INTERVAL`` seconds old. The log is
+        compacted when it has grown past ``COMPACT_BYTES`` or there is no
+        snapshot yet.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            due = (
+                len(self._pending) >= FLUSH_EVERY
+                or time.monotonic() - self._pending_since >= FLUSH_INTERVAL
+            )
+            if not (force or due or not self.path.exists()):
+                return
+            pending, self._pending = self._pending, []
+            try:
+                with self._file_lock():
+                    with open(self.log_path, "a", encoding="utf-8") as f:
+                        f.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in pending)
+                    if not self.path.exists() or self.log_path.stat().st_size > COMPACT_BYTES:
+                        self._compact()
+            except OSError as e:
+                logging.warning(f"Translation cache not saved ({e})")
+
+    def compact(self) -> None:
+        """Fold the log into the snapshot and start an empty log."""
+        with self._lock, self._file_lock():
+            self._compact()
+
+    def _compact(self) -> None:
+        # Called with both locks held
+        entries = self._read()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        open(self.log_path, "w").close()
+        # Pick up the entries other processes appended meanwhile
+        for name, hebrew in entries.items():
+            self._entries.setdefault(name, hebrew)
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
 
 # Map of common digraphs and vowel patterns to their Hebrew equivalents
 _DIGRAPH_MAP: dict[str, str] = {
@@ -58,27 +62,26 @@ _FINAL_MAP = {
 }
 
 
+# Digraphs first, longest first, so the regex takes the longest match at each
+# position; any other character is one token
+_TOKEN_RE = re.compile(
+    "|".join(re.escape(dg) for dg in sorted(_DIGRAPH_MAP, key=len, reverse=True)) + "|.",
+    re.DOTALL,
+)
+_TOKEN_MAP: dict[str, str] = {**_LETTER_MAP, **_DIGRAPH_MAP}
+
+
+@lru_cache(maxsize=16_384)
 def basic_transliterate(text: str) -> str:
     """Very small heuristic transliteration from English to Hebrew."""
-    lower = text.lower()
-    result: list[str] = []
-    i = 0
-    while i < len(lower):
-        matched = False
-        for dg, heb in sorted(_DIGRAPH_MAP.items(), key=lambda item: -len(item[0])):
-            if lower.startswith(dg, i):
-                result.append(heb)
-                i += len(dg)
-                matched = True
-                break
-        if matched:
-            continue
-        ch = lower[i]
-        result.append(_LETTER_MAP.get(ch, ""))
-        i += 1
-
+    result = [_TOKEN_MAP.get(token, "") for token in _TOKEN_RE.findall(text.lower())]
     if result:
         last = result[-1]
         if last in _FINAL_MAP:
             result[-1] = _FINAL_MAP[last]
     return "".join(result)
+
+
+def transliterate_many(names: Iterable[str]) -> list[str]:
+    """Return :func:`basic_transliterate` of each of ``names``, in order."""
+    return [basic_transliterate(name) for name in names]
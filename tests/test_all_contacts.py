@@ -0,0 +1,29 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import all_contacts
+
+
+def test_export_columns_are_plain_strings(tmp_path, monkeypatch):
+    path = tmp_path / "contacts.json"
+    path.write_text(json.dumps({
+        "חיפה": {"דוד כהן": {"מייל": "david@city.gov.il", "מחלקה": "מחלקת חינוך"}},
+    }, ensure_ascii=False), encoding="utf-8")
+    saved = []
+    monkeypatch.setattr(all_contacts, "save_outputs", lambda df, base: saved.append(df))
+
+    all_contacts.main(str(path))
+
+    df = saved[0]
+    assert list(df.columns) == ["עיר", "שם", "טלפון", "אימייל", "תפקיד", "מחלקה"]
+    # Same dtypes as a frame built from plain row dicts
+    plain = pd.DataFrame([dict(df.iloc[0])])
+    assert df.dtypes.tolist() == plain.dtypes.tolist()
+    assert df.iloc[0]["מחלקה"] == "מחלקת חינוך"
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import benchmark
+
+
+def test_html_to_text_keeps_block_lines_and_drops_scripts():
+    html = "<div>מוקד<br>03-1234567</div><script>var x = '050-0000000';</script><p>info@example.com</p>"
+    assert benchmark.html_to_text(html) == "מוקד\n03-1234567\ninfo@example.com"
+
+
+def test_score_page_matches_on_email_then_phone():
+    labels = [
+        {"name": "דוד כהן", "emails": ["David@Example.com"], "phones": ["03-1234567"]},
+        {"name": None, "emails": [], "phones": ["08-7654321"]},
+        {"name": "רות לוי", "emails": ["ruth@example.com"], "phones": []},
+    ]
+    predicted = [
+        {"שם": 'ד"ר דוד כהן', "מייל": "david@example.com", "טלפון משרד": "03-123-4567"},
+        {"שם": "מוקד", "מייל": None, "טלפון משרד": "08-765-4321"},
+        {"שם": "תפריט", "מייל": None, "טלפון משרד": "03-123-4567"},
+    ]
+
+    counts = benchmark.score_page(predicted, labels)
+
+    assert counts == {"tp": 2, "fp": 1, "found": 2, "fn": 1, "named": 1, "names_right": 1}
+    assert benchmark.quality_metrics(counts) == {
+        "precision": 0.6667, "recall": 0.6667, "f1": 0.6667, "name_accuracy": 1.0,
+    }
+
+
+def test_compare_flags_quality_drop_and_slowdown():
+    baseline = {
+        "quality": {"precision": 0.8, "recall": 0.5, "name_accuracy": 0.1},
+        "speed": {"blocks_per_sec": 1000.0, "page_ms_p50": 1.0, "page_ms_p99": 4.0},
+    }
+    same = {"quality": dict(baseline["quality"]), "speed": {**baseline["speed"], "page_ms_p50": 1.2}}
+    assert benchmark.compare(same, baseline) == []
+
+    worse = {
+        "quality": {**baseline["quality"], "recall": 0.4},
+        "speed": {**baseline["speed"], "blocks_per_sec": 700.0},
+    }
+    assert benchmark.compare(worse, baseline) == ["recall dropped from 0.5 to 0.4"]
+    assert benchmark.compare(worse, baseline, max_slowdown=0.25) == [
+        "recall dropped from 0.5 to 0.4",
+        "blocks_per_sec fell from 1000.0 to 700.0",
+    ]
+    assert benchmark.compare(same, baseline, max_slowdown=0.25) == []
+
+
+def test_load_corpus_reads_only_labelled_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, "CORPUS_DIR", tmp_path)
+    (tmp_path / "חיפה.txt").write_text("info@haifa.muni.il", encoding="utf-8")
+    (tmp_path / "תל אביב.txt").write_text("left by a test run", encoding="utf-8")
+
+    assert benchmark.load_corpus({"חיפה.txt": []}) == {"חיפה.txt": "info@haifa.muni.il"}
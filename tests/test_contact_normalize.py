@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from contact_normalize import (
+    PHONE_RE,
+    normalize_email,
+    normalize_emails,
+    normalize_phone,
+    normalize_phones,
+    phone_dedup_key,
+    phone_dedup_keys,
+    phone_kind,
+)
+
+PHONES = [
+    None, float("nan"), "", "052-123-4567", "0521234567", "+972-52-123-4567",
+    "972521234567", "03-1234567", "31234567", 26302700.0, "26302700.0",
+    "invalid-phone", "123", "051234567", "073 123 4567",
+]
+
+
+def test_phone_re_finds_numbering_plan_forms():
+    text = "משרד 03-1234567, נייד 052-123-4567 או +972 54 1112222, פקס 06-1234567, 03-12345678"
+
+    assert PHONE_RE.findall(text) == ["03-1234567", "052-123-4567", "+972 54 1112222"]
+
+
+def test_phone_kind_uses_prefix_table():
+    assert phone_kind("0521234567") == "mobile"
+    assert phone_kind("031234567") == "landline"
+    assert phone_kind("0731234567") == "voip"
+    assert phone_kind("052123456") is None
+    assert phone_kind("061234567") is None
+
+
+def test_vectorized_phones_match_scalar():
+    series = pd.Series(PHONES, dtype=object)
+
+    assert list(normalize_phones(series)) == [normalize_phone(p) for p in PHONES]
+    assert list(phone_dedup_keys(series)) == [phone_dedup_key(p) for p in PHONES]
+    assert normalize_phone("+972-52-123-4567") == "052-123-4567"
+    assert normalize_phone(26302700.0) == "02-630-2700"
+
+
+def test_vectorized_emails_match_scalar():
+    emails = [None, "", " David@City.gov.il ", "user@domain", "@missing.com", "a.b@c.org"]
+
+    assert list(normalize_emails(pd.Series(emails, dtype=object))) == [normalize_email(e) for e in emails]
+    assert normalize_email(" David@City.gov.il ") == "david@city.gov.il"
@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+import json
 import types
 
 # ensure src directory on path
@@ -36,3 +37,246 @@ def test_process_city_string_profile(monkeypatch):
     assert city == "Example"
     assert data == {}
     assert database_func.site_profiles["example.com"]["skip"] is True
+
+
+class _FakePage:
+    def __init__(self, result):
+        self.result = result
+        self.scripts = []
+
+    def evaluate(self, script):
+        self.scripts.append(script)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_extract_structured_contacts_single_evaluate():
+    records = [{"kind": "table", "text": "דוד כהן מנהל 04-1234567", "emails": [], "phones": []}]
+    page = _FakePage(records)
+
+    assert database_func.extract_structured_contacts(page) == records
+    assert len(page.scripts) == 1
+
+
+def test_extract_structured_contacts_falls_back_on_failure():
+    assert database_func.extract_structured_contacts(_FakePage(RuntimeError("boom"))) == []
+    assert database_func.extract_structured_contacts(_FakePage(None)) == []
+
+
+def test_extract_contacts_from_records_uses_hrefs():
+    records = [
+        {
+            "kind": "card",
+            "text": "דוד כהן",
+            "emails": ["david@city.gov.il"],
+            "phones": ["+972-4-1234567"],
+        },
+    ]
+
+    people = database_func.extract_contacts_from_records(records, "חיפה")["חיפה"]
+
+    assert list(people) == ["דוד כהן"]
+    assert people["דוד כהן"]["מייל"] == "david@city.gov.il"
+    assert people["דוד כהן"]["טלפון משרד"] == "04-123-4567"
+
+
+def test_segment_contact_blocks_one_block_per_contact():
+    text = """
+    מחלקת חינוך
+    ראש המחלקה: דוד כהן
+    טלפון: 03-1234567
+    דוא"ל: david@city.gov.il
+
+    מזכירה: רחל לוי
+    אימייל: rachel@city.gov.il
+    info@city.gov.il
+    """
+
+    blocks = database_func.segment_contact_blocks(text)
+
+    assert blocks == [
+        'מחלקת חינוך ראש המחלקה: דוד כהן טלפון: 03-1234567 דוא"ל: david@city.gov.il',
+        "מזכירה: רחל לוי אימייל: rachel@city.gov.il",
+        "info@city.gov.il",
+    ]
+
+
+def test_find_boilerplate_lines_and_strip():
+    footer = "עיריית דוגמה | מוקד 106 | 08-9999999"
+    pages = [f"תפריט ראשי\nעמוד {i}\n{footer}" for i in range(4)]
+    pages.append("עמוד בלי תפריט")
+
+    boilerplate = database_func.find_boilerplate_lines(pages)
+
+    assert boilerplate == ["תפריט ראשי", footer]
+    assert database_func.strip_boilerplate(pages[1], boilerplate) == "עמוד 1"
+    assert database_func.find_boilerplate_lines(pages[:2]) == []
+
+
+def test_repeated_label_inside_contact_block_is_kept():
+    pages = [f"תפריט ראשי\nרכז {i}: דוד כהן\nטלפון:\n03-123456{i}" for i in range(4)]
+
+    boilerplate = database_func.find_boilerplate_lines(pages)
+
+    assert boilerplate == ["תפריט ראשי"]
+    stripped = database_func.strip_boilerplate(pages[2], boilerplate)
+    assert list(database_func.iter_contact_blocks(stripped)) == ["רכז 2: דוד כהן טלפון: 03-1234562"]
+
+
+def test_process_city_emits_boilerplate_once(monkeypatch, tmp_path):
+    footer = "מוקד עירוני: 08-9999999"
+    texts = {
+        f"http://example.com/p{i}": f"{footer}\nרכז {i}: דוד כהן\nטלפון: 03-123456{i}"
+        for i in range(3)
+    }
+
+    class _Browser:
+        def new_page(self):
+            return object()
+
+        def close(self):
+            pass
+
+    class _Playwright:
+        chromium = types.SimpleNamespace(launch=lambda **kw: _Browser())
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    parsed = []
+    original_contacts_from_text = database_func.contacts_from_text
+
+    def recording_contacts_from_text(text, *args, **kwargs):
+        parsed.append(text)
+        return original_contacts_from_text(text, *args, **kwargs)
+
+    monkeypatch.setattr(database_func, "sync_playwright", lambda: _Playwright())
+    monkeypatch.setattr(database_func, "find_deep_contact_links", lambda page, url: list(texts))
+    monkeypatch.setattr(database_func, "extract_text_from_url", lambda page, link: texts[link])
+    monkeypatch.setattr(database_func, "extract_structured_contacts", lambda page: [])
+    monkeypatch.setattr(database_func, "contacts_from_text", recording_contacts_from_text)
+    monkeypatch.setattr(database_func, "apply_hebrew_transliteration", lambda path: None)
+    monkeypatch.setattr(database_func, "base_dir", str(tmp_path))
+    monkeypatch.setattr(database_func.jobs, "guess_hebrew_name", lambda text: None)
+    monkeypatch.setattr(database_func.jobs, "guess_hebrew_department", lambda *a: None)
+
+    database_func.process_city({"עיר": "דוגמה", "קישור": "http://example.com"}, {})
+
+    assert parsed[0] == footer
+    assert all(footer not in text for text in parsed[1:])
+    assert len(parsed) == 4
+
+
+def test_process_city_parses_pages_while_crawling(monkeypatch, tmp_path):
+    monkeypatch.setattr(database_func, "BOILERPLATE_SAMPLE_PAGES", 2)
+    links = [f"http://example.com/p{i}" for i in range(4)]
+    events = []
+
+    class _Browser:
+        def new_page(self):
+            return object()
+
+        def close(self):
+            events.append("close")
+
+    class _Playwright:
+        chromium = types.SimpleNamespace(launch=lambda **kw: _Browser())
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def fake_extract_text(page, link):
+        events.append(("crawl", link))
+        return f"רכז: דוד כהן {link[-1]}\nטלפון: 03-123456{link[-1]}"
+
+    def recording_parse_page(city, link, *args):
+        events.append(("parse", link))
+        return []
+
+    monkeypatch.setattr(database_func, "sync_playwright", lambda: _Playwright())
+    monkeypatch.setattr(database_func, "find_deep_contact_links", lambda page, url: links)
+    monkeypatch.setattr(database_func, "extract_text_from_url", fake_extract_text)
+    monkeypatch.setattr(database_func, "extract_structured_contacts", lambda page: [])
+    monkeypatch.setattr(database_func, "parse_page", recording_parse_page)
+    monkeypatch.setattr(database_func, "apply_hebrew_transliteration", lambda path: None)
+    monkeypatch.setattr(database_func, "base_dir", str(tmp_path))
+
+    database_func.process_city({"עיר": "דוגמה", "קישור": "http://example.com"}, {})
+
+    assert events == [
+        ("crawl", links[0]), ("crawl", links[1]),
+        ("parse", links[0]), ("parse", links[1]),
+        ("crawl", links[2]), ("parse", links[2]),
+        ("crawl", links[3]), ("parse", links[3]),
+        "close",
+    ]
+
+
+def test_iter_contacts_streams_chunks(monkeypatch):
+    monkeypatch.setattr(database_func.jobs, "parse_cache", None)
+    text = "רכז נוער: דוד כהן\nטלפון: 03-1234567\n\nמזכירה\nrachel@city.gov.il\n"
+    chunks = (text[i:i + 5] for i in range(0, len(text), 5))
+
+    contacts = database_func.iter_contacts(chunks, "חיפה", defer_enrichment=True)
+
+    first = next(contacts)
+    assert first.raw_text == "רכז נוער: דוד כהן טלפון: 03-1234567"
+    assert [c.email for c in contacts] == ["rachel@city.gov.il"]
+    assert database_func.segment_contact_blocks(text) == [
+        first.raw_text,
+        "מזכירה rachel@city.gov.il",
+    ]
+
+
+def test_phone_split_across_lines_is_a_hit(monkeypatch):
+    monkeypatch.setattr(database_func.jobs, "parse_cache", None)
+    text = "תפריט\nדוד כהן\nטלפון: 03\n1234567\nחדשות\nרחל לוי 052-123\n4567 שלוחה 2\nסוף"
+
+    blocks = database_func.segment_contact_blocks(text)
+
+    assert blocks == ["תפריט דוד כהן טלפון: 03 1234567", "חדשות רחל לוי 052-123 4567 שלוחה 2"]
+    contacts = database_func.contacts_from_text(text, "חיפה", defer_enrichment=True)
+    assert [c.phone_office or c.phone_mobile for c in contacts] == ["03-123-4567", "052-123-4567"]
+
+
+def test_write_json_member_matches_json_dump(tmp_path):
+    data = {"חיפה": {"דוד כהן": {"שם": "דוד כהן"}}, "עכו": {}}
+    path = tmp_path / "out.json"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for i, (city, people) in enumerate(data.items()):
+            database_func._write_json_member(f, city, people, first=i == 0)
+        f.write("\n}")
+
+    assert path.read_text(encoding="utf-8") == json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def test_footer_link_does_not_hide_body_contacts(monkeypatch):
+    monkeypatch.setattr(database_func.jobs, "parse_cache", None)
+    text = "רכז נוער: דוד כהן\nטלפון: 03-1234567\nחדשות העירייה\nצור קשר: info@city.gov.il"
+    records = [{"kind": "link", "text": "צור קשר: info@city.gov.il", "emails": ["info@city.gov.il"], "phones": []}]
+
+    contacts = database_func.parse_page("חיפה", "http://example.com", text, records)
+
+    assert [c.phone_office for c in contacts] == ["03-123-4567", None]
+    assert contacts[1].email == "info@city.gov.il"
+
+
+def test_text_outside_structured_records_is_parsed(monkeypatch):
+    monkeypatch.setattr(database_func.jobs, "parse_cache", None)
+    text = "צוות\nרחל לוי\tמזכירה\t04-7654321\n\nמנהל: דוד כהן\nטלפון: 03-1234567"
+    records = [{"kind": "table", "text": "רחל לוי מזכירה 04-7654321", "emails": [], "phones": []}]
+
+    contacts = database_func.parse_page("חיפה", "http://example.com", text, records)
+
+    assert [c.raw_text for c in contacts] == [
+        "רחל לוי מזכירה 04-7654321",
+        "צוות מנהל: דוד כהן טלפון: 03-1234567",
+    ]
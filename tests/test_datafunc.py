@@ -20,3 +20,18 @@ def test_transliteration_updates_file(tmp_path, monkeypatch):
     loaded = json.loads(file.read_text(encoding="utf-8"))
     assert "john" not in loaded["אלעד"]
     assert "יוחנן" in loaded["אלעד"]
+
+
+def test_unresolved_names_keep_english(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(jobs, "_translation_cache", None)
+    monkeypatch.setattr(jobs, "_gov_names", {})
+    monkeypatch.setattr(jobs, "guess_hebrew_name", lambda n: None)
+    data = {"אלעד": {"Gail Schneider": {"שם": "Gail Schneider"}}}
+    file = tmp_path / "contacts.json"
+    file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    apply_hebrew_transliteration(file)
+
+    loaded = json.loads(file.read_text(encoding="utf-8"))
+    assert loaded == data
@@ -0,0 +1,75 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import jobs
+from jobs import Contacts
+from dept_classifier import CONFIDENCE_THRESHOLD, DepartmentClassifier, load
+
+
+def _classifier():
+    examples = [
+        ("רכזת פעילות ספורט ונופש", "מחלקת ספורט"),
+        ("מאמן כדורגל sport@city.org.il", "מחלקת ספורט"),
+        ("מנהלת בריכה ואולם ספורט", "מחלקת ספורט"),
+        ("עובדת סוציאלית revaha@city.org.il", "מחלקת רווחה"),
+        ("עובד סוציאלי משפחות", "מחלקת רווחה"),
+        ("מרכז טיפול במשפחה welfare", "מחלקת רווחה"),
+    ] * 3 + [
+        ("דנה כהן מזכירה", None),
+        ("משה לוי info@city.org.il", None),
+        ("טלפון מוקד עירוני", None),
+    ] * 3
+    return DepartmentClassifier.train(examples)
+
+
+def test_classify_returns_department_and_confidence():
+    classifier = _classifier()
+
+    department, confidence = classifier.classify("אבי דוד עובד סוציאלי", "https://city.org.il/welfare")
+    assert department == "מחלקת רווחה"
+    assert confidence >= CONFIDENCE_THRESHOLD
+    assert classifier.classify("מאמנת כדורגל ואולם ספורט")[0] == "מחלקת ספורט"
+    assert classifier.classify("zzz qqq") == (None, 0.0)
+    assert DepartmentClassifier().classify("עובד סוציאלי") == (None, 0.0)
+
+
+def test_trained_from_contacts_file(tmp_path):
+    contacts = {
+        "חיפה": {
+            "רות": {"שם": "רות", "תפקיד": "עובדת סוציאלית", "מחלקה": "מחלקת רווחה", "מייל": "revaha@haifa.muni.il"},
+            "דן": {"שם": "דן", "תפקיד": "מזכיר", "מחלקה": "מחלקת המועצה", "מייל": None},
+        },
+        "עכו": {},
+    }
+    path = tmp_path / "contacts.json"
+    path.write_text(json.dumps(contacts, ensure_ascii=False), encoding="utf-8")
+
+    classifier = load({"מחלקת רווחה"}, path)
+    assert classifier.labels == ["", "מחלקת רווחה"]
+    assert len(load({"מחלקת רווחה"}, tmp_path / "missing.json")) == 0
+
+
+def test_contacts_skip_the_llm_above_the_threshold(monkeypatch):
+    monkeypatch.setattr(jobs, "_dept_classifier", _classifier())
+    monkeypatch.setattr(jobs, "parse_cache", None)
+
+    confident = Contacts("אבי דוד עובד סוציאלי 03-1234567", "חיפה", defer_enrichment=True)
+    unsure = Contacts("אבי דוד 03-1234567", "חיפה", defer_enrichment=True)
+
+    assert confident.department == "מחלקת רווחה"
+    assert "department" not in confident.pending
+    assert "department" in unsure.pending
+
+
+def test_classifies_thousands_of_blocks_per_second():
+    classifier = _classifier()
+    blocks = [f"פקיד {i} עובד סוציאלי בבית {i * 7} טלפון 03-{i:07d} mail{i}@city.org.il" for i in range(3000)]
+
+    start = time.perf_counter()
+    for block in blocks:
+        classifier.classify(block)
+    assert len(blocks) / (time.perf_counter() - start) > 1000
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import jobs
+from jobs import Contacts
+from dept_index import DepartmentIndex, canonical_department, department_id, word_forms
+
+
+def test_surface_forms_share_one_id():
+    forms = ["מחלקת חינוך", "אגף החינוך", "מחלקה לחינוך", "ובחינוך", "מחלקת חינוך וצעירים", "Education"]
+
+    assert {department_id(form) for form in forms} == {department_id("מחלקת חינוך")}
+    assert canonical_department("אגף לשירותים חברתיים") == "מחלקת רווחה"
+    assert canonical_department("המחלקה לאיכות הסביבה") == "מחלקת איכות סביבה"
+    assert canonical_department("מחלקת גזברות") == "מחלקת כספים"
+    assert canonical_department("מחלקת המועצה") is None
+    assert department_id("") is None
+
+
+def test_prefix_stripping_keeps_short_words():
+    assert word_forms("ובחינוך") == ["ובחינוך", "בחינוך", "חינוך"]
+    assert word_forms("בטחון") == ["בטחון", "טחון"]
+    assert word_forms("הנדסה")[0] == "הנדסה"
+    assert word_forms("מים") == ["מים"]
+
+
+def test_covers_the_jobs_department_tables():
+    index = DepartmentIndex()
+
+    for keyword, canonical in {**jobs.DEPARTMENT_KEYWORDS, **jobs.ENGLISH_DEPT_KEYWORDS}.items():
+        assert index.canonical(keyword) == canonical
+        assert index.canonical(canonical) == canonical
+
+
+def test_contacts_canonicalise_department_phrases(monkeypatch):
+    monkeypatch.setattr(jobs, "parse_cache", None)
+
+    contact = Contacts("אגף לשירותים חברתיים 03-1234567", "חיפה", defer_enrichment=True)
+
+    assert contact.department == "מחלקת רווחה"
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import jobs
+from jobs import Contacts
+from enrichment import Enricher
+
+
+def test_deferred_contact_makes_no_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(jobs, "guess_hebrew_name", lambda text: calls.append(text) or "דן")
+    monkeypatch.setattr(jobs, "guess_hebrew_department", lambda *a: calls.append(a) or "מחלקת חינוך")
+
+    c = Contacts("some text without name", "תל אביב", defer_enrichment=True)
+
+    assert calls == []
+    assert c.name == "לא נמצא שם"
+    assert set(c.pending) == {"name", "department"}
+
+
+def test_enricher_dedups_and_writes_back(monkeypatch):
+    calls = []
+    monkeypatch.setattr(jobs, "guess_hebrew_name", lambda text: calls.append(text) or "דן")
+    monkeypatch.setattr(jobs, "guess_hebrew_department", lambda *a: calls.append(a) or "מחלקת חינוך")
+
+    contacts = [Contacts("some text without name", f"עיר {i}", defer_enrichment=True) for i in range(3)]
+    with Enricher(max_workers=2) as enricher:
+        enricher.resolve(contacts[:2])
+        enricher.resolve(contacts[2:])
+
+    assert len(calls) == 2
+    assert enricher.requested == 6
+    assert enricher.sent == 2
+    for c in contacts:
+        assert c.name == "דן"
+        assert c.department == "מחלקת חינוך"
+        assert c.pending == {}
+
+
+def test_enricher_dedups_across_whitespace(monkeypatch):
+    calls = []
+    monkeypatch.setattr(jobs, "guess_hebrew_name", lambda text: calls.append(text) or "דן")
+    monkeypatch.setattr(jobs, "guess_hebrew_department", lambda *a: calls.append(a) or "מחלקת חינוך")
+
+    texts = ["some text without name", "some  text\nwithout name", " some text without name "]
+    contacts = [Contacts(text, "תל אביב", defer_enrichment=True) for text in texts]
+    with Enricher(max_workers=2) as enricher:
+        enricher.resolve(contacts)
+
+    assert len(calls) == 2
+    assert enricher.summary() == "6 enrichment requests, 2 sent to ChatGPT, 4 deduplicated (67%)"
+    assert all(c.name == "דן" for c in contacts)
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Cumulative import time allowed for each CLI module, in seconds. They take
+# about 0.15s; loading openai or pandas at import alone costs over 0.5s.
+IMPORT_BUDGET = 0.6
+HEAVY_MODULES = {"openai", "pandas", "playwright", "nameparser", "requests"}
+
+
+def _import_times(module: str, code: str = "") -> dict[str, float]:
+    """Return the cumulative import time of every module ``module`` pulls in."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}\n{code}"],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+@pytest.mark.parametrize("module", ["jobs", "datafunc", "extraction", "database_func", "name_pull"])
+def test_cli_modules_import_fast(module):
+    times = _import_times(module)
+
+    assert not HEAVY_MODULES & {name.split(".")[0] for name in times}
+    assert times[module] < IMPORT_BUDGET, f"importing {module} took {times[module]:.2f}s"
+
+
+def test_database_func_import_opens_no_log_files():
+    code = (
+        "import logging\n"
+        "assert not logging.getLogger().handlers\n"
+        "assert not logging.getLogger('io_logger').handlers\n"
+        "assert not logging.getLogger('failed_logger').handlers\n"
+    )
+    _import_times("database_func", code)
@@ -242,3 +242,145 @@ class TestExtractionPipeline:
         finally:
             os.unlink(input_file)
             os.unlink(output_file)
+
+    def test_batched_openai_fixes_retry_invalid_rows(self, monkeypatch):
+        """Batched requests carry several contacts; bad answers are retried one by one."""
+        import json
+
+        requests = []
+
+        def fake_answer(messages, **kwargs):
+            batch = json.loads(messages[-1]["content"])
+            requests.append([item["id"] for item in batch])
+            answer = [
+                {"id": item["id"], "name": item["name"].upper(), "department": "מחלקת חינוך"}
+                for item in batch
+                if item["name"] != "Broken"
+            ]
+            # An answer for a contact that was never sent is ignored
+            answer.append({"id": 99, "name": "זר", "department": None})
+            return json.dumps(answer, ensure_ascii=False)
+
+        singles = []
+
+        def fake_single(name, dept):
+            singles.append(name)
+            return "תוקן", dept
+
+        monkeypatch.setattr(extraction.llm_client, "complete_many", lambda rs: [fake_answer(**r) for r in rs])
+        monkeypatch.setattr(extraction, "gpt_fix_names_and_department", fake_single)
+
+        pairs = [("Dan", "education"), ("", "culture"), ("Broken", "welfare"), ("Ruth", None)]
+        fixed = extraction.gpt_fix_names_and_departments(pairs, batch_size=2)
+
+        assert requests == [[0, 2], [3]]
+        assert singles == ["Broken"]
+        assert fixed == [
+            ("DAN", "מחלקת חינוך"),
+            ("", "culture"),
+            ("תוקן", "welfare"),
+            ("RUTH", "מחלקת חינוך"),
+        ]
+
+    def test_batched_openai_fixes_respect_token_budget(self, monkeypatch):
+        """The completion token budget caps the contacts sent in one request."""
+        import json
+
+        sizes = []
+
+        def fake_answer(messages, max_tokens, **kwargs):
+            batch = json.loads(messages[-1]["content"])
+            sizes.append((len(batch), max_tokens))
+            return json.dumps([{"id": item["id"], "name": "דן", "department": None} for item in batch])
+
+        monkeypatch.setattr(extraction.llm_client, "complete_many", lambda rs: [fake_answer(**r) for r in rs])
+
+        pairs = [(f"Dan {i}", "education") for i in range(5)]
+        fixed = extraction.gpt_fix_names_and_departments(pairs, batch_size=20, max_tokens=80)
+
+        assert sizes == [(2, 80), (2, 80), (1, 80)]
+        assert fixed == [("דן", "education")] * 5
+
+    def test_single_fix_makes_one_client_call(self, monkeypatch):
+        """The client retries itself; a failed row falls back after one call."""
+        calls = []
+
+        def failing_complete(**request):
+            calls.append(request)
+            raise RuntimeError("server error")
+
+        monkeypatch.setattr(extraction.llm_client, "complete", failing_complete)
+
+        assert extraction.gpt_fix_names_and_department("Dan\n", "education") == ("Dan", "education")
+        assert len(calls) == 1
+
+    def test_triage_skips_confident_rows(self, monkeypatch):
+        """Clean Hebrew names with canonical departments never reach OpenAI."""
+        import jobs
+        from name_index import NameIndex
+
+        monkeypatch.setattr(jobs, "_name_index", NameIndex.build({"Dan": "דן"}))
+        index = jobs.load_name_index()
+        assert extraction.triage_contact("דן כהן", "מחלקת חינוך", index) == "confident"
+        assert extraction.triage_contact("דן כהן", None, index) == "confident"
+        assert extraction.triage_contact(None, "מחלקת חינוך", index) == "empty_name"
+        assert extraction.triage_contact("Dan Cohen", "מחלקת חינוך", index) == "latin_name"
+        assert extraction.triage_contact("שלום עולם", "מחלקת חינוך", index) == "unknown_name"
+        assert extraction.triage_contact("רכז דן", "", index) == "unknown_name"
+        assert extraction.triage_contact("דן כהן", "education", index) == "department"
+
+        sent = []
+
+        def mock_gpt_fix(name, dept):
+            sent.append(name)
+            return "רות לוי", "מחלקת רווחה"
+
+        monkeypatch.setattr(extraction, "gpt_fix_names_and_department", mock_gpt_fix)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+        test_data = [
+            {'שם': 'דן כהן', 'טלפון': '052-111-2222', 'אימייל': 'dan@test.com', 'מחלקה': 'מחלקת חינוך', 'עיר': 'תל אביב'},
+            {'שם': 'Ruth Levi', 'טלפון': '053-333-4444', 'אימייל': 'ruth@test.com', 'מחלקה': 'welfare', 'עיר': 'חיפה'},
+        ]
+        input_file = self.create_test_csv(test_data)
+        output_file = tempfile.NamedTemporaryFile(suffix='.csv', delete=False).name
+
+        try:
+            extraction.clean_csv_data(input_file, output_file, use_openai=True)
+            result_df = pd.read_csv(output_file, encoding='utf-8-sig')
+        finally:
+            os.unlink(input_file)
+            os.unlink(output_file)
+
+        assert sent == ["Ruth Levi"]
+        assert sorted(result_df['שם']) == ['דן כהן', 'רות לוי']
+
+    def test_duplicate_pairs_are_sent_once(self, monkeypatch):
+        """Rows sharing a name and department get one OpenAI answer between them."""
+        sent = []
+
+        def mock_gpt_fix(name, dept):
+            sent.append((name, dept))
+            return {"David Cohen": "דוד כהן", "Ruth": "רות"}[name], "מחלקת חינוך"
+
+        monkeypatch.setattr(extraction, "gpt_fix_names_and_department", mock_gpt_fix)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+        test_data = [
+            {'שם': 'David Cohen', 'טלפון': f'052-111-222{i}', 'אימייל': f'david{i}@test.com',
+             'מחלקה': 'education ' if i % 2 else 'education', 'עיר': f'עיר {i}'}
+            for i in range(4)
+        ] + [{'שם': 'Ruth', 'טלפון': '053-333-4444', 'אימייל': 'ruth@test.com', 'מחלקה': 'education', 'עיר': 'חיפה'}]
+        input_file = self.create_test_csv(test_data)
+        output_file = tempfile.NamedTemporaryFile(suffix='.csv', delete=False).name
+
+        try:
+            extraction.clean_csv_data(input_file, output_file, use_openai=True)
+            result_df = pd.read_csv(output_file, encoding='utf-8-sig')
+        finally:
+            os.unlink(input_file)
+            os.unlink(output_file)
+
+        assert sent == [("David Cohen", "מחלקת חינוך"), ("Ruth", "מחלקת חינוך")]
+        assert sorted(result_df['שם']) == ['דוד כהן'] * 4 + ['רות']
+        assert set(result_df['מחלקה']) == {'מחלקת חינוך'}
@@ -57,4 +57,14 @@ def test_name_from_clean_email(monkeypatch):
 def test_blacklist_behavior_with_long_text(monkeypatch):
     monkeypatch.setattr(jobs, "guess_hebrew_name", lambda n: "קונטקט")
     c = Contacts("לתמיכה טכנית אנא פנו contact@helpdesk.gov.il", "בת ים")
-    assert c.name == "לא נמצא שם"
\ No newline at end of file
+    assert c.name == "לא נמצא שם"
+
+def test_scan_block_collects_all_hits():
+    scan = jobs._scan_block("דוד כהן רכז-נוער בתרבות 04-1234567 04 1234567 dan@city.gov.il")
+
+    assert scan.email == "dan@city.gov.il"
+    assert scan.phones == ["04-1234567", "04 1234567"]
+    # DEPARTMENT_KEYWORDS priority wins over position in the text
+    assert scan.department == "מחלקת נוער"
+    assert scan.role == "רכז-נוער"
+    assert scan.hebrew_name == "דוד כהן רכז"
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import lexicon
+from lexicon import Lexicon
+
+import pytest
+
+
+@pytest.fixture(params=["native", "pure"])
+def backend(request, monkeypatch):
+    if request.param == "pure":
+        monkeypatch.setattr(lexicon, "ahocorasick", None)
+    elif lexicon.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    return request.param
+
+
+def test_reports_overlapping_matches(backend):
+    lex = Lexicon(["he", "she", "his", "hers"])
+
+    assert list(lex.iter_matches("ushers")) == [(1, "she"), (2, "he"), (2, "hers")]
+    assert lex.matches("ushers") == {"she", "he", "hers"}
+    assert lex.leftmost("ushers") == (1, "she")
+
+
+def test_priority_follows_keyword_order(backend):
+    lex = Lexicon({"תרבות": "מחלקת תרבות", "חינוך": "מחלקת חינוך"})
+
+    assert lex.get("אגף חינוך ותרבות") == "מחלקת תרבות"
+    assert lex.get("שירות לקוחות") is None
+
+
+def test_ignore_case_and_empty(backend):
+    lex = Lexicon({"info", "webmaster"}, ignore_case=True)
+
+    assert lex.contains_any("WebMaster@city.gov.il")
+    assert not lex.contains_any("dan@city.gov.il")
+    assert not Lexicon([]).contains_any("anything")
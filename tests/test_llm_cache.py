@@ -0,0 +1,45 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from llm_cache import LLMCache
+
+
+def test_lookup_keys_on_model_prompts_and_temperature(tmp_path):
+    cache = LLMCache(path=tmp_path / "llm_cache.sqlite")
+    messages = [
+        {"role": "system", "content": "Return only the name."},
+        {"role": "user", "content": "Dan"},
+    ]
+    cache.store("gpt-3.5-turbo", messages, 0.2, "דן")
+
+    assert cache.lookup("gpt-3.5-turbo", messages, 0.2) == "דן"
+    assert cache.get("gpt-3.5-turbo", "Return only the name.", "Dan", 0.2) == "דן"
+    assert cache.lookup("gpt-3.5-turbo", messages, 0.7) is None
+    assert cache.lookup("gpt-4", messages, 0.2) is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_entries_survive_reopening_and_expire(tmp_path):
+    path = tmp_path / "llm_cache.sqlite"
+    LLMCache(path=path).put("m", "s", "u", 0.1, "answer")
+
+    assert LLMCache(path=path).get("m", "s", "u", 0.1) == "answer"
+    expired = LLMCache(path=path, ttl=0)
+    time.sleep(0.01)
+    assert expired.get("m", "s", "u", 0.1) is None
+
+
+def test_prune_keeps_most_recently_used(tmp_path):
+    cache = LLMCache(path=tmp_path / "llm_cache.sqlite", max_entries=2)
+    for user in ("a", "b", "c"):
+        cache.put("m", "s", user, 0.0, user.upper())
+        time.sleep(0.01)
+    cache.get("m", "s", "a", 0.0)
+    cache.prune()
+
+    assert len(cache) == 2
+    assert cache.get("m", "s", "b", 0.0) is None
+    assert cache.get("m", "s", "a", 0.0) == "A"
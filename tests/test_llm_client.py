@@ -0,0 +1,169 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import openai
+import pytest
+
+import chatgpt_name
+import llm_cache
+import llm_client
+from llm_cache import LLMCache
+from llm_client import LLMClient, RateLimiter
+
+
+class FakeAsyncOpenAI:
+    """Answers with the user prompt after ``delay``; raises queued errors first."""
+
+    def __init__(self, delay=0.0, errors=()):
+        self.delay = delay
+        self.errors = list(errors)
+        self.calls = []
+        self.in_flight = self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **request):
+        self.calls.append((time.monotonic(), request))
+        if self.errors:
+            raise self.errors.pop(0)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        message = SimpleNamespace(content=request["messages"][-1]["content"].upper())
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def _request(prompt, temperature=0.2):
+    return dict(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "system", "content": "echo"}, {"role": "user", "content": prompt}],
+        temperature=temperature,
+        max_tokens=10,
+    )
+
+
+def _response(status, headers=None):
+    return SimpleNamespace(status_code=status, headers=headers or {}, request=None)
+
+
+def _rate_limited(retry_after):
+    return openai.RateLimitError("rate limited", response=_response(429, {"retry-after": retry_after}), body=None)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LLMCache(path=tmp_path / "llm_cache.sqlite")
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def make(fake, **kwargs):
+        client = LLMClient(client_factory=lambda: fake, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_requests_run_concurrently(cache, make_client):
+    fake = FakeAsyncOpenAI(delay=0.2)
+    client = make_client(fake)
+
+    start = time.monotonic()
+    answers = client.complete_many([_request(f"name {i}") for i in range(10)])
+
+    assert answers == [f"NAME {i}" for i in range(10)]
+    assert time.monotonic() - start < 1.0
+    assert fake.max_in_flight == 10
+
+
+def test_answers_are_cached_and_cache_only_skips_the_api(cache, make_client):
+    fake = FakeAsyncOpenAI()
+    client = make_client(fake)
+
+    assert client.complete(**_request("dan")) == "DAN"
+    assert client.complete(**_request("dan")) == "DAN"
+    cache.cache_only = True
+    assert client.complete(**_request("ruth")) is None
+    assert len(fake.calls) == 1
+
+
+def test_retry_after_pauses_before_retrying(cache, make_client):
+    fake = FakeAsyncOpenAI(errors=[_rate_limited("0.3")])
+    client = make_client(fake)
+
+    assert client.complete(**_request("dan")) == "DAN"
+    (first, _), (second, _) = fake.calls
+    assert second - first >= 0.3
+    assert client.async_client.retries == 1
+
+
+def test_non_retryable_errors_raise(cache, make_client):
+    error = openai.AuthenticationError("bad key", response=_response(401), body=None)
+    client = make_client(FakeAsyncOpenAI(errors=[error]))
+
+    with pytest.raises(openai.AuthenticationError):
+        client.complete(**_request("dan"))
+    assert client.complete_many([_request("ruth")]) == ["RUTH"]
+
+
+def test_rate_limiter_waits_for_the_window():
+    now = [0.0]
+    limiter = RateLimiter(rpm=2, tpm=100, clock=lambda: now[0])
+
+    async def run():
+        await limiter.acquire(10)
+        await limiter.acquire(10)
+        third = asyncio.ensure_future(limiter.acquire(10))
+        await asyncio.sleep(0.05)
+        assert not third.done()
+        now[0] = 60.0
+        await asyncio.wait_for(third, 2)
+
+        big = asyncio.ensure_future(limiter.acquire(95))
+        await asyncio.sleep(0.05)
+        assert not big.done()
+        now[0] = 120.0
+        await asyncio.wait_for(big, 2)
+
+    asyncio.run(run())
+
+
+def test_unreachable_server_is_retried_briefly(cache, make_client, monkeypatch):
+    monkeypatch.setattr(llm_client, "BACKOFF_BASE", 0.01)
+    errors = [openai.APIConnectionError(request=None) for _ in range(5)]
+    fake = FakeAsyncOpenAI(errors=errors)
+    client = make_client(fake)
+
+    with pytest.raises(openai.APIConnectionError):
+        client.complete(**_request("dan"))
+    assert len(fake.calls) == 1 + llm_client.CONNECTION_RETRIES
+
+
+def test_cache_answers_without_api_key(tmp_path, monkeypatch, make_client):
+    path = tmp_path / "llm_cache.sqlite"
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(path=path))
+    monkeypatch.setattr(llm_client, "_client", make_client(FakeAsyncOpenAI()))
+    assert chatgpt_name.guess_hebrew_name("dan") == "DAN"
+
+    # A --llm-cache-only re-run on a machine without a key
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(path=path, cache_only=True))
+    offline = LLMClient()
+    monkeypatch.setattr(llm_client, "_client", offline)
+    try:
+        assert chatgpt_name.guess_hebrew_name("dan") == "DAN"
+        assert chatgpt_name.guess_hebrew_name("noa") is None
+    finally:
+        offline.close()
@@ -0,0 +1,93 @@
+import json
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import openai
+import pandas as pd
+import pytest
+
+import extraction
+import llm_cache
+import llm_client
+from llm_cache import LLMCache
+from llm_stub_server import StubConfig, StubServer, answer
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(path=tmp_path / "llm_cache.sqlite"))
+
+
+@pytest.fixture
+def stub_client(cache, monkeypatch):
+    """Point the shared llm_client at a stub server built from a config."""
+    started = []
+
+    def start(config, **client_kwargs):
+        server = StubServer(config).__enter__()
+        client = llm_client.LLMClient(
+            client_factory=lambda: openai.AsyncOpenAI(base_url=server.base_url, api_key="stub", max_retries=0),
+            **client_kwargs,
+        )
+        monkeypatch.setattr(llm_client, "_client", client)
+        started.append((server, client))
+        return server
+
+    yield start
+    for server, client in started:
+        client.close()
+        server.__exit__(None, None, None)
+
+
+def test_answers_follow_the_prompt_kind():
+    batch = json.dumps([{"id": 3, "name": "David", "department": "education"}, {"id": 4, "name": "טלפון", "department": ""}])
+    assert json.loads(answer([{"role": "system", "content": "..."}, {"role": "user", "content": batch}])) == [
+        {"id": 3, "name": "דאויד", "department": "מחלקת חינוך"},
+        {"id": 4, "name": None, "department": None},
+    ]
+    department = [{"role": "system", "content": "Return only the best matching Hebrew department name"},
+                  {"role": "user", "content": "URL: https://city.example/welfare"}]
+    assert answer(department) == "מחלקת רווחה"
+
+
+def test_clean_csv_data_runs_against_the_stub(stub_client, monkeypatch):
+    server = stub_client(StubConfig(latency=0.05, jitter=0.02, error_rate=0.1, rate_limit_rate=0.1,
+                                    retry_after=0.05, seed=3))
+    monkeypatch.setattr(llm_client, "BACKOFF_BASE", 0.01)
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+
+    rows = [
+        {"שם": f"David {chr(65 + i)}", "טלפון": f"052-{i:03d}-1234", "אימייל": f"d{i}@test.com",
+         "מחלקה": "education", "עיר": "תל אביב"}
+        for i in range(30)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file, output_file = f"{tmp}/in.csv", f"{tmp}/out.csv"
+        pd.DataFrame(rows).to_csv(input_file, index=False, encoding="utf-8-sig")
+        extraction.clean_csv_data(input_file, output_file, use_openai=True, openai_batch_size=5)
+        result = pd.read_csv(output_file, encoding="utf-8-sig")
+
+    assert len(result) == 30
+    assert set(result["מחלקה"]) == {"מחלקת חינוך"}
+    assert all(not any("a" <= c.lower() <= "z" for c in name) for name in result["שם"])
+
+    with urllib.request.urlopen(server.base_url.replace("/v1", "/stats")) as response:
+        stats = json.load(response)
+    assert stats["rate_limited"] + stats["errors"] > 0
+    assert stats["completions"] >= 6
+
+
+def test_persistent_rate_limit_gives_up(stub_client):
+    server = stub_client(StubConfig(rate_limit_rate=1.0, retry_after=0.01), max_retries=2)
+
+    with pytest.raises(openai.RateLimitError):
+        llm_client.complete(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "system", "content": "personal name"}, {"role": "user", "content": "Dan"}],
+            temperature=0.2,
+        )
+    assert server.snapshot()["rate_limited"] == 3
@@ -0,0 +1,82 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+import llm_cache
+import llm_telemetry
+from llm_cache import LLMCache
+from llm_client import LLMClient
+from llm_telemetry import CallRecord, Telemetry
+from test_llm_client import FakeAsyncOpenAI, _rate_limited, _request
+
+
+def test_report_aggregates_per_stage():
+    telemetry = Telemetry()
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        telemetry.record(CallRecord("guess_hebrew_name", "gpt-3.5-turbo", 1000, 1000, latency=latency))
+    telemetry.record(CallRecord("guess_hebrew_name", "gpt-3.5-turbo", cache_hit=True))
+    telemetry.record(CallRecord("guess_hebrew_department", "gpt-3.5-turbo", latency=2.0, retries=2, error="APIError"))
+
+    report = telemetry.report(contacts=3)
+
+    names = report["stages"]["guess_hebrew_name"]
+    assert names["calls"] == 5
+    assert names["cache_hits"] == 1
+    assert names["latency_p50"] == 0.2
+    assert names["latency_p95"] == 0.4
+    assert names["cost"] == pytest.approx(4 * 0.002)
+    assert report["stages"]["guess_hebrew_department"]["errors"] == 1
+    assert report["total"]["retries"] == 2
+    assert report["total"]["calls_per_contact"] == 2.0
+    assert "guess_hebrew_department: 1 calls" in telemetry.summary()
+
+
+def test_client_records_calls_to_jsonl(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(path=tmp_path / "llm_cache.sqlite"))
+    telemetry = llm_telemetry.configure(jsonl_path=tmp_path / "calls.jsonl")
+    client = LLMClient(client_factory=lambda: FakeAsyncOpenAI(errors=[_rate_limited("0")]))
+    try:
+        client.complete(**_request("dan"), stage="guess_hebrew_name")
+        client.complete(**_request("dan"), stage="guess_hebrew_name")
+    finally:
+        client.close()
+        telemetry.close()
+        monkeypatch.setattr(llm_telemetry, "_telemetry", None)
+
+    lines = [json.loads(line) for line in (tmp_path / "calls.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [(r["stage"], r["cache_hit"], r["retries"]) for r in lines] == [
+        ("guess_hebrew_name", False, 1),
+        ("guess_hebrew_name", True, 0),
+    ]
+    assert lines[0]["prompt_tokens"] > 0 and lines[0]["completion_tokens"] > 0
+    assert telemetry.report()["total"]["calls"] == 2
+
+
+def test_cache_only_misses_are_recorded(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(path=tmp_path / "llm_cache.sqlite", cache_only=True))
+    telemetry = llm_telemetry.configure()
+    client = LLMClient(client_factory=FakeAsyncOpenAI)
+    try:
+        assert client.complete(**_request("dan"), stage="guess_hebrew_name") is None
+    finally:
+        client.close()
+        monkeypatch.setattr(llm_telemetry, "_telemetry", None)
+
+    stats = telemetry.report()["stages"]["guess_hebrew_name"]
+    assert (stats["calls"], stats["skipped"], stats["cache_hits"]) == (1, 1, 0)
+
+
+def test_telemetry_flag_needs_a_file_name(monkeypatch):
+    import database_func
+
+    monkeypatch.setattr(sys, "argv", ["database_func.py", "out.json", "--llm-telemetry"])
+    with pytest.raises(SystemExit) as exit_info:
+        database_func._option_value("--llm-telemetry")
+    assert "Usage" in str(exit_info.value.code)
+
+    monkeypatch.setattr(sys, "argv", ["database_func.py", "--llm-telemetry", "calls.jsonl", "out.json"])
+    assert database_func._option_value("--llm-telemetry") == "calls.jsonl"
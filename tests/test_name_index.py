@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import jobs
+from jobs import Contacts
+from name_index import NameIndex
+
+
+def _index():
+    return NameIndex.build({"David": "דוד", "Noa": "נועה"}, {"Rachel Levi": "רחל לוי"})
+
+
+def test_find_name_prefers_known_names():
+    index = _index()
+
+    assert index.find_name("רכז נוער דוד כהן טלפון", {"רכז", "נוער", "טלפון"}) == "דוד כהן"
+    assert index.find_name("מזכירות הלשכה רחל לוי") == "רחל לוי"
+    assert index.find_name("שלוחה 3 אופיר כהן") == "אופיר כהן"
+    assert index.find_name("מחלקת חינוך קבלת קהל") is None
+
+
+def test_to_hebrew_needs_every_word():
+    index = _index()
+
+    assert index.to_hebrew("David Cohen") == "דוד כהן"
+    assert index.to_hebrew("rachel levi") == "רחל לוי"
+    assert index.to_hebrew("Noa Adari") is None
+    assert index.to_hebrew("Cohen") is None
+
+
+def test_contacts_resolve_names_locally(monkeypatch):
+    monkeypatch.setattr(jobs, "_name_index", _index())
+    monkeypatch.setattr(jobs, "parse_cache", None)
+
+    hebrew = Contacts("מנהלת המחלקה רעות כהן 03-1234567", "חיפה", defer_enrichment=True)
+    english = Contacts("David Cohen david.cohen@city.gov.il", "חיפה", defer_enrichment=True)
+
+    assert hebrew.name == "רעות כהן"
+    assert english.name == "דוד כהן"
+    assert "name" not in hebrew.pending and "name" not in english.pending
+
+
+def test_parse_never_loads_the_dataset(monkeypatch):
+    def no_download():
+        raise AssertionError("parse must not load the names dataset")
+
+    monkeypatch.setattr(jobs, "_name_index", None)
+    monkeypatch.setattr(jobs, "_gov_names", None)
+    monkeypatch.setattr(jobs, "load_names", no_download)
+    monkeypatch.setattr(jobs, "parse_cache", None)
+
+    contact = Contacts("מנהלת המחלקה רעות כהן 03-1234567", "חיפה", defer_enrichment=True)
+
+    assert contact.name == "רעות כהן"
+    assert jobs._name_index is None
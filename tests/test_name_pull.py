@@ -1,8 +1,16 @@
 import json
 import re
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import jobs
+import llm_cache
+import llm_client
 import name_pull
+from llm_cache import LLMCache
+from llm_client import LLMClient
 from name_pull import collect_names, transliterate_to_hebrew, extract_name_from_email
 
 
@@ -31,6 +39,26 @@ def test_collect_names_from_log(tmp_path, monkeypatch):
     assert lines == sorted(names)
 
 
+def test_collect_names_spells_names_offline(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(path=tmp_path / "llm_cache.sqlite"))
+    offline = LLMClient()
+    monkeypatch.setattr(llm_client, "_client", offline)
+    monkeypatch.setattr(jobs, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(jobs, "_translation_cache", None)
+    monkeypatch.setattr(jobs, "_gov_names", {})
+    monkeypatch.setattr(name_pull, "_gov_names", {})
+    log = tmp_path / "io.jsonl"
+    log.write_text(json.dumps({"Name": "Gail Schneider"}) + "\n", encoding="utf-8")
+
+    try:
+        names = collect_names(str(log), str(tmp_path / "names.txt"))
+    finally:
+        offline.close()
+
+    assert names == {"גייל שניידר"}
+
+
 def test_transliterate_short_vowel(monkeypatch):
     mapping = {"Ben": "בן", "Dan": "דן", "Noam": "נואם"}
 
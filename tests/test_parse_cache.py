@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import jobs
+from jobs import Contacts
+from dept_classifier import DepartmentClassifier
+from parse_cache import ParseCache, block_key
+
+
+def test_lru_evicts_oldest_and_counts():
+    cache = ParseCache(maxsize=2)
+    cache.put("a", (1,))
+    cache.put("b", (2,))
+    assert cache.get("a") == (1,)
+    cache.put("c", (3,))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == (1,)
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 2)
+
+
+def test_block_key_depends_on_url_hint():
+    assert block_key("text") == block_key("text")
+    assert block_key("text") != block_key("text", "מחלקת חינוך")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "parse_cache.json"
+    cache = ParseCache(path=path)
+    cache.put("k", ("דן", None, None, None, None, None, {"name": ("name", "דן")}))
+    cache.save()
+
+    loaded = ParseCache(path=path)
+    assert loaded.get("k") == ("דן", None, None, None, None, None, {"name": ("name", "דן")})
+
+
+def test_contacts_reuse_cached_parse(monkeypatch):
+    calls = []
+    original_parse = Contacts._parse_block
+
+    def counting_parse(self):
+        calls.append(self.raw_text)
+        original_parse(self)
+
+    monkeypatch.setattr(Contacts, "_parse_block", counting_parse)
+    monkeypatch.setattr(jobs, "parse_cache", ParseCache())
+    text = "דוד כהן\nטלפון: 03-1234567\nמייל: david@example.com"
+
+    first = Contacts(text, "תל אביב", "https://a.example/education", defer_enrichment=True)
+    second = Contacts(text, "חיפה", "https://b.example/education", defer_enrichment=True)
+
+    assert len(calls) == 1
+    assert second.to_dict() | {"רשות": "תל אביב"} == first.to_dict()
+    assert second.pending == {
+        k: (v[0], v[1], second.url) if k == "department" else v for k, v in first.pending.items()
+    }
+    assert jobs.parse_cache.hits == 1
+
+
+def test_line_break_inside_phone_gets_its_own_entry(monkeypatch):
+    monkeypatch.setattr(jobs, "parse_cache", ParseCache())
+
+    split = Contacts("דוד כהן טלפון 04\n1234567", "חיפה", defer_enrichment=True)
+    joined = Contacts("דוד כהן טלפון 04 1234567", "חיפה", defer_enrichment=True)
+
+    assert jobs.parse_cache.hits == 0
+    assert split.phone_office is None
+    assert joined.phone_office == "04-123-4567"
+
+
+def test_department_classifier_runs_per_page_url(monkeypatch):
+    examples = [
+        ("revaha sherutim mishpacha tipul", "מחלקת רווחה"),
+        ("kaduregel breicha hitamlut migrash", "מחלקת ספורט"),
+        ("info contact mazkirut", None),
+    ] * 10
+    monkeypatch.setattr(jobs, "_dept_classifier", DepartmentClassifier.train(examples))
+    monkeypatch.setattr(jobs, "parse_cache", ParseCache())
+    text = "אבי דוד 03-1234567"
+
+    welfare = Contacts(text, "חיפה", "https://a.example/revaha/sherutim/mishpacha/tipul", defer_enrichment=True)
+    sport = Contacts(text, "חיפה", "https://a.example/kaduregel/breicha/hitamlut/migrash", defer_enrichment=True)
+
+    assert jobs.parse_cache.hits == 1
+    assert (welfare.department, sport.department) == ("מחלקת רווחה", "מחלקת ספורט")
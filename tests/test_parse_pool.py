@@ -0,0 +1,75 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+import jobs
+from jobs import Contacts
+from name_index import NameIndex
+from parse_cache import ParseCache
+from parse_pool import ParsePool
+
+
+def _parse(text, city):
+    return Contacts(text, city, defer_enrichment=True)
+
+
+def _worker_state():
+    cache = jobs.parse_cache
+    return (
+        cache.get("seen") if cache is not None else None,
+        jobs._name_index.to_hebrew("Avital") if jobs._name_index is not None else None,
+    )
+
+
+def _fail():
+    raise ValueError("bad page")
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_parse_pool_returns_contacts(workers):
+    text = "דוד כהן\nטלפון: 03-1234567\nמייל: david@example.com"
+    with ParsePool(max_workers=workers, max_pending=1) as pool:
+        futures = [pool.submit(_parse, text, f"עיר {i}") for i in range(3)]
+        contacts = [f.result() for f in futures]
+
+    assert [c.city for c in contacts] == ["עיר 0", "עיר 1", "עיר 2"]
+    assert all(c.email == "david@example.com" for c in contacts)
+    assert all(c.pending for c in contacts)
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_parse_pool_propagates_errors(workers):
+    with ParsePool(max_workers=workers) as pool:
+        with pytest.raises(ValueError):
+            pool.submit(_fail).result()
+
+
+def test_parse_pool_merges_worker_cache_updates(monkeypatch):
+    monkeypatch.setattr(jobs, "parse_cache", ParseCache())
+    with ParsePool(max_workers=1) as pool:
+        for i in range(3):
+            pool.submit(_parse, "info@example.com", f"עיר {i}").result()
+
+    assert len(jobs.parse_cache) == 1
+    assert (jobs.parse_cache.hits, jobs.parse_cache.misses) == (2, 1)
+
+
+def test_parse_pool_counts_worker_contacts(monkeypatch):
+    monkeypatch.setattr(Contacts, "contacts", 0)
+    with ParsePool(max_workers=1) as pool:
+        pool.submit(_parse, "info@example.com", "עיר").result()
+
+    assert Contacts.contacts == 1
+
+
+def test_spawned_workers_receive_jobs_state(monkeypatch):
+    cache = ParseCache()
+    cache.put("seen", ("דן",))
+    monkeypatch.setattr(jobs, "parse_cache", cache)
+    monkeypatch.setattr(jobs, "_name_index", NameIndex.build({"avital": "אביטל"}))
+    with ParsePool(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        assert pool.submit(_worker_state).result() == (("דן",), "אביטל")
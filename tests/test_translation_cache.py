@@ -1,9 +1,13 @@
+import json
+import subprocess
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
 import jobs
+import translation_cache
+from translation_cache import TranslationCache
 
 
 def test_transliteration_uses_cache(tmp_path, monkeypatch):
@@ -34,3 +38,57 @@ def test_transliteration_uses_cache(tmp_path, monkeypatch):
     assert jobs.transliterate_to_hebrew("Dan") == "HB-Dan"
     # still no new calls
     assert calls == ["Dan"]
+
+
+def test_entries_are_appended_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_cache, "FLUSH_EVERY", 3)
+    path = tmp_path / "cache.json"
+    cache = TranslationCache(path)
+    cache["Dan"] = "דן"
+    cache.flush(force=False)
+    # The first entry creates the snapshot
+    assert json.loads(path.read_text(encoding="utf-8")) == {"Dan": "דן"}
+
+    cache["Noa"] = "נועה"
+    cache["Tal"] = "טל"
+    cache.flush(force=False)
+    assert cache.log_path.read_text(encoding="utf-8") == ""
+    cache["Ben"] = "בן"
+    cache.flush(force=False)
+    assert len(cache.log_path.read_text(encoding="utf-8").splitlines()) == 3
+    assert dict(TranslationCache(path)) == {"Dan": "דן", "Noa": "נועה", "Tal": "טל", "Ben": "בן"}
+
+
+def test_writers_merge_and_compact(tmp_path):
+    path = tmp_path / "cache.json"
+    first, second = TranslationCache(path), TranslationCache(path)
+    first["Dan"] = "דן"
+    first.flush()
+    second["Noa"] = "נועה"
+    second.flush()
+    with open(second.log_path, "a", encoding="utf-8") as f:
+        f.write('["Tal", "ט')  # cut short by a crash
+
+    second.compact()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"Dan": "דן", "Noa": "נועה"}
+    assert second.log_path.read_text(encoding="utf-8") == ""
+    assert dict(second) == {"Dan": "דן", "Noa": "נועה"}
+
+
+def test_buffered_entries_are_written_at_exit(tmp_path):
+    cache_file = tmp_path / "cache.json"
+    script = f"""
+import sys
+sys.path.insert(0, {str(Path(__file__).resolve().parents[1] / "src")!r})
+import jobs, translation_cache
+jobs.CACHE_FILE = {str(cache_file)!r}
+translation_cache.FLUSH_INTERVAL = 3600
+cache = jobs._load_cache()
+cache["Dan"] = "דן"
+jobs._save_cache(cache)
+cache["Noa"] = "נועה"
+jobs._save_cache(cache)
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    assert dict(TranslationCache(cache_file)) == {"Dan": "דן", "Noa": "נועה"}
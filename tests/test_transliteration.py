@@ -1,4 +1,10 @@
-from transliteration import basic_transliterate
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import jobs
+from transliteration import basic_transliterate, transliterate_many
 
 
 def test_basic_digraph_transliteration():
@@ -6,3 +12,19 @@ def test_basic_digraph_transliteration():
     assert basic_transliterate("Lee") == "לי"
     assert basic_transliterate("Gail") == "גייל"
     assert basic_transliterate("Schneider") == "שניידר"
+
+
+def test_transliterate_many_keeps_order():
+    assert transliterate_many(["Ben", "Noor", "Ben", ""]) == ["בן", "נור", "בן", ""]
+
+
+def test_offline_fallback_spells_each_word(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(jobs, "_translation_cache", None)
+    monkeypatch.setattr(jobs, "_gov_names", {})
+    monkeypatch.setattr(jobs, "guess_hebrew_name", lambda name: None)
+
+    assert jobs.transliterate_to_hebrew("Gail Schneider") is None
+    assert jobs.transliterate_to_hebrew("Gail Schneider", fallback=True) == "גייל שניידר"
+    # Letter-by-letter guesses are not cached
+    assert "Gail Schneider" not in jobs._load_cache()